@@ -7,6 +7,7 @@ set -e  # Arrêter en cas d'erreur
 
 # Configuration
 GITHUB_RAW_URL="https://raw.githubusercontent.com/fabrice1618/quiz_python/main"
+GITHUB_QUIZ_API_URL="https://api.github.com/repos/fabrice1618/quiz_python/contents/.quiz/quiz?ref=main"
 DEFAULT_INSTALL_DIR="$HOME/quiz"
 QUIZ_NAME=""
 INSTALL_DIR="$DEFAULT_INSTALL_DIR"
@@ -36,8 +37,17 @@ print_warning() {
     echo -e "${YELLOW}⚠${NC} $1"
 }
 
+# Liste des quiz publiés : fichiers JSON du dossier .quiz/quiz du dépôt
+list_quizzes() {
+    curl -sSL "$GITHUB_QUIZ_API_URL" 2>/dev/null \
+        | sed -n 's/^ *"name": "\([^"]*\)\.json",$/\1/p'
+}
+
 # Fonction d'aide
 show_help() {
+    local quizzes
+    quizzes=$(list_quizzes | sed 's/^/    - /')
+
     cat << EOF
 Installation du Quiz Python
 
@@ -46,7 +56,7 @@ Usage:
     curl -sSL https://raw.githubusercontent.com/fabrice1618/quiz_python/main/install.sh | bash -s -- <nom_du_quiz>
 
 Arguments:
-    nom_du_quiz     Nom du quiz à installer (bases_python, linux, quiz)
+    nom_du_quiz     Nom du quiz à installer (voir la liste ci-dessous)
                     ou --all pour installer tous les quiz
 
 Options:
@@ -59,10 +69,9 @@ Exemples:
     curl -sSL https://raw.githubusercontent.com/fabrice1618/quiz_python/main/install.sh | bash -s -- bases_python
 
 Quiz disponibles:
-    - bases_python : Quiz sur les bases de Python (100 questions)
-    - linux        : Quiz sur Linux
-    - quiz         : Quiz général
-    - python50     : Quiz Python (50 questions)
+${quizzes:-    (liste indisponible : dépôt injoignable)}
+
+Une fois installés, ./quiz --list affiche leur titre et leur nombre de questions.
 
 EOF
 }
@@ -157,8 +166,24 @@ chmod +x "$INSTALL_DIR/.quiz/main.py"
 download_file "$GITHUB_RAW_URL/refactor/quiz_data.py" "$INSTALL_DIR/.quiz/quiz_data.py" "quiz_data.py"
 download_file "$GITHUB_RAW_URL/refactor/resultats_data.py" "$INSTALL_DIR/.quiz/resultats_data.py" "resultats_data.py"
 download_file "$GITHUB_RAW_URL/refactor/config.py" "$INSTALL_DIR/.quiz/config.py" "config.py"
+download_file "$GITHUB_RAW_URL/refactor/lazy.py" "$INSTALL_DIR/.quiz/lazy.py" "lazy.py"
 download_file "$GITHUB_RAW_URL/refactor/ui.py" "$INSTALL_DIR/.quiz/ui.py" "ui.py"
 download_file "$GITHUB_RAW_URL/refactor/crypto.py" "$INSTALL_DIR/.quiz/crypto.py" "crypto.py"
+download_file "$GITHUB_RAW_URL/refactor/timings.py" "$INSTALL_DIR/.quiz/timings.py" "timings.py"
+download_file "$GITHUB_RAW_URL/refactor/container.py" "$INSTALL_DIR/.quiz/container.py" "container.py"
+download_file "$GITHUB_RAW_URL/refactor/cache.py" "$INSTALL_DIR/.quiz/cache.py" "cache.py"
+download_file "$GITHUB_RAW_URL/refactor/validator.py" "$INSTALL_DIR/.quiz/validator.py" "validator.py"
+download_file "$GITHUB_RAW_URL/refactor/catalog.py" "$INSTALL_DIR/.quiz/catalog.py" "catalog.py"
+download_file "$GITHUB_RAW_URL/refactor/journal.py" "$INSTALL_DIR/.quiz/journal.py" "journal.py"
+download_file "$GITHUB_RAW_URL/refactor/locking.py" "$INSTALL_DIR/.quiz/locking.py" "locking.py"
+download_file "$GITHUB_RAW_URL/refactor/atomic.py" "$INSTALL_DIR/.quiz/atomic.py" "atomic.py"
+download_file "$GITHUB_RAW_URL/refactor/autosave.py" "$INSTALL_DIR/.quiz/autosave.py" "autosave.py"
+download_file "$GITHUB_RAW_URL/refactor/resultats_sqlite.py" "$INSTALL_DIR/.quiz/resultats_sqlite.py" "resultats_sqlite.py"
+download_file "$GITHUB_RAW_URL/refactor/analytics.py" "$INSTALL_DIR/.quiz/analytics.py" "analytics.py"
+download_file "$GITHUB_RAW_URL/refactor/batch.py" "$INSTALL_DIR/.quiz/batch.py" "batch.py"
+download_file "$GITHUB_RAW_URL/refactor/server.py" "$INSTALL_DIR/.quiz/server.py" "server.py"
+download_file "$GITHUB_RAW_URL/refactor/session.py" "$INSTALL_DIR/.quiz/session.py" "session.py"
+download_file "$GITHUB_RAW_URL/refactor/migrate_encryption.py" "$INSTALL_DIR/.quiz/migrate_encryption.py" "migrate_encryption.py"
 
 # Téléchargement du fichier .env.example et création du .env
 download_file "$GITHUB_RAW_URL/refactor/.env.example" "$INSTALL_DIR/.quiz/.env.example" ".env.example"
@@ -212,7 +237,11 @@ EOF
 # Téléchargement des quiz
 if [[ "$INSTALL_ALL" == true ]]; then
     print_info "Téléchargement de tous les quiz..."
-    QUIZ_LIST=("bases_python" "linux" "quiz" "python50" "php50")
+    mapfile -t QUIZ_LIST < <(list_quizzes)
+    if [[ ${#QUIZ_LIST[@]} -eq 0 ]]; then
+        print_error "Impossible d'obtenir la liste des quiz depuis le dépôt"
+        exit 1
+    fi
     for quiz in "${QUIZ_LIST[@]}"; do
         download_file "$GITHUB_RAW_URL/.quiz/quiz/${quiz}.json" "$INSTALL_DIR/.quiz/quiz/${quiz}.json" "${quiz}.json"
     done
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Statistiques sur les résultats d'une classe.
+
+Les résultats sont chargés en parallèle (pool de processus, via
+resultats_data.load) puis regroupés par quiz : les ids de questions ne
+sont uniques qu'au sein d'un quiz. Les résultats de chaque quiz sont
+rangés dans une matrice élèves x questions de réussite, stockée à plat
+dans un bytearray (un octet par case). Chaque statistique par question se
+calcule sur une colonne extraite par tranche (matrice[j::m]) et comptée
+par bytes.count : les boucles restent en C.
+
+Statistiques calculées :
+
+    taux de réussite       bonnes réponses / élèves ayant eu la question
+    indice de discrimination
+                           taux de réussite du groupe des 27 % meilleurs
+                           élèves moins celui des 27 % moins bons
+    distribution des scores
+                           nombre d'élèves par tranche de 10 % de réussite
+
+Usage:
+    python3 analytics.py [-q QUIZ] [--json FICHIER] [--csv FICHIER]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import config
+import resultats_data
+from lazy import lazy_import
+
+# Utilisés par le seul backend SQLite : importés au premier usage
+sqlite3 = lazy_import("sqlite3")
+resultats_sqlite = lazy_import("resultats_sqlite")
+
+# Part des élèves retenue dans chaque groupe (meilleurs / moins bons)
+DISCRIMINATION_GROUP = 0.27
+
+# Nombre de tranches de la distribution des scores
+SCORE_BUCKETS = 10
+
+# Résultats d'un élève : nom, quiz, ids des questions, réussites (octets 0/1)
+Ligne = Tuple[str, str, List[int], bytes]
+
+
+@dataclass
+class Statistiques:
+    """Statistiques des résultats d'un quiz."""
+
+    quiz_name: str
+    eleves: int = 0
+    question_ids: List[int] = field(default_factory=list)
+    posees: List[int] = field(default_factory=list)
+    reussies: List[int] = field(default_factory=list)
+    discrimination: List[Optional[float]] = field(default_factory=list)
+    distribution: List[int] = field(default_factory=lambda: [0] * SCORE_BUCKETS)
+
+    def taux_reussite(self, j: int) -> Optional[float]:
+        """Taux de réussite de la j-ième question (None si jamais posée)."""
+        return self.reussies[j] / self.posees[j] if self.posees[j] else None
+
+    def to_dict(self) -> Dict:
+        """Rapport compact, sérialisable en JSON."""
+        return {
+            "quiz_name": self.quiz_name,
+            "eleves": self.eleves,
+            "distribution": self.distribution,
+            "questions": [
+                {
+                    "id": question_id,
+                    "posee": self.posees[j],
+                    "reussite": _arrondi(self.taux_reussite(j)),
+                    "discrimination": _arrondi(self.discrimination[j]),
+                }
+                for j, question_id in enumerate(self.question_ids)
+            ],
+        }
+
+
+def _arrondi(valeur: Optional[float]) -> Optional[float]:
+    return None if valeur is None else round(valeur, 4)
+
+
+def _load(resultat_file: str) -> Ligne | str:
+    """Charge un fichier de résultats (exécuté dans un processus du pool)."""
+    try:
+        resultats = resultats_data.load(resultat_file)
+    except resultats_data.QuizResultatError as exc:
+        return str(exc)
+    return (
+        resultat_file,
+        resultats.quiz_name,
+        list(resultats.ids),
+        resultats.reussites,
+    )
+
+
+def list_results() -> List[str]:
+    """Noms des résultats enregistrés avec le backend configuré."""
+    if config.result_backend == "sqlite":
+        return resultats_sqlite.list_sessions()
+    directory = config.data_path / config.RESULT_PATH
+    return sorted(path.stem for path in directory.glob("*.json"))
+
+
+def load_all(
+    names: List[str], workers: Optional[int] = None
+) -> Tuple[List[Ligne], List[str]]:
+    """
+    Charge des résultats en parallèle.
+
+    Returns:
+        Résultats chargés (dans l'ordre de `names`) et erreurs rencontrées
+    """
+    if len(names) <= 1 or config.result_backend == "sqlite":
+        chargees = [_load(name) for name in names]
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(names))
+        chunksize = max(1, len(names) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chargees = list(executor.map(_load, names, chunksize=chunksize))
+    lignes = [ligne for ligne in chargees if not isinstance(ligne, str)]
+    return lignes, [erreur for erreur in chargees if isinstance(erreur, str)]
+
+
+def matrice(lignes: List[Ligne]) -> Tuple[List[int], bytearray, bytearray]:
+    """
+    Range les résultats dans des matrices élèves x questions.
+
+    Les colonnes sont les ids de questions triés. Un élève n'a pas
+    forcément eu toutes les questions (tirage -n) : la matrice `posees`
+    indique les cases renseignées, la matrice `reussies` les bonnes réponses.
+
+    Returns:
+        Ids des colonnes, matrices posées et réussies (à plat, ligne par ligne)
+    """
+    question_ids = sorted(
+        {question_id for _, _, ids, _ in lignes for question_id in ids}
+    )
+    colonnes = {question_id: j for j, question_id in enumerate(question_ids)}
+    largeur = len(question_ids)
+    posees = bytearray(largeur * len(lignes))
+    reussies = bytearray(largeur * len(lignes))
+    for i, (_, _, ids, reussites) in enumerate(lignes):
+        debut = i * largeur
+        if len(ids) == largeur and ids == question_ids:
+            # Cas courant : l'élève a eu tout le quiz, dans l'ordre des ids
+            posees[debut : debut + largeur] = b"\1" * largeur
+            reussies[debut : debut + largeur] = reussites
+            continue
+        for question_id, reussite in zip(ids, reussites):
+            j = colonnes[question_id]
+            posees[debut + j] = 1
+            reussies[debut + j] = reussite
+    return question_ids, posees, reussies
+
+
+def _groupes(lignes: List[Ligne], stats: Statistiques) -> Tuple[int, int]:
+    """
+    Calcule la distribution des scores et retourne les masques des groupes
+    des meilleurs et des moins bons élèves.
+
+    Un masque est un octet 0/1 par élève converti en entier, pour combiner
+    les groupes et les colonnes de la matrice par ET logique.
+    """
+    scores = []
+    for i, (_, _, ids, reussites) in enumerate(lignes):
+        score = reussites.count(1) / len(ids) if ids else 0.0
+        scores.append((score, i))
+        stats.distribution[min(int(score * SCORE_BUCKETS), SCORE_BUCKETS - 1)] += 1
+
+    scores.sort()
+    taille = max(1, round(len(scores) * DISCRIMINATION_GROUP)) if scores else 0
+    masques = []
+    for selection in (scores[len(scores) - taille :], scores[:taille]):
+        masque = bytearray(len(lignes))
+        for _, i in selection:
+            masque[i] = 1
+        masques.append(int.from_bytes(masque, "big"))
+    return masques[0], masques[1]
+
+
+def _taux(posee: int, reussie: int, groupe: int) -> Optional[float]:
+    """Taux de réussite d'un groupe (chaque octet des masques vaut 0 ou 1)."""
+    nombre = (posee & groupe).bit_count()
+    return (reussie & groupe).bit_count() / nombre if nombre else None
+
+
+def analyse(lignes: List[Ligne], quiz_name: str) -> Statistiques:
+    """
+    Calcule les statistiques par question et la distribution des scores
+    d'un quiz (les résultats des autres quiz sont ignorés).
+    """
+    lignes = [ligne for ligne in lignes if ligne[1] == quiz_name]
+    stats = Statistiques(quiz_name, eleves=len(lignes))
+    stats.question_ids, posees, reussies = matrice(lignes)
+    largeur = len(stats.question_ids)
+    meilleurs, moins_bons = _groupes(lignes, stats)
+
+    for j in range(largeur):
+        colonne_posee = posees[j::largeur]
+        colonne_reussie = reussies[j::largeur]
+        stats.posees.append(colonne_posee.count(1))
+        stats.reussies.append(colonne_reussie.count(1))
+
+        posee = int.from_bytes(colonne_posee, "big")
+        reussie = int.from_bytes(colonne_reussie, "big")
+        haut = _taux(posee, reussie, meilleurs)
+        bas = _taux(posee, reussie, moins_bons)
+        stats.discrimination.append(None if haut is None or bas is None else haut - bas)
+    return stats
+
+
+def analyse_par_quiz(lignes: List[Ligne]) -> List[Statistiques]:
+    """Statistiques de chaque quiz présent dans les résultats, par nom de quiz."""
+    quiz_names = sorted({quiz_name for _, quiz_name, _, _ in lignes})
+    return [analyse(lignes, quiz_name) for quiz_name in quiz_names]
+
+
+def export_json(rapports: List[Statistiques], erreurs: List[str], path: str) -> None:
+    """Exporte les rapports des quiz et les erreurs de chargement en JSON compact."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"quiz": [stats.to_dict() for stats in rapports], "erreurs": erreurs},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+
+def export_csv(rapports: List[Statistiques], path: str) -> None:
+    """Exporte les statistiques par question de chaque quiz en CSV."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["quiz", "id", "posee", "reussie", "reussite", "discrimination"]
+        )
+        for stats in rapports:
+            for j, question_id in enumerate(stats.question_ids):
+                writer.writerow(
+                    [
+                        stats.quiz_name,
+                        question_id,
+                        stats.posees[j],
+                        stats.reussies[j],
+                        _arrondi(stats.taux_reussite(j)),
+                        _arrondi(stats.discrimination[j]),
+                    ]
+                )
+
+
+def afficher(stats: Statistiques) -> None:
+    """Affiche les questions les moins réussies et la distribution d'un quiz."""
+    print(
+        f"{stats.quiz_name} : {stats.eleves} élève(s), "
+        f"{len(stats.question_ids)} question(s)"
+    )
+    print("Questions les moins réussies :")
+    ordre = sorted(
+        (j for j in range(len(stats.question_ids)) if stats.posees[j]),
+        key=stats.taux_reussite,
+    )
+    for j in ordre[:10]:
+        discrimination = stats.discrimination[j]
+        print(
+            f"  question {stats.question_ids[j]:>6} : "
+            f"{stats.taux_reussite(j):6.1%} de réussite, discrimination "
+            + ("-" if discrimination is None else f"{discrimination:+.2f}")
+        )
+    print("Distribution des scores :")
+    for k, nombre in enumerate(stats.distribution):
+        print(f"  {10 * k:>3} - {10 * (k + 1):>3} % : {nombre}")
+
+
+def main() -> int:
+    """Point d'entrée : affiche et exporte les statistiques d'une classe."""
+    parser = argparse.ArgumentParser(description="Statistiques des résultats")
+    parser.add_argument("-q", "--quiz", help="Limiter l'analyse à un quiz")
+    parser.add_argument("--json", help="Exporter le rapport en JSON")
+    parser.add_argument("--csv", help="Exporter les statistiques par question en CSV")
+    args = parser.parse_args()
+
+    try:
+        lignes, erreurs = load_all(list_results())
+    except sqlite3.Error as exc:
+        print(f"✗ base de résultats illisible : {exc}")
+        return 1
+    if args.quiz:
+        rapports = [analyse(lignes, args.quiz)]
+    else:
+        rapports = analyse_par_quiz(lignes)
+
+    for erreur in erreurs:
+        print(f"  ✗ {erreur}")
+    for stats in rapports:
+        print()
+        afficher(stats)
+
+    if args.json:
+        export_json(rapports, erreurs, args.json)
+    if args.csv:
+        export_csv(rapports, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Écriture atomique de fichiers.
+
+Le contenu est écrit dans un fichier temporaire du même dossier, puis
+renommé sur le fichier cible : un arrêt en cours d'écriture laisse l'ancien
+fichier intact, et un lecteur concurrent ne voit jamais de fichier partiel.
+
+Le fichier garde ses droits d'accès. Un nouveau fichier reçoit ceux
+d'open() : le temporaire est créé en 0666 et le noyau applique le umask,
+sans que le processus ait à le lire (os.umask le modifierait pour tous
+les threads).
+"""
+
+import os
+import secrets
+import stat
+from pathlib import Path
+
+# Création exclusive : un temporaire n'est jamais partagé
+_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def write(path: Path, data: bytes, fsync: bool = True) -> None:
+    """
+    Remplace atomiquement le contenu d'un fichier.
+
+    Args:
+        path: Fichier cible (créé s'il n'existe pas)
+        data: Nouveau contenu
+        fsync: Synchroniser le temporaire sur disque avant le renommage
+
+    Raises:
+        OSError: Si l'écriture échoue (le temporaire est alors supprimé)
+    """
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp_path = path.with_name(f"{path.name}.{secrets.token_hex(4)}.tmp")
+    fd = os.open(tmp_path, _FLAGS, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
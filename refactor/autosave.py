@@ -0,0 +1,130 @@
+"""
+Sauvegarde automatique des résultats en arrière-plan.
+
+Le thread interactif ne fait qu'ajouter la réponse au journal (quelques
+microsecondes) et déposer un instantané des résultats dans une file. Un
+thread d'écriture attend config.AUTOSAVE_DELAY secondes que les mises à
+jour rapprochées s'accumulent, n'écrit que le plus récent des instantanés
+(écriture atomique, voir resultats_data.save_snapshot) puis compacte le
+journal jusqu'à cet instantané. Un disque lent (répertoire personnel sur
+NFS) ne bloque donc plus la saisie.
+
+close() écrit le dernier instantané en attente et arrête le thread ; il est
+aussi appelé à la sortie de l'interpréteur (atexit).
+"""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Optional, Tuple
+import config
+import resultats_data
+from journal import Journal
+from resultats_data import Resultats
+
+# Marque de fin déposée dans la file par close()
+_STOP = None
+
+
+def write(
+    resultats: Resultats, resultat_file: str, journal: Journal, mark: int
+) -> None:
+    """
+    Écrit un instantané des résultats puis retire du journal les
+    enregistrements antérieurs au repère `mark` (pris avec l'instantané).
+
+    Raises:
+        locking.LockTimeout: Si le verrou exclusif n'est pas obtenu à temps
+    """
+    with resultats_data.lock(resultat_file):
+        resultats_data.save_snapshot(resultats, resultat_file)
+        journal.compact(mark)
+
+
+class AutoSaver:  # pylint: disable=too-many-instance-attributes
+    """Écrit les résultats d'une session depuis un thread dédié."""
+
+    def __init__(self, resultat_file: str, delay: Optional[float] = None) -> None:
+        self.resultat_file = resultat_file
+        self.delay = config.AUTOSAVE_DELAY if delay is None else delay
+        self.error: Optional[BaseException] = None
+        self.writes = 0
+        self._journal = resultats_data.open_journal(resultat_file)
+        self._queue: "queue.Queue[Optional[Tuple[Resultats, int]]]" = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"autosave-{resultat_file}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, resultats: Resultats, question_id: int) -> None:
+        """Journalise une bonne réponse et planifie l'écriture des résultats."""
+        self._journal.append(question_id)
+        self.submit(resultats)
+
+    def submit(self, resultats: Resultats) -> None:
+        """Planifie l'écriture d'un instantané des résultats (copie en O(1))."""
+        if self._closed:
+            raise RuntimeError("sauvegarde automatique arrêtée")
+        self._queue.put((resultats.snapshot(), self._journal.mark()))
+
+    def flush(self) -> None:
+        """Attend que tous les instantanés déposés soient écrits."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Écrit le dernier instantané en attente, arrête le thread et ferme le journal."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._journal.close()
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            latest = self._queue.get()
+            taken = 1
+            deadline = time.monotonic() + self.delay
+            # Regrouper les mises à jour rapprochées : seul le plus récent
+            # instantané est écrit
+            while latest is not _STOP:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stop = True
+                    break
+                latest = item
+            stop = stop or latest is _STOP
+            try:
+                if latest is not _STOP:
+                    self._write(*latest)
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+
+    def _write(self, resultats: Resultats, mark: int) -> None:
+        try:
+            write(resultats, self.resultat_file, self._journal, mark)
+            self.writes += 1
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Le journal conserve les réponses : la prochaine écriture réessaiera
+            self.error = exc
+
+    def __enter__(self) -> "AutoSaver":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
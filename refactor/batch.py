@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Correction en masse de feuilles de réponses.
+
+Une feuille de réponses est un objet JSON :
+
+    {
+      "resultat": "dupont_jean",        # fichier de résultats (défaut : nom du fichier)
+      "nom": "Dupont", "prenom": "Jean",
+      "answers": {"1": "print()", "2": 0, ...}
+    }
+
+où chaque réponse est le texte du choix retenu ou sa position d'origine
+dans le quiz. Les feuilles sont lues dans un dossier (un fichier .json par
+feuille) ou un flux JSONL (une feuille par ligne, "-" pour l'entrée
+standard). Une feuille illisible (JSON ou encodage invalide), mal formée,
+dont le nom de fichier de résultats n'est pas un simple nom
+(resultats_data.NAME) ou reprend celui d'une feuille précédente du lot est
+rejetée et signalée dans le bilan, sans rien écrire.
+
+Le corrigé est calculé une fois par processus : position de la bonne
+réponse et texte attendu pour chaque question. Corriger une feuille ne
+coûte alors qu'une recherche de position et une comparaison par réponse.
+Au-delà de PARALLEL_MIN feuilles, la correction et l'écriture des
+résultats sont réparties sur un pool de processus.
+
+Usage:
+    python3 batch.py -q QUIZ SOURCE [--workers N]
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import quiz_data
+import resultats_data
+
+# Nombre de feuilles à partir duquel la correction est parallélisée
+PARALLEL_MIN = 500
+
+# Feuilles confiées à un processus du pool à la fois
+CHUNK_SIZE = 256
+
+# Bilan d'une feuille : fichier de résultats, score, nombre de questions
+# (0 : feuille rejetée), erreurs
+Bilan = Tuple[str, int, int, List[str]]
+
+# Feuille lue : nom du fichier de résultats et contenu, tels que fournis
+# (ou Rejet si la feuille n'a pas pu être lue)
+Feuille = Tuple[Any, Any]
+
+
+@dataclass(frozen=True)
+class Rejet:
+    """Feuille rejetée avant correction, avec son motif (voir rejet)."""
+
+    motif: str
+
+
+@dataclass(frozen=True)
+class Corrige:
+    """Corrigé d'un quiz, calculé une fois pour toutes les feuilles."""
+
+    quiz_name: str
+    ids: List[int]
+    positions: Dict[int, int]
+    bonnes_positions: array
+    bonnes_reponses: List[str]
+
+    @classmethod
+    def from_quiz(cls, quiz_name: str) -> "Corrige":
+        """
+        Calcule le corrigé d'un quiz (une seule lecture, en flux).
+
+        Raises:
+            quiz_data.QuizFileError: Si le quiz est introuvable ou invalide
+        """
+        ids, bonnes_positions, bonnes_reponses = [], array("H"), []
+        for question in quiz_data.iter_questions(quiz_name):
+            ids.append(question.question_id)
+            bonnes_positions.append(question.answer_index)
+            bonnes_reponses.append(question.choices[question.answer_index])
+        positions = {question_id: i for i, question_id in enumerate(ids)}
+        return cls(quiz_name, ids, positions, bonnes_positions, bonnes_reponses)
+
+    def corriger(
+        self, sheet: Dict[str, Any]
+    ) -> Tuple[resultats_data.Resultats, List[str]]:
+        """
+        Corrige une feuille de réponses.
+
+        Returns:
+            Résultats de la feuille et liste des réponses ignorées
+        """
+        resultats = resultats_data.create(
+            self.quiz_name, self.ids, sheet.get("prenom", ""), sheet.get("nom", "")
+        )
+        erreurs = []
+        for key, reponse in sheet.get("answers", {}).items():
+            try:
+                question_id = int(key)
+                position = self.positions[question_id]
+            except (ValueError, KeyError):
+                erreurs.append(f"question {key} inconnue")
+                continue
+            if isinstance(reponse, bool) or not isinstance(reponse, (int, str)):
+                erreurs.append(f"question {key} : réponse invalide")
+            elif (
+                reponse == self.bonnes_positions[position]
+                if isinstance(reponse, int)
+                else reponse.strip() == self.bonnes_reponses[position]
+            ):
+                resultats.marquer_correct(question_id)
+        return resultats, erreurs
+
+
+def _resultat(sheet: Any, default: str) -> Any:
+    """Nom du fichier de résultats d'une feuille (non validé, voir rejet)."""
+    return sheet.get("resultat", default) if isinstance(sheet, dict) else default
+
+
+def read_sheets(source: str) -> Iterator[Feuille]:
+    """
+    Lit les feuilles d'un dossier ou d'un flux JSONL.
+
+    Une feuille illisible est remplacée par un Rejet : elle figure dans le
+    bilan sans interrompre le lot.
+
+    Yields:
+        (nom du fichier de résultats, feuille), non validés (voir rejet)
+    """
+    path = Path(source)
+    if source != "-" and path.is_dir():
+        for sheet_path in sorted(path.glob("*.json")):
+            try:
+                sheet = json.loads(sheet_path.read_bytes())
+            except OSError as exc:
+                sheet = Rejet(f"lecture impossible : {exc}")
+            except ValueError as exc:  # JSONDecodeError, UnicodeDecodeError
+                sheet = Rejet(f"feuille illisible : {exc}")
+            yield _resultat(sheet, sheet_path.stem), sheet
+        return
+
+    # Décodage par ligne : une ligne mal encodée ne rejette que sa feuille
+    # pylint: disable-next=consider-using-with
+    stream = sys.stdin.buffer if source == "-" else open(path, "rb")
+    with stream:
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                try:
+                    sheet = json.loads(line)
+                except ValueError as exc:
+                    sheet = Rejet(f"feuille illisible : {exc}")
+                yield _resultat(sheet, f"{path.stem}_{number}"), sheet
+
+
+@functools.lru_cache(maxsize=4)
+def corrige_de(quiz_name: str) -> Corrige:
+    """Corrigé d'un quiz, calculé une fois par processus."""
+    return Corrige.from_quiz(quiz_name)
+
+
+def rejet(name: Any, sheet: Any) -> Optional[str]:
+    """Motif de rejet d'une feuille, ou None si elle peut être corrigée."""
+    if isinstance(sheet, Rejet):
+        return sheet.motif
+    if not isinstance(name, str) or not resultats_data.NAME.fullmatch(name):
+        return f"nom de fichier de résultats invalide : {name!r}"
+    if not isinstance(sheet, dict):
+        return "feuille invalide : objet JSON attendu"
+    if not isinstance(sheet.get("answers", {}), dict):
+        return "answers invalide : objet JSON attendu"
+    for key in ("nom", "prenom"):
+        if not isinstance(sheet.get(key, ""), str):
+            return f"{key} invalide : texte attendu"
+    return None
+
+
+def _grade_chunk(quiz_name: str, sheets: List[Feuille]) -> List[Bilan]:
+    """Corrige des feuilles et écrit leurs résultats (sans fsync, voir grade)."""
+    corrige = corrige_de(quiz_name)
+    bilans = []
+    for name, sheet in sheets:
+        motif = rejet(name, sheet)
+        if motif is not None:
+            bilans.append((str(name), 0, 0, [motif]))
+            continue
+        resultats, erreurs = corrige.corriger(sheet)
+        resultats_data.save(resultats, name, fsync=False)
+        bilans.append(
+            (name, resultats.correct_count, resultats.nombre_questions, erreurs)
+        )
+    return bilans
+
+
+def _sans_doublons(sheets: List[Feuille]) -> List[Feuille]:
+    """
+    Rejette les feuilles dont le fichier de résultats est déjà celui d'une
+    feuille précédente du lot (elles s'écraseraient l'une l'autre).
+    """
+    vus = set()
+    uniques = []
+    for name, sheet in sheets:
+        if isinstance(name, str) and not isinstance(sheet, Rejet):
+            if name in vus:
+                sheet = Rejet(f"fichier de résultats {name} déjà utilisé dans le lot")
+            vus.add(name)
+        uniques.append((name, sheet))
+    return uniques
+
+
+def _chunks(sheets: Iterator[Feuille], size: int) -> Iterator[List[Feuille]]:
+    chunk = []
+    for sheet in sheets:
+        chunk.append(sheet)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade(
+    quiz_name: str,
+    sheets: List[Feuille],
+    workers: Optional[int] = None,
+) -> List[Bilan]:
+    """
+    Corrige des feuilles de réponses et enregistre un fichier de résultats
+    par feuille.
+
+    Les fichiers sont écrits sans fsync, puis synchronisés en une passe
+    à la fin du lot (resultats_data.sync). Les feuilles rejetées (voir
+    rejet), dont celles qui reprennent le fichier de résultats d'une
+    feuille précédente, figurent dans les bilans avec 0 question.
+
+    Args:
+        quiz_name: Quiz de référence
+        sheets: Feuilles (nom du fichier de résultats, feuille)
+        workers: Nombre de processus (défaut : nombre de CPU)
+
+    Returns:
+        Bilans, dans l'ordre des feuilles
+    """
+    # Valide le quiz avant de lancer le pool (et sert le cas séquentiel)
+    corrige_de(quiz_name)
+    sheets = _sans_doublons(sheets)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sheets) < PARALLEL_MIN:
+        bilans = _grade_chunk(quiz_name, sheets)
+    else:
+        bilans = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = _chunks(iter(sheets), CHUNK_SIZE)
+            for chunk in executor.map(
+                functools.partial(_grade_chunk, quiz_name), chunks
+            ):
+                bilans.extend(chunk)
+    resultats_data.sync(name for name, _, total, _ in bilans if total)
+    return bilans
+
+
+def main() -> int:
+    """Point d'entrée : corrige des feuilles de réponses et affiche un bilan."""
+    parser = argparse.ArgumentParser(description="Correction de feuilles de réponses")
+    parser.add_argument("-q", "--quiz", default="quiz", help="Quiz de référence")
+    parser.add_argument("source", help="Dossier de feuilles, fichier JSONL ou -")
+    parser.add_argument("--workers", type=int, help="Nombre de processus")
+    args = parser.parse_args()
+
+    try:
+        sheets = list(read_sheets(args.source))
+        bilans = grade(args.quiz, sheets, args.workers)
+    except (OSError, quiz_data.QuizFileError) as exc:
+        print(f"✗ {exc}")
+        return 1
+
+    rejetees = 0
+    for name, score, total, erreurs in bilans:
+        if total:
+            print(f"  {name:<30} {score:>5} / {total}")
+        else:
+            rejetees += 1
+            print(f"  ✗ {name:<28} rejetée")
+        for erreur in erreurs:
+            print(f"      - {erreur}")
+    print(f"✓ {len(bilans) - rejetees} feuille(s) corrigée(s)")
+    if rejetees:
+        print(f"✗ {rejetees} feuille(s) rejetée(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Benchmarks du quiz.
+
+Chaque module se lance depuis le dossier refactor/ :
+
+    python3 -m benchmarks.crypto_backends
+
+La suite complète (scénarios des chemins critiques sur des banques
+synthétiques, comparés à benchmarks/baseline.json) se lance avec :
+
+    python3 -m benchmarks
+"""
@@ -0,0 +1,119 @@
+"""
+Suite de benchmarks : scénarios chronométrés comparés à une référence.
+
+Les durées mesurées sont comparées à celles de benchmarks/baseline.json,
+enregistrée sur une machine de référence : un scénario plus lent que la
+référence au-delà du seuil est signalé comme régression et la commande
+se termine en erreur. Les écarts de moins de quelques millisecondes
+(PLANCHER) sont ignorés : à cette échelle, ils relèvent du bruit.
+
+Usage:
+    python3 -m benchmarks                         comparer à la référence
+    python3 -m benchmarks --tailles 1000 1000000  choisir les banques
+    python3 -m benchmarks --enregistrer           remplacer la référence
+    python3 -m benchmarks -o mesures.json         garder les mesures (CI)
+"""
+
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from benchmarks import scenarios
+
+# Au-delà de ce rapport (mesure / référence), un scénario est en régression...
+SEUIL = 1.5
+
+# ...si l'écart dépasse aussi ce plancher (secondes) : en dessous, c'est du bruit
+PLANCHER = 0.005
+
+
+def rapport(mesures: Dict[str, Dict[str, float]], repeat: int) -> Dict[str, Any]:
+    """Mesures au format du fichier de référence."""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "scenarios": {
+            nom: {taille: round(duree, 6) for taille, duree in durees.items()}
+            for nom, durees in mesures.items()
+        },
+    }
+
+
+def comparer(
+    mesures: Dict[str, Dict[str, float]],
+    reference: Dict[str, Dict[str, float]],
+    seuil: float = SEUIL,
+) -> List[str]:
+    """
+    Affiche les mesures face à la référence.
+
+    Returns:
+        Régressions, sous la forme "scénario [taille]"
+    """
+    regressions = []
+    for nom, durees in mesures.items():
+        for taille, duree in durees.items():
+            ref = reference.get(nom, {}).get(taille)
+            ligne = f"  {nom:<34} {taille:>8} {duree * 1000:>10.2f} ms"
+            if ref:
+                ratio = duree / ref
+                ligne += f"  {ratio:>5.2f}x"
+                if ratio > seuil and duree - ref > PLANCHER:
+                    ligne += "  ⚠ régression"
+                    regressions.append(f"{nom} [{taille}]")
+            print(ligne)
+    return regressions
+
+
+def main() -> int:
+    """Point d'entrée de la suite."""
+    parser = argparse.ArgumentParser(description="Benchmarks du quiz")
+    parser.add_argument(
+        "--tailles",
+        type=int,
+        nargs="+",
+        default=[1000, 10_000, 100_000],
+        help="Nombres de questions des banques générées",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(scenarios.SCENARIOS),
+        help="Scénario à exécuter (répétable, défaut : tous)",
+    )
+    parser.add_argument("--baseline", type=Path, default=scenarios.BASELINE)
+    parser.add_argument("--seuil", type=float, default=SEUIL)
+    parser.add_argument(
+        "--enregistrer",
+        action="store_true",
+        help="Enregistrer les mesures comme nouvelle référence",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Écrire les mesures dans un fichier JSON"
+    )
+    args = parser.parse_args()
+
+    mesures = scenarios.run(args.tailles, args.repeat, args.scenario or ())
+    resultat = rapport(mesures, args.repeat)
+
+    reference = {}
+    if args.baseline.exists() and not args.enregistrer:
+        reference = json.loads(args.baseline.read_text(encoding="utf-8"))["scenarios"]
+    regressions = comparer(mesures, reference, args.seuil)
+
+    for path in filter(None, (args.output, args.enregistrer and args.baseline)):
+        path.write_text(json.dumps(resultat, indent=2) + "\n", encoding="utf-8")
+        print(f"✓ {path}")
+
+    if regressions:
+        print(f"✗ {len(regressions)} régression(s) : {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
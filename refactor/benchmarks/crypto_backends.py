@@ -0,0 +1,53 @@
+"""
+Microbenchmark des backends XOR de crypto.
+
+Mesure le débit (Mo/s) de chaque backend de crypto.BACKENDS sur un
+tampon aléatoire, pour choisir le backend par défaut.
+
+Usage:
+    python3 -m benchmarks.crypto_backends [--size MO] [--repeat N]
+"""
+
+import argparse
+import os
+import time
+from typing import Dict
+import crypto
+
+
+def mesurer(backend: str, data: bytes, repeat: int) -> float:
+    """Retourne le meilleur débit (Mo/s) du backend sur `repeat` essais."""
+    fonction = crypto.BACKENDS[backend]
+    meilleur = float("inf")
+    for _ in range(repeat):
+        debut = time.perf_counter()
+        fonction(data, crypto.XOR_KEY)
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    return len(data) / (1 << 20) / meilleur
+
+
+def run(size_mb: float = 8.0, repeat: int = 5) -> Dict[str, float]:
+    """Mesure tous les backends et retourne {nom: Mo/s}."""
+    data = os.urandom(int(size_mb * (1 << 20)))
+    resultats = {}
+    for backend in crypto.BACKENDS:
+        # Le backend de référence est ~1000x plus lent : une seule passe suffit
+        essais = 1 if backend == "generator" else repeat
+        resultats[backend] = mesurer(backend, data, essais)
+    return resultats
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Débit des backends XOR")
+    parser.add_argument("--size", type=float, default=8.0, help="Taille en Mo")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre d'essais")
+    args = parser.parse_args()
+
+    resultats = run(args.size, args.repeat)
+    for backend, debit in sorted(resultats.items(), key=lambda r: -r[1]):
+        print(f"  {backend:<12} {debit:>10.1f} Mo/s")
+
+
+if __name__ == "__main__":
+    main()
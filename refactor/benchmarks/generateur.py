@@ -0,0 +1,161 @@
+"""
+Générateur déterministe de banques de questions et de fichiers de résultats.
+
+Les questions ressemblent aux vraies : énoncés accentués, choix courts qui
+se répètent d'une question à l'autre ("True", "None"...) et choix de code
+sur plusieurs lignes. Une même graine produit toujours les mêmes fichiers,
+octet pour octet : les mesures restent comparables d'un commit à l'autre.
+
+Le quiz est écrit question par question et chiffré par blocs : une banque
+d'un million de questions se génère sans la tenir en mémoire.
+
+Usage:
+    python3 -m benchmarks.generateur --questions 1000000 -o /tmp/bench
+"""
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Dict, Iterator
+import config
+import crypto
+import resultats_data
+
+# Taille des blocs chiffrés et écrits par write_quiz
+BLOC = 1 << 20
+
+SUJETS = (
+    "la compréhension de liste",
+    "l'opérateur ternaire",
+    "le découpage d'une chaîne",
+    "la portée des variables",
+    "les exceptions levées",
+    "l'itération sur un dictionnaire",
+    "les paramètres par défaut",
+    "la méthode spéciale __repr__",
+)
+
+CHOIX_COURTS = ("True", "False", "None", "Erreur", "0", "[]", "Rien n'est affiché")
+
+CODES = (
+    "for élément in liste:\n    print(élément)",
+    "try:\n    x = int(saisie)\nexcept ValueError:\n    x = 0",
+    "def carré(n):\n    return n * n",
+    "with open(chemin, encoding='utf-8') as f:\n    données = f.read()",
+    "while i < 10:\n    i += 1\nprint(i)",
+    "résultat = [x ** 2\n            for x in range(5)\n            if x % 2]",
+)
+
+
+def questions(count: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    Génère `count` questions au format fichier, ids 1 à `count`.
+
+    Args:
+        count: Nombre de questions
+        seed: Graine du générateur pseudo-aléatoire
+    """
+    rng = random.Random(seed)
+    for question_id in range(1, count + 1):
+        choix = rng.sample(CHOIX_COURTS, 2) + rng.sample(CODES, 1)
+        choix.append(f"Réponse spécifique n°{question_id}")
+        rng.shuffle(choix)
+        yield {
+            "id": question_id,
+            "question": (
+                f"Question n°{question_id} : que se passe-t-il avec "
+                f"{rng.choice(SUJETS)} ?"
+            ),
+            "choices": choix,
+            "answer_index": rng.randrange(len(choix)),
+        }
+
+
+def _fragments(count: int, seed: int, titre: str) -> Iterator[str]:
+    """Texte JSON du quiz, question par question."""
+    yield f'{{"quiz_title": {json.dumps(titre, ensure_ascii=False)}, '
+    yield '"language": "fr", "questions": ['
+    for i, question in enumerate(questions(count, seed)):
+        if i:
+            yield ", "
+        yield json.dumps(question, ensure_ascii=False)
+    yield "]}"
+
+
+def write_quiz(
+    path: Path, count: int, seed: int = 0, encrypt: bool = True, titre: str = ""
+) -> None:
+    """
+    Écrit une banque de `count` questions (chiffrée par défaut).
+
+    Le XOR agissant octet par octet, chaque bloc est chiffré indépendamment.
+    """
+    titre = titre or f"Banque synthétique ({count} questions)"
+    tampon = bytearray()
+    with open(path, "wb") as f:
+        for fragment in _fragments(count, seed, titre):
+            tampon += fragment.encode("utf-8")
+            if len(tampon) >= BLOC:
+                f.write(crypto.xor_bytes(tampon) if encrypt else tampon)
+                tampon.clear()
+        f.write(crypto.xor_bytes(tampon) if encrypt else tampon)
+
+
+def resultats(
+    quiz_name: str, count: int, taux: float = 0.5, seed: int = 0
+) -> resultats_data.Resultats:
+    """
+    Résultats d'un élève sur une banque de `count` questions.
+
+    Args:
+        quiz_name: Nom du quiz
+        count: Nombre de questions (ids 1 à `count`)
+        taux: Proportion de questions déjà réussies
+        seed: Graine du générateur pseudo-aléatoire
+    """
+    rng = random.Random(seed)
+    reussites = bytes(rng.random() < taux for _ in range(count))
+    return resultats_data.Resultats(
+        quiz_name, "Dupré", "Élodie", range(1, count + 1), reussites
+    )
+
+
+def banque(data_path: Path, count: int, seed: int = 0) -> str:
+    """
+    Écrit un quiz et un fichier de résultats associé sous `data_path`.
+
+    Les dossiers de config.QUIZ_PATH et config.RESULT_PATH sont créés.
+
+    Returns:
+        Nom du quiz, qui est aussi celui du fichier de résultats
+    """
+    nom = f"bench_{count}"
+    (data_path / config.QUIZ_PATH).mkdir(parents=True, exist_ok=True)
+    (data_path / config.RESULT_PATH).mkdir(parents=True, exist_ok=True)
+    write_quiz(data_path / config.QUIZ_PATH / f"{nom}.json", count, seed)
+    (data_path / config.RESULT_PATH / f"{nom}.json").write_bytes(
+        crypto.save_json(
+            resultats(nom, count, seed=seed).to_dict(), encrypt=True, indent=None
+        )
+    )
+    return nom
+
+
+def main() -> None:
+    """Point d'entrée : écrit une banque et ses résultats."""
+    parser = argparse.ArgumentParser(description="Banque de questions synthétique")
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-o", "--output", type=Path, default=Path("."), help="Dossier de données"
+    )
+    args = parser.parse_args()
+
+    nom = banque(args.output, args.questions, args.seed)
+    print(f"✓ {args.output / config.QUIZ_PATH / nom}.json")
+    print(f"✓ {args.output / config.RESULT_PATH / nom}.json")
+
+
+if __name__ == "__main__":
+    main()
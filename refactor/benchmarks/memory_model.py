@@ -0,0 +1,95 @@
+"""
+Comparaison mémoire : dicts imbriqués vs modèle Question compact.
+
+Construit un quiz synthétique dans l'ancienne représentation
+({"question_id", "question", "liste_choix": [{"choix", "correct"}, ...]})
+puis avec quiz_data.Question, et mesure l'allocation de chacune avec
+tracemalloc.
+
+Usage:
+    python3 -m benchmarks.memory_model [--questions N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, Dict, List
+import quiz_data
+
+
+def source_questions(count: int) -> List[Dict]:
+    """Questions au format fichier, avec des choix qui se répètent."""
+    reponses = ["True", "False", "None", "Erreur", "print(x)\nprint(y)"]
+    return [
+        {
+            "id": i,
+            "question": f"Question n°{i} : que retourne l'expression ?",
+            "choices": [reponses[(i + k) % len(reponses)] for k in range(4)]
+            + [f"Réponse spécifique {i}"],
+            "answer_index": i % 5,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def ancien_modele(source: List[Dict]) -> List[Dict]:
+    """Représentation d'origine : un dict par question et par choix."""
+    return [
+        {
+            "question_id": question["id"],
+            "question": question["question"],
+            "liste_choix": [
+                {"choix": choix, "correct": index == question["answer_index"]}
+                for index, choix in enumerate(question["choices"])
+            ],
+        }
+        for question in source
+    ]
+
+
+def modele_compact(source: List[Dict]) -> List[quiz_data.Question]:
+    """Représentation actuelle : Question à slots, choix internés."""
+    # pylint: disable=protected-access
+    return [
+        quiz_data._transform_question(question, i)
+        for i, question in enumerate(source, 1)
+    ]
+
+
+def mesurer(construire: Callable, source: List[Dict]) -> int:
+    """Retourne le nombre d'octets alloués et conservés par `construire`."""
+    gc.collect()
+    tracemalloc.start()
+    resultat = construire(source)
+    taille, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultat
+    return taille
+
+
+def run(count: int = 100_000) -> Dict[str, int]:
+    """Mesure les deux représentations et retourne {nom: octets}."""
+    source = source_questions(count)
+    return {
+        "dicts": mesurer(ancien_modele, source),
+        "Question": mesurer(modele_compact, source),
+    }
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Mémoire du modèle de quiz")
+    parser.add_argument("--questions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    resultats = run(args.questions)
+    for nom, taille in resultats.items():
+        par_question = taille / args.questions
+        print(
+            f"  {nom:<10} {taille / (1 << 20):>8.1f} Mo  {par_question:>6.0f} o/question"
+        )
+    print(f"  gain       {resultats['dicts'] / resultats['Question']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Débit d'affichage des questions (écrans par seconde).
+
+Compare l'ancien affichage (commande clear lancée dans un shell, puis un
+print par ligne) au rendu actuel (séquence ANSI et écran écrit en une
+fois, voir ui.write_frame). La sortie standard est redirigée vers un
+pseudo-terminal, vidé par un thread, pour que les deux versions voient un
+vrai terminal.
+
+Usage:
+    python3 -m benchmarks.render [--frames N]
+"""
+
+import argparse
+import contextlib
+import os
+import pty
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List
+import ui
+from benchmarks.memory_model import source_questions
+
+
+def ancien_rendu(
+    question: str, choix_propose: List[str], index: int, total_questions: int
+) -> None:
+    """Affichage d'origine : clear dans un shell puis un print par ligne."""
+    os.system("clear")
+    print(f"{index} / {total_questions} - {question}\n")
+    for numero, choix_text in enumerate(choix_propose, 1):
+        lines = choix_text.split("\n")
+        if len(lines) > 1:
+            print(f"\t{numero} : {lines[0]}")
+            for line in lines[1:]:
+                print(f"\t    {line}")
+        else:
+            print(f"\t{numero} : {choix_text}")
+
+
+@contextlib.contextmanager
+def terminal() -> Iterator[None]:
+    """Redirige la sortie standard (et le descripteur 1) vers un pseudo-terminal."""
+    maitre, esclave = pty.openpty()
+
+    def vider() -> None:
+        with contextlib.suppress(OSError):
+            while os.read(maitre, 1 << 16):
+                pass
+
+    lecteur = threading.Thread(target=vider, daemon=True)
+    lecteur.start()
+    sys.stdout.flush()
+    sauvegarde = os.dup(1)
+    stdout = sys.stdout
+    os.dup2(esclave, 1)
+    sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stdout = stdout
+        os.dup2(sauvegarde, 1)
+        os.close(sauvegarde)
+        os.close(esclave)
+        os.close(maitre)
+        lecteur.join(timeout=1)
+
+
+def mesurer(afficher: Callable, frames: int) -> float:
+    """Retourne le nombre d'écrans affichés par seconde."""
+    questions = source_questions(50)
+    with terminal():
+        debut = time.perf_counter()
+        for i in range(frames):
+            question = questions[i % len(questions)]
+            afficher(question["question"], question["choices"], i + 1, frames)
+        duree = time.perf_counter() - debut
+    return frames / duree
+
+
+def run(frames: int = 200) -> Dict[str, float]:
+    """Mesure les deux affichages et retourne {nom: écrans/s}."""
+    os.environ.setdefault("TERM", "xterm")
+    return {
+        "clear + print": mesurer(ancien_rendu, frames),
+        "ANSI tamponné": mesurer(ui.print_question, frames),
+    }
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Débit d'affichage des questions")
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    resultats = run(args.frames)
+    for nom, debit in resultats.items():
+        print(f"  {nom:<15} {debit:>10.0f} écrans/s")
+    print(
+        f"  gain            {resultats['ANSI tamponné'] / resultats['clear + print']:>10.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
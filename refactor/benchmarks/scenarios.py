@@ -0,0 +1,165 @@
+"""
+Scénarios chronométrés des chemins critiques, sur des banques synthétiques.
+
+Chaque scénario reçoit une Banque (quiz et résultats générés par
+benchmarks.generateur) et retourne la durée d'une exécution, en secondes.
+Les préparatifs (lecture du fichier, chargement du quiz...) restent hors
+du chronomètre. run() garde la meilleure de plusieurs exécutions.
+
+Usage:
+    python3 -m benchmarks              (voir benchmarks.__main__)
+"""
+
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List
+import cache
+import config
+import crypto
+import quiz_data
+import resultats_data
+from benchmarks import generateur
+
+# Mesures de référence (voir benchmarks.__main__)
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Nombre d'accès par scénario de lecture ou de validation
+ACCES = 1000
+
+
+@dataclass
+class Banque:
+    """Données générées pour une taille de banque."""
+
+    data_path: Path
+    nom: str
+    questions: int
+    echantillon: List[int]
+
+    @property
+    def quiz_file(self) -> Path:
+        """Fichier du quiz."""
+        return self.data_path / config.QUIZ_PATH / f"{self.nom}.json"
+
+
+SCENARIOS: Dict[str, Callable[[Banque], float]] = {}
+
+
+def scenario(nom: str) -> Callable:
+    """Enregistre un scénario sous `nom`."""
+
+    def decorator(function: Callable[[Banque], float]) -> Callable[[Banque], float]:
+        SCENARIOS[nom] = function
+        return function
+
+    return decorator
+
+
+def _chrono(action: Callable[[], object]) -> float:
+    debut = time.perf_counter()
+    action()
+    return time.perf_counter() - debut
+
+
+@scenario("crypto.xor_bytes")
+def _xor_bytes(banque: Banque) -> float:
+    data = banque.quiz_file.read_bytes()
+    return _chrono(lambda: crypto.xor_bytes(data))
+
+
+@scenario("crypto.load_json")
+def _load_json(banque: Banque) -> float:
+    data = banque.quiz_file.read_bytes()
+    return _chrono(lambda: crypto.load_json(data))
+
+
+@scenario("quiz_data.load")
+def _load(banque: Banque) -> float:
+    shutil.rmtree(cache.cache_dir(), ignore_errors=True)
+    return _chrono(lambda: quiz_data.load(banque.nom))
+
+
+@scenario("quiz_data.load (cache)")
+def _load_cache(banque: Banque) -> float:
+    quiz_data.load(banque.nom)
+    return _chrono(lambda: quiz_data.load(banque.nom))
+
+
+@scenario("quiz_data.read_question")
+def _read_question(banque: Banque) -> float:
+    quiz = quiz_data.load(banque.nom)
+
+    def lire() -> None:
+        for question_id in banque.echantillon:
+            quiz_data.read_question(question_id, quiz)
+
+    return _chrono(lire)
+
+
+@scenario("resultats_data.load")
+def _resultats_load(banque: Banque) -> float:
+    return _chrono(lambda: resultats_data.load(banque.nom))
+
+
+@scenario("resultats_data.valider_resultat")
+def _valider_resultat(banque: Banque) -> float:
+    resultats = resultats_data.load(banque.nom)
+
+    def valider() -> None:
+        courants = resultats
+        for question_id in banque.echantillon:
+            courants = resultats_data.valider_resultat(question_id, courants)
+
+    return _chrono(valider)
+
+
+@scenario("resultats_data.questions_a_poser")
+def _questions_a_poser(banque: Banque) -> float:
+    resultats = resultats_data.load(banque.nom)
+    return _chrono(lambda: resultats_data.questions_a_poser(resultats))
+
+
+@contextmanager
+def preparer(questions: int, seed: int = 0) -> Iterator[Banque]:
+    """Génère une banque dans un dossier temporaire, utilisé comme config.data_path."""
+    data_path = config.data_path
+    with tempfile.TemporaryDirectory() as tmp:
+        nom = generateur.banque(Path(tmp), questions, seed)
+        echantillon = random.Random(seed).choices(range(1, questions + 1), k=ACCES)
+        config.data_path = Path(tmp)
+        try:
+            yield Banque(Path(tmp), nom, questions, echantillon)
+        finally:
+            config.data_path = data_path
+
+
+def run(
+    tailles: Iterable[int] = (1000, 10_000, 100_000),
+    repeat: int = 5,
+    noms: Iterable[str] = (),
+) -> Dict[str, Dict[str, float]]:
+    """
+    Exécute les scénarios sur chaque taille de banque.
+
+    Args:
+        tailles: Nombres de questions des banques générées
+        repeat: Exécutions par mesure (la meilleure est gardée)
+        noms: Scénarios à exécuter (défaut : tous)
+
+    Returns:
+        {scénario: {taille: secondes}}
+    """
+    choisis = list(noms) or list(SCENARIOS)
+    mesures: Dict[str, Dict[str, float]] = {nom: {} for nom in choisis}
+    for taille in tailles:
+        with preparer(taille) as donnees:
+            for nom in choisis:
+                mesures[nom][str(taille)] = min(
+                    SCENARIOS[nom](donnees) for _ in range(repeat)
+                )
+    return mesures
@@ -0,0 +1,134 @@
+"""
+Test de charge du serveur HTTP en local.
+
+Lance server.serve dans un processus fils (limité à un cœur si le système
+le permet) sur un répertoire de données temporaire, puis simule des
+sessions simultanées : chaque client ouvre une connexion persistante,
+démarre une session, répond à toutes ses questions et la ferme. Affiche
+le débit de requêtes et la latence (médiane, 99e centile).
+
+Usage:
+    python3 -m benchmarks.server_load [--sessions N] [--questions N]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import signal
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+import config
+import crypto
+import server
+from benchmarks.memory_model import source_questions
+
+
+def _serveur(ports: "multiprocessing.Queue", data_path: Path) -> None:
+    """Processus fils : sert l'API sur un port libre, sur un seul cœur."""
+    config.data_path = data_path
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    try:
+        asyncio.run(server.serve("127.0.0.1", 0, ports.put))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _requete(reader, writer, method: str, path: str, body=None) -> Dict:
+    data = b"" if body is None else json.dumps(body).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: bench\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.lower().split(b"content-length: ")[1].split(b"\r\n")[0])
+    return json.loads(await reader.readexactly(length))
+
+
+async def _session(port: int, numero: int, questions: int, latences: List[float]):
+    """Une session complète ; ajoute la latence de chaque requête à `latences`."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def chrono(method, path, body=None):
+        debut = time.perf_counter()
+        reponse = await _requete(reader, writer, method, path, body)
+        latences.append(time.perf_counter() - debut)
+        return reponse
+
+    corps = {"quiz": "bench", "resultat": f"eleve{numero}", "count": questions}
+    token = (await chrono("POST", "/start", corps))["session"]
+    while not (question := await chrono("GET", f"/sessions/{token}/question"))["done"]:
+        choice = random.randrange(len(question["choices"]))
+        await chrono("POST", f"/sessions/{token}/answer", {"choice": choice})
+    await chrono("POST", f"/sessions/{token}/close")
+    writer.close()
+
+
+async def _charge(port: int, sessions: int, questions: int) -> List[float]:
+    latences: List[float] = []
+    await asyncio.gather(
+        *(_session(port, numero, questions, latences) for numero in range(sessions))
+    )
+    return latences
+
+
+def run(sessions: int = 300, questions: int = 20) -> Dict[str, float]:
+    """Lance le serveur, simule les sessions et retourne les mesures."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = Path(tmp)
+        (data_path / config.QUIZ_PATH).mkdir()
+        (data_path / config.RESULT_PATH).mkdir()
+        quiz = {"quiz_title": "Benchmark", "questions": source_questions(1000)}
+        (data_path / config.QUIZ_PATH / "bench.json").write_bytes(
+            crypto.save_json(quiz, encrypt=True)
+        )
+
+        context = multiprocessing.get_context("fork")
+        ports = context.Queue()
+        processus = context.Process(target=_serveur, args=(ports, data_path))
+        processus.start()
+        try:
+            port = ports.get(timeout=10)
+            debut = time.perf_counter()
+            latences = asyncio.run(_charge(port, sessions, questions))
+            duree = time.perf_counter() - debut
+        finally:
+            os.kill(processus.pid, signal.SIGINT)
+            processus.join()
+
+    latences.sort()
+    return {
+        "sessions": sessions,
+        "requetes": len(latences),
+        "duree": duree,
+        "debit": len(latences) / duree,
+        "p50": statistics.median(latences),
+        "p99": latences[int(len(latences) * 0.99) - 1],
+    }
+
+
+def main() -> None:
+    """Point d'entrée du benchmark."""
+    parser = argparse.ArgumentParser(description="Charge du serveur HTTP")
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--questions", type=int, default=20)
+    args = parser.parse_args()
+
+    mesures = run(args.sessions, args.questions)
+    print(
+        f"  {mesures['sessions']} sessions simultanées, "
+        f"{mesures['requetes']} requêtes en {mesures['duree']:.2f} s"
+    )
+    print(f"  débit      {mesures['debit']:>8.0f} requêtes/s")
+    print(f"  latence    {mesures['p50'] * 1000:>8.1f} ms (médiane)")
+    print(f"             {mesures['p99'] * 1000:>8.1f} ms (99e centile)")
+
+
+if __name__ == "__main__":
+    main()
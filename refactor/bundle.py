@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Construction d'une archive exécutable (zipapp) de l'application.
+
+Les modules de refactor/ (hors tests et benchmarks) sont compilés en
+bytecode et rangés sans leurs sources dans une seule archive, non
+compressée : au lancement, l'interpréteur lit un seul fichier et n'a ni
+sources à recompiler ni __pycache__ à consulter ou écrire.
+
+Le bytecode est marqué « non vérifié » (PEP 552) : l'archive est figée,
+aucune source à comparer. Elle doit être reconstruite pour chaque version
+de Python, comme tout bytecode.
+
+Usage:
+    python3 bundle.py [-o quiz.pyz]
+    python3 quiz.pyz -q bases_python
+"""
+
+import argparse
+import py_compile
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+from typing import List
+
+# Dossier des modules à empaqueter
+SOURCE = Path(__file__).resolve().parent
+
+# Point d'entrée de l'archive (seul fichier source)
+MAIN = "import sys\nimport main\n\nsys.exit(main.main())\n"
+
+INTERPRETER = "/usr/bin/env python3"
+
+
+def modules(source: Path = SOURCE) -> List[Path]:
+    """Modules de l'application (sans les tests ni ce script)."""
+    return [
+        path
+        for path in sorted(source.glob("*.py"))
+        if not path.name.startswith("test_") and path.name != "bundle.py"
+    ]
+
+
+def build(output: Path, source: Path = SOURCE) -> List[str]:
+    """
+    Construit l'archive.
+
+    Returns:
+        Noms des modules empaquetés
+
+    Raises:
+        py_compile.PyCompileError: Si un module ne compile pas
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp)
+        noms = []
+        for path in modules(source):
+            py_compile.compile(
+                str(path),
+                cfile=str(staging / f"{path.stem}.pyc"),
+                dfile=path.name,
+                doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            noms.append(path.stem)
+        (staging / "__main__.py").write_text(MAIN, encoding="utf-8")
+        zipapp.create_archive(staging, output, interpreter=INTERPRETER)
+    return noms
+
+
+def main() -> int:
+    """Point d'entrée : construit l'archive exécutable."""
+    parser = argparse.ArgumentParser(description="Archive exécutable du quiz")
+    parser.add_argument(
+        "-o", "--output", default="quiz.pyz", help="Archive produite (défaut: quiz.pyz)"
+    )
+    args = parser.parse_args()
+
+    try:
+        noms = build(Path(args.output))
+    except (OSError, py_compile.PyCompileError) as exc:
+        print(f"✗ {exc}")
+        return 1
+    print(f"✓ {args.output} : {len(noms)} modules")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
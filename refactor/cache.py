@@ -0,0 +1,225 @@
+"""
+Cache des quiz compilés.
+
+Un quiz JSON est compilé une fois dans un fichier de données (un conteneur
+indexé, voir quiz_data) rangé dans config.data_path / config.CACHE_PATH.
+Aucun format exécutable (pickle) n'est relu : une entrée modifiée par un
+tiers ne peut pas faire exécuter de code, et une entrée qui n'appartient
+pas à l'utilisateur courant (ou modifiable par d'autres) est ignorée.
+
+Chaque entrée est formée de deux fichiers nommés d'après le chemin du
+fichier source : les données compilées (SUFFIX) et leur clé (KEY_SUFFIX,
+JSON). L'entrée reste valide tant que la taille et la date de modification
+du fichier source sont inchangées ; si seule la date a changé, l'empreinte
+SHA-256 du contenu tranche, puis la clé est mise à jour. La clé porte
+aussi la version du format compilé fournie par l'appelant : changer ce
+format invalide toutes les entrées existantes.
+
+La taille totale du cache est plafonnée par config.cache_max_bytes : les
+entrées les moins récemment utilisées sont supprimées en premier.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import config
+
+# Extension des données compilées et de leur clé
+SUFFIX = ".qzix"
+KEY_SUFFIX = ".key"
+
+
+def cache_dir() -> Path:
+    """Retourne le répertoire du cache."""
+    return config.data_path / config.CACHE_PATH
+
+
+def derived_path(source: Path, suffix: str) -> Path:
+    """Retourne un fichier du cache dérivé d'un fichier source, par extension."""
+    key = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()
+    return cache_dir() / (key + suffix)
+
+
+def _digest(source: Path) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier."""
+    sha = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def fingerprint(source: Path, version: int) -> Dict[str, Any]:
+    """
+    Calcule l'empreinte d'un fichier source.
+
+    À calculer avant de lire le fichier : s'il est modifié pendant la
+    compilation, l'entrée enregistrée sera invalidée au prochain lancement.
+
+    Args:
+        source: Fichier source
+        version: Version du format de la structure compilée
+    """
+    stat = source.stat()
+    return {
+        "version": version,
+        "path": str(source.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _digest(source),
+    }
+
+
+def _trusted(path: Path) -> bool:
+    """
+    Indique si un fichier du cache peut être relu : il appartient à
+    l'utilisateur courant (ou à root) et n'est modifiable que par lui.
+    Sans notion de propriétaire (Windows), tout fichier est accepté.
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    stat = path.stat()
+    return stat.st_uid in (os.getuid(), 0) and not stat.st_mode & 0o022
+
+
+def _write_file(path: Path, write: Callable[[Path], None]) -> None:
+    """Écrit un fichier du cache par un fichier temporaire renommé."""
+    fd, name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    os.close(fd)
+    tmp_path = Path(name)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _write_key(path: Path, key: Dict[str, Any]) -> None:
+    _write_file(path, lambda tmp: tmp.write_text(json.dumps(key), encoding="utf-8"))
+
+
+def _matches(key: Dict[str, Any], source: Path, version: int, size: int) -> bool:
+    """Compare une clé au fichier source, hors date de modification."""
+    return (
+        key["version"] == version
+        and key["path"] == str(source.resolve())
+        and key["size"] == size
+    )
+
+
+def lookup(source: Path, version: int, required: bool = False) -> Optional[Path]:
+    """
+    Retourne les données compilées d'un fichier source, ou None.
+
+    Args:
+        source: Fichier source (quiz JSON)
+        version: Version attendue du format compilé
+        required: Consulter le cache même s'il est désactivé
+                  (config.cache_max_bytes <= 0)
+
+    Returns:
+        Fichier enregistré par store(), ou None si l'entrée est absente,
+        d'un autre utilisateur ou ne correspond plus au fichier source
+    """
+    if config.cache_max_bytes <= 0 and not required:
+        return None
+
+    entry = derived_path(source, SUFFIX)
+    key_path = derived_path(source, KEY_SUFFIX)
+    try:
+        if not (_trusted(key_path) and _trusted(entry)):
+            return None
+        key = json.loads(key_path.read_text(encoding="utf-8"))
+        stat = source.stat()
+        if not _matches(key, source, version, stat.st_size):
+            return None
+        if key["mtime_ns"] != stat.st_mtime_ns:
+            if key["sha256"] != _digest(source):
+                return None
+            # Contenu inchangé : ne plus hacher le fichier aux lancements suivants
+            _write_key(key_path, {**key, "mtime_ns": stat.st_mtime_ns})
+        # Marquer l'entrée comme récemment utilisée (éviction LRU)
+        os.utime(entry)
+        return entry
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def store(
+    source: Path,
+    key: Dict[str, Any],
+    write: Callable[[Path], None],
+    required: bool = False,
+) -> Optional[Path]:
+    """
+    Compile et enregistre les données d'un fichier source.
+
+    Les données sont écrites par `write` dans un fichier temporaire renommé,
+    pour qu'un lecteur concurrent ne voie jamais d'entrée partielle ; la clé
+    est écrite ensuite. Les erreurs d'écriture sont ignorées (le cache n'est
+    qu'une optimisation) ; celles de `write` sur le contenu sont propagées.
+
+    Args:
+        source: Fichier source
+        key: Empreinte du fichier source, calculée par fingerprint()
+        write: Fonction écrivant les données compilées dans un fichier
+        required: Enregistrer même si le cache est désactivé (l'entrée
+                  est alors la seule conservée)
+
+    Returns:
+        Fichier des données compilées, ou None s'il n'a pas pu être écrit
+    """
+    if config.cache_max_bytes <= 0 and not required:
+        return None
+
+    entry = derived_path(source, SUFFIX)
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        _write_file(entry, write)
+        _write_key(derived_path(source, KEY_SUFFIX), key)
+    except OSError:
+        return None
+
+    evict(max(config.cache_max_bytes, 0), keep=entry.stem)
+    return entry
+
+
+def evict(max_bytes: int, keep: str = "") -> None:
+    """
+    Supprime les entrées les moins récemment utilisées au-delà de max_bytes.
+
+    La taille d'une entrée compte tous ses fichiers, son dernier usage est
+    la date la plus récente de ceux-ci. L'entrée `keep` (nom sans extension)
+    n'est jamais supprimée.
+    """
+    entries: Dict[str, list] = {}
+    for path in cache_dir().glob("*"):
+        # Ni temporaires ni fichiers d'autres modules (catalogue)
+        if path.suffix not in (SUFFIX, KEY_SUFFIX):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entry = entries.setdefault(path.stem, [0, 0, []])
+        entry[0] = max(entry[0], stat.st_mtime_ns)
+        entry[1] += stat.st_size
+        entry[2].append(path)
+
+    total = sum(size for _, size, _ in entries.values())
+    for stem, (_, size, paths) in sorted(entries.items(), key=lambda e: e[1][0]):
+        if total <= max_bytes:
+            break
+        if stem == keep:
+            continue
+        # La clé d'abord : un lecteur concurrent voit alors un défaut de cache
+        try:
+            for path in sorted(paths, key=lambda p: p.suffix != KEY_SUFFIX):
+                path.unlink(missing_ok=True)
+        except OSError:
+            continue
+        total -= size
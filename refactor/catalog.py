@@ -0,0 +1,165 @@
+"""
+Catalogue des quiz disponibles.
+
+Le catalogue est un fichier JSON (config.data_path / config.CACHE_PATH /
+CATALOG_FILE, hors du dossier des quiz) qui mémorise, pour chaque fichier de quiz, son titre, son
+nombre de questions, son empreinte SHA-256 et son format. Il est mis à jour
+de façon incrémentale : seuls les fichiers dont la taille ou la date de
+modification a changé sont relus, en une seule passe (lecture en flux,
+hachage au fil de l'eau). Lister des centaines de quiz ne coûte donc
+qu'un appel à stat() par fichier.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+import atomic
+import config
+import container
+import crypto
+
+CATALOG_FILE = ".catalog"
+CATALOG_VERSION = 1
+
+# Versions des formats de fichier de quiz
+JSON_FORMAT_VERSION = 1
+
+
+# Adaptateur de fichier : container.iter_json_questions n'appelle que read()
+class _HashingReader:  # pylint: disable=too-few-public-methods
+    """Enveloppe un fichier binaire et calcule le SHA-256 de ce qui est lu."""
+
+    def __init__(self, f) -> None:
+        self.f = f
+        self.sha = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        """Lit et hache un bloc."""
+        data = self.f.read(size)
+        self.sha.update(data)
+        return data
+
+
+def catalog_path() -> Path:
+    """Retourne le chemin du fichier catalogue."""
+    return config.data_path / config.CACHE_PATH / CATALOG_FILE
+
+
+def describe(path: Path) -> Dict[str, Any]:
+    """
+    Décrit un fichier de quiz : titre, nombre de questions, empreinte, format.
+
+    Le fichier est lu une seule fois, en flux. Pour un conteneur, l'en-tête
+    suffit à connaître le titre et le nombre de questions.
+
+    Raises:
+        OSError: Si le fichier est illisible
+        ValueError: Si le contenu n'est pas un quiz (JSON ou conteneur invalide)
+    """
+    with open(path, "rb") as f:
+        head = f.read(len(container.MAGIC))
+        f.seek(0)
+        reader = _HashingReader(f)
+
+        if container.is_container(head):
+            with container.Container(path) as quiz:
+                title, count = quiz.meta.get("quiz_title"), len(quiz)
+            for _ in iter(lambda: reader.read(1 << 20), b""):
+                pass
+            file_format, version = "container", container.VERSION
+        else:
+            header: Dict[str, Any] = {}
+            count = sum(1 for _ in container.iter_json_questions(reader, header))
+            title = header.get("quiz_title")
+            if crypto.is_compressed(head):
+                file_format = "gzip"
+            else:
+                file_format = "xor" if crypto.is_encrypted(head) else "plain"
+            version = JSON_FORMAT_VERSION
+
+    if not isinstance(title, str):
+        raise ValueError(f"{path}: 'quiz_title' manquant.")
+
+    return {
+        "title": title,
+        "questions": count,
+        "sha256": reader.sha.hexdigest(),
+        "format": file_format,
+        "format_version": version,
+    }
+
+
+def _read() -> Dict[str, Dict[str, Any]]:
+    """Lit les entrées du catalogue (vide s'il est absent ou illisible)."""
+    try:
+        with open(catalog_path(), "rb") as f:
+            data = json.load(f)
+        if data.get("version") == CATALOG_VERSION:
+            return data["banks"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _write(banks: Dict[str, Dict[str, Any]]) -> None:
+    """Écrit le catalogue de façon atomique (voir atomic.write)."""
+    path = catalog_path()
+    data = {"version": CATALOG_VERSION, "banks": banks}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic.write(
+            path,
+            json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True).encode(
+                "utf-8"
+            ),
+            fsync=False,
+        )
+    except OSError:
+        # Répertoire en lecture seule : le catalogue sera recalculé la prochaine fois
+        pass
+
+
+def refresh() -> Dict[str, Dict[str, Any]]:
+    """
+    Met à jour le catalogue et retourne ses entrées, indexées par nom de quiz.
+
+    Seuls les fichiers nouveaux ou modifiés (taille ou date) sont relus ;
+    les entrées des fichiers supprimés sont retirées. Un fichier illisible
+    apparaît avec une clé "error".
+    """
+    banks = _read()
+    updated: Dict[str, Dict[str, Any]] = {}
+    changed = False
+
+    for path in (config.data_path / config.QUIZ_PATH).glob("*.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        name = path.stem
+        entry = banks.get(name)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            updated[name] = entry
+            continue
+
+        try:
+            entry = describe(path)
+        except (OSError, ValueError, container.ContainerError) as exc:
+            entry = {"error": str(exc)}
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        updated[name] = entry
+        changed = True
+
+    if changed or updated.keys() != banks.keys():
+        _write(updated)
+    return updated
+
+
+def list_banks() -> List[Dict[str, Any]]:
+    """Retourne les quiz disponibles, triés par nom, avec leur description."""
+    return [{"name": name, **entry} for name, entry in sorted(refresh().items())]
@@ -4,11 +4,76 @@ Configuration
 
 import os
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Optional
 
 
-load_dotenv()  # charge .env depuis le répertoire courant (ou parent)
+def find_dotenv() -> Optional[Path]:
+    """Cherche un fichier .env dans le dossier de ce module puis ses parents."""
+    directory = Path(__file__).resolve().parent
+    for candidate in (directory, *directory.parents):
+        path = candidate / ".env"
+        if path.is_file():
+            return path
+    return None
+
+
+def _parse_dotenv(path: Path) -> None:
+    """Lecture minimale d'un .env (CLE=valeur) quand python-dotenv est absent."""
+    for line in path.read_text(encoding="utf-8").splitlines():
+        key, sep, value = line.strip().removeprefix("export ").partition("=")
+        if sep and key and not key.startswith("#"):
+            os.environ.setdefault(key.strip(), value.strip().strip("'\""))
+
+
+def load_env() -> None:
+    """
+    Charge le fichier .env s'il existe, sans écraser l'environnement.
+
+    python-dotenv n'est importé que si un fichier est trouvé : sans .env, le
+    démarrage ne paie pas son import.
+    """
+    path = find_dotenv()
+    if path is None:
+        return
+    try:
+        from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        _parse_dotenv(path)
+    else:
+        load_dotenv(path)
+
+
+load_env()
 data_path: Path = Path(os.getenv("DATA_PATH", "."))
 
 QUIZ_PATH = "quiz"
 RESULT_PATH = "resultats"
+
+# Stockage des résultats : "json" (un fichier chiffré par élève) ou "sqlite"
+# (une base RESULT_DB commune dans RESULT_PATH, voir resultats_sqlite)
+result_backend: str = os.getenv("RESULT_BACKEND", "json")
+RESULT_DB = "resultats.sqlite3"
+
+# Cache des quiz compilés (0 pour désactiver le cache)
+CACHE_PATH = ".cache"
+cache_max_bytes: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Budget mémoire du chargement d'un quiz (0 pour ne pas le limiter) : un quiz
+# qui le dépasserait est converti en conteneur et lu à la demande (voir quiz_data)
+memory_budget: int = int(os.getenv("MEMORY_BUDGET_BYTES", str(256 * 1024 * 1024)))
+
+# Journal des réponses : synchronisation ("always", "interval", "never")
+journal_fsync: str = os.getenv("JOURNAL_FSYNC", "interval")
+JOURNAL_FSYNC_INTERVAL = 1.0
+
+# Attente maximale d'un verrou sur un fichier de résultats (secondes)
+LOCK_TIMEOUT = 10.0
+
+# Sauvegarde automatique : délai de regroupement des mises à jour (secondes)
+AUTOSAVE_DELAY = 1.0
+
+# Serveur HTTP (voir server) : adresse d'écoute par défaut et inactivité
+# au-delà de laquelle une session est fermée (secondes)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+SESSION_IDLE_TIMEOUT = 1800.0
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Conteneur binaire indexé pour les quiz.
+
+Le format JSON d'origine oblige à analyser tout le fichier pour lire une
+seule question. Ce conteneur stocke chaque question dans un enregistrement
+indépendant, retrouvé par son id grâce à une table triée, et s'ouvre avec
+mmap : seules les questions réellement posées sont décodées.
+
+Format (entiers little-endian) :
+
+    en-tête    magic "QZIX", version (u16), flags (u16),
+               nombre de questions (u32), taille des métadonnées (u32)
+    méta       JSON UTF-8 chiffré XOR (quiz_title, language, ...),
+               complété par des zéros jusqu'à un multiple de 8 octets
+    ids        n x int64, triés par ordre croissant
+    offsets    (n + 1) x uint64, relatifs au début des enregistrements
+    records    n questions au format source, JSON compact chiffré XOR
+
+Usage:
+    python3 container.py SOURCE.json DESTINATION.json
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import crypto
+
+MAGIC = b"QZIX"
+VERSION = 1
+FLAG_XOR = 0x0001
+
+_HEADER = struct.Struct("<4sHHII")
+
+
+# Membre des métadonnées : ids dans l'ordre du fichier source, quand il
+# diffère de l'ordre croissant du conteneur
+ORDER_KEY = "ordre_ids"
+
+# Événement produit par crypto.stream_json pour chaque question
+QUESTION_ITEM = "questions" + crypto.ITEM_SUFFIX
+
+
+class ContainerError(Exception):
+    """Erreur liée au format du conteneur (en-tête, version, table)."""
+
+
+def is_container(head: bytes) -> bool:
+    """Indique si les premiers octets d'un fichier sont ceux d'un conteneur."""
+    return head[: len(MAGIC)] == MAGIC
+
+
+def iter_json_questions(f: BinaryIO, header: Dict[str, Any]) -> Iterator[Any]:
+    """
+    Lit en flux un quiz JSON (clair, compressé ou chiffré) et produit ses
+    questions au format source.
+
+    Les autres membres de premier niveau sont recopiés dans `header` au fil
+    de la lecture ("questions" y vaut []) : ceux qui suivent le tableau n'y
+    figurent qu'une fois le flux épuisé.
+    """
+    for key, value in crypto.stream_json(f):
+        if key == QUESTION_ITEM:
+            yield value
+        else:
+            header[key] = value
+
+
+def _padding(size: int) -> int:
+    """Nombre d'octets à ajouter pour aligner `size` sur 8 octets."""
+    return -size % 8
+
+
+def _table(raw: memoryview, typecode: str):
+    """Vue sur une table d'entiers little-endian (copie seulement sur big-endian)."""
+    if sys.byteorder == "little":
+        return raw.cast(typecode)
+    table = array(typecode, raw)
+    table.byteswap()
+    return table
+
+
+def _spool(questions: Iterable[Dict], spool: BinaryIO) -> Tuple[array, array]:
+    """
+    Chiffre les questions dans le fichier d'attente, dans l'ordre du flux.
+
+    Le XOR n'ayant pas d'état, les enregistrements sont chiffrés et écrits
+    par blocs d'environ crypto.CHUNK_SIZE plutôt qu'un par un.
+
+    Returns:
+        Ids des questions et offsets de leurs enregistrements dans `spool`
+        (n + 1 valeurs)
+
+    Raises:
+        ValueError: Si une question n'a pas d'id entier
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    ids = array("q")
+    spool_offsets = array("Q", [0])
+    pending = bytearray()
+    for position, question in enumerate(questions, 1):
+        if not isinstance(question, dict) or not isinstance(question.get("id"), int):
+            raise ValueError(f"question {position} - 'id' doit être un int.")
+        record = encode(question).encode("utf-8")
+        pending += record
+        ids.append(question["id"])
+        spool_offsets.append(spool_offsets[-1] + len(record))
+        if len(pending) >= crypto.CHUNK_SIZE:
+            spool.write(crypto.xor_bytes(pending))
+            pending.clear()
+    spool.write(crypto.xor_bytes(pending))
+    return ids, spool_offsets
+
+
+def _index(ids: array, spool_offsets: array) -> Tuple[List[int], array, array]:
+    """
+    Construit les tables du conteneur, triées par id.
+
+    Returns:
+        Ordre des enregistrements (positions dans le fichier d'attente), ids
+        triés et offsets des enregistrements, en little-endian
+
+    Raises:
+        ValueError: Si un id est dupliqué
+    """
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    sorted_ids = array("q", (ids[i] for i in order))
+    for previous, current in zip(sorted_ids, sorted_ids[1:]):
+        if previous == current:
+            raise ValueError(f"id {current} dupliqué.")
+
+    offsets = array("Q", [0])
+    for i in order:
+        offsets.append(offsets[-1] + spool_offsets[i + 1] - spool_offsets[i])
+    if sys.byteorder != "little":
+        sorted_ids.byteswap()
+        offsets.byteswap()
+    return order, sorted_ids, offsets
+
+
+def write(path: Path, meta: Dict[str, Any], questions: Iterable[Dict]) -> int:
+    """
+    Écrit un conteneur à partir de métadonnées et d'un flux de questions.
+
+    Les questions sont consommées une par une et mises en attente dans un
+    fichier temporaire : la mémoire utilisée ne dépend que du nombre de
+    questions (16 octets par question), pas de leur taille.
+
+    Args:
+        path: Fichier de destination
+        meta: Membres de premier niveau du quiz hors questions, sérialisés
+              une fois toutes les questions consommées
+        questions: Questions au format source (id, question, choices, answer_index)
+
+    Returns:
+        Nombre de questions écrites
+
+    Raises:
+        ValueError: Si une question n'a pas d'id entier ou si un id est dupliqué
+    """
+    with tempfile.TemporaryFile() as spool:
+        ids, spool_offsets = _spool(questions, spool)
+        order, sorted_ids, offsets = _index(ids, spool_offsets)
+        meta_bytes = crypto.xor_bytes(
+            json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        )
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, FLAG_XOR, len(ids), len(meta_bytes)))
+            f.write(meta_bytes + b"\0" * _padding(len(meta_bytes)))
+            f.write(sorted_ids.tobytes())
+            f.write(offsets.tobytes())
+            # Recopier les enregistrements dans l'ordre des ids
+            for i in order:
+                spool.seek(spool_offsets[i])
+                f.write(spool.read(spool_offsets[i + 1] - spool_offsets[i]))
+
+    return len(ids)
+
+
+class Container:
+    """
+    Conteneur ouvert en lecture via mmap.
+
+    L'ouverture ne lit que l'en-tête et les métadonnées : les tables d'ids et
+    d'offsets sont des vues sur le fichier projeté, et chaque question n'est
+    déchiffrée qu'à la demande.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except (struct.error, ValueError) as exc:
+            self.close()
+            raise ContainerError(f"{path}: conteneur corrompu.") from exc
+        except ContainerError:
+            self.close()
+            raise
+
+    def _open(self) -> None:
+        magic, version, flags, count, meta_size = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ContainerError(f"{self.path}: ce n'est pas un conteneur de quiz.")
+        if version != VERSION:
+            raise ContainerError(f"{self.path}: version {version} non supportée.")
+
+        self._xor = bool(flags & FLAG_XOR)
+        position = _HEADER.size
+        self.meta: Dict[str, Any] = json.loads(
+            self._decode(self._mmap[position : position + meta_size])
+        )
+
+        position += meta_size + _padding(meta_size)
+        self._records = position + 16 * count + 8
+        if self._records > len(self._mmap):
+            raise ContainerError(f"{self.path}: conteneur tronqué.")
+
+        with memoryview(self._mmap) as view:
+            self.ids = _table(view[position : position + 8 * count], "q")
+            position += 8 * count
+            self._offsets = _table(view[position : self._records], "Q")
+        if self._records + self._offsets[-1] > len(self._mmap):
+            raise ContainerError(f"{self.path}: conteneur tronqué.")
+
+    def _decode(self, raw) -> str:
+        if self._xor:
+            raw = crypto.xor_bytes(raw)
+        return bytes(raw).decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def position(self, question_id: int) -> Optional[int]:
+        """Retourne la position d'une question (recherche dichotomique), ou None."""
+        position = bisect.bisect_left(self.ids, question_id)
+        if position < len(self.ids) and self.ids[position] == question_id:
+            return position
+        return None
+
+    def __getitem__(self, position: int) -> Dict:
+        if not 0 <= position < len(self.ids):
+            raise IndexError(position)
+        return self.record(position)
+
+    def record(self, position: int) -> Dict:
+        """Déchiffre et retourne la question stockée à `position` (format source)."""
+        start = self._records + self._offsets[position]
+        end = self._records + self._offsets[position + 1]
+        return json.loads(self._decode(self._mmap[start:end]))
+
+    def close(self) -> None:
+        """Libère les vues et la projection mémoire."""
+        for name in ("ids", "_offsets"):
+            table = self.__dict__.pop(name, None)
+            if isinstance(table, memoryview):
+                table.release()
+        if not self._mmap.closed:
+            self._mmap.close()
+
+    def __enter__(self) -> "Container":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert(source: Path, destination: Path) -> int:
+    """
+    Convertit un quiz JSON (clair ou chiffré) en conteneur, en flux.
+
+    Si les ids du fichier source ne sont pas croissants, leur ordre est
+    conservé dans les métadonnées (ORDER_KEY), comme pour le cache.
+
+    Returns:
+        Nombre de questions écrites
+    """
+    meta: Dict[str, Any] = {}
+    ids: List[int] = []
+
+    def questions(f):
+        for question in iter_json_questions(f, meta):
+            yield question
+            # Atteint seulement si _spool a accepté l'id
+            ids.append(question["id"])
+        meta.pop("questions", None)
+        if ids != sorted(ids):
+            meta[ORDER_KEY] = ids
+
+    with tempfile.NamedTemporaryFile(
+        dir=destination.parent, prefix=destination.name, delete=False
+    ) as tmp:
+        tmp_path = Path(tmp.name)
+    try:
+        # write() sérialise `meta` après avoir consommé toutes les questions :
+        # les membres situés après le tableau sont donc bien pris en compte.
+        with open(source, "rb") as f:
+            count = write(tmp_path, meta, questions(f))
+        tmp_path.replace(destination)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def main() -> int:
+    """Point d'entrée : conversion d'un quiz JSON en conteneur."""
+    if len(sys.argv) != 3:
+        print(__doc__.split("Usage:")[1].strip())
+        return 2
+    source, destination = Path(sys.argv[1]), Path(sys.argv[2])
+    count = convert(source, destination)
+    print(f"✓ {destination} : {count} questions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,15 +10,153 @@ The implementation supports:
 - Backwards compatibility with existing plain JSON files
 - UTF-8 character preservation (accents, special characters)
 - Symmetric encryption (same operation for encrypt/decrypt)
+- Streaming decryption and parsing of large files (stream_json)
+- Optional gzip compression around either form (is_compressed), detected
+  from the gzip magic number and undone before the encryption check
+
+The XOR itself is delegated to a pluggable codec backend. The default
+backend applies a precomputed 256-entry translation table with
+``bytes.translate``, which runs entirely in C. Large inputs are processed
+in fixed-size ``memoryview`` chunks so that no intermediate copy of the
+whole buffer is made. Run ``python3 -m benchmarks.crypto_backends`` to
+compare the backends on the current machine.
 """
 
+import codecs
 import json
-from typing import Dict, Any
+import zlib
+from typing import BinaryIO, Callable, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+import timings
 
 
 # XOR encryption key
 XOR_KEY = 0xA5
 
+# First bytes of a gzip stream (RFC 1952)
+GZIP_MAGIC = b"\x1f\x8b"
+
+# zlib window bits selecting the gzip container
+_GZIP_WBITS = zlib.MAX_WBITS | 16
+
+# Block size processed by xor_chunks() / xor_bytes() (1 MiB)
+CHUNK_SIZE = 1 << 20
+
+# Translation table cache, one per key (at most 256 entries)
+_XOR_TABLES: Dict[int, bytes] = {}
+
+
+def xor_table(key: int = XOR_KEY) -> bytes:
+    """
+    Return the 256-entry translation table mapping each byte to ``byte ^ key``.
+
+    Tables are computed once per key and cached.
+
+    Args:
+        key: XOR key (0-255)
+
+    Returns:
+        Translation table usable with ``bytes.translate``
+
+    Example:
+        >>> xor_table(0xA5)[0x41] == 0x41 ^ 0xA5
+        True
+    """
+    table = _XOR_TABLES.get(key)
+    if table is None:
+        table = bytes(b ^ key for b in range(256))
+        _XOR_TABLES[key] = table
+    return table
+
+
+def _xor_translate(data, key: int) -> bytes:
+    """Backend ``translate``: table lookup done by ``bytes.translate`` (C)."""
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    return bytes(data.translate(xor_table(key)))
+
+
+def _xor_int(data, key: int) -> bytes:
+    """Backend ``int``: one wide-integer XOR over the whole buffer."""
+    size = len(data)
+    if not size:
+        return b""
+    mask = int.from_bytes(bytes((key,)) * size, "little")
+    return (int.from_bytes(data, "little") ^ mask).to_bytes(size, "little")
+
+
+def _xor_generator(data, key: int) -> bytes:
+    """Backend ``generator``: historical pure-Python implementation (reference)."""
+    return bytes(b ^ key for b in data)
+
+
+# Available backends, fastest first (see benchmarks)
+BACKENDS: Dict[str, Callable[..., bytes]] = {
+    "translate": _xor_translate,
+    "int": _xor_int,
+    "generator": _xor_generator,
+}
+
+_backend: Callable[..., bytes] = BACKENDS["translate"]
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the XOR backend used by xor_bytes() and xor_chunks().
+
+    Args:
+        name: One of the keys of BACKENDS
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _backend  # pylint: disable=global-statement
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown XOR backend {name!r} (expected one of {', '.join(BACKENDS)})"
+        )
+    _backend = BACKENDS[name]
+
+
+def xor_chunks(chunks: Iterable, key: int = XOR_KEY) -> Iterator[bytes]:
+    """
+    Apply XOR cipher to a stream of bytes-like chunks.
+
+    Each chunk is encoded independently (XOR with a single-byte key has no
+    state), which makes this suitable for streaming readers and for slices
+    of ``memoryview``/``mmap`` objects.
+
+    Args:
+        chunks: Iterable of bytes-like objects
+        key: XOR key (default 0xA5)
+
+    Yields:
+        Encrypted/decrypted chunks, in order
+
+    Example:
+        >>> b"".join(xor_chunks([b"He", b"llo"])) == xor_bytes(b"Hello")
+        True
+    """
+    backend = _backend
+    for chunk in chunks:
+        yield backend(chunk, key)
+
+
+def iter_chunks(data, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Split a bytes-like object into zero-copy ``memoryview`` chunks.
+
+    Args:
+        data: Bytes-like object (bytes, bytearray, memoryview, mmap)
+        chunk_size: Maximum size of each chunk
+
+    Yields:
+        Consecutive memoryview slices covering ``data``
+    """
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset : offset + chunk_size]
+
 
 def xor_bytes(data: bytes, key: int = XOR_KEY) -> bytes:
     """
@@ -27,8 +165,12 @@ def xor_bytes(data: bytes, key: int = XOR_KEY) -> bytes:
     XOR is symmetric: applying it twice returns the original data.
     This means the same function works for both encryption and decryption.
 
+    ``bytes``/``bytearray`` inputs are translated in one pass. Other
+    bytes-like inputs (memoryview, mmap) larger than CHUNK_SIZE are
+    processed chunk by chunk so that no full copy of the input is made.
+
     Args:
-        data: Bytes to encrypt/decrypt
+        data: Bytes-like object to encrypt/decrypt
         key: XOR key (default 0xA5)
 
     Returns:
@@ -41,7 +183,58 @@ def xor_bytes(data: bytes, key: int = XOR_KEY) -> bytes:
         >>> original == decrypted
         True
     """
-    return bytes(b ^ key for b in data)
+    with timings.timer("xor"):
+        if isinstance(data, (bytes, bytearray)) or len(data) <= CHUNK_SIZE:
+            return _backend(data, key)
+
+        return b"".join(xor_chunks(iter_chunks(data), key))
+
+
+def is_compressed(data: bytes) -> bool:
+    """
+    Detect gzip-compressed data from its magic number.
+
+    Compressed files wrap plain or encrypted JSON: check is_encrypted()
+    on the decompressed bytes.
+    """
+    return data[:len(GZIP_MAGIC)] == GZIP_MAGIC
+
+
+def compress_chunks(chunks: Iterable) -> Iterator[bytes]:
+    """
+    Compress a stream of byte chunks into a single gzip stream.
+
+    The gzip header carries no timestamp: the same input always gives the
+    same output.
+    """
+    compressor = zlib.compressobj(wbits=_GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress(data: bytes) -> bytes:
+    """Compress bytes in the gzip format (see compress_chunks)."""
+    return b"".join(compress_chunks([data]))
+
+
+def decompress(data: bytes) -> bytes:
+    """
+    Decompress gzip data.
+
+    Raises:
+        json.JSONDecodeError: If the data is not a complete gzip stream
+    """
+    decompressor = zlib.decompressobj(wbits=_GZIP_WBITS)
+    try:
+        result = decompressor.decompress(data)
+    except zlib.error as exc:
+        raise json.JSONDecodeError(f"Invalid gzip data: {exc}", "", 0) from exc
+    if not decompressor.eof:
+        raise json.JSONDecodeError("Truncated gzip data", "", 0)
+    return result
 
 
 def is_encrypted(data: bytes) -> bool:
@@ -87,7 +280,7 @@ def is_encrypted(data: bytes) -> bool:
     return True
 
 
-def encrypt_json(data: Dict[str, Any]) -> bytes:
+def encrypt_json(data: Dict[str, Any], indent: Optional[int] = 2) -> bytes:
     """
     Encrypt JSON data to bytes.
 
@@ -98,6 +291,8 @@ def encrypt_json(data: Dict[str, Any]) -> bytes:
 
     Args:
         data: Dictionary to encrypt
+        indent: JSON indentation; None writes compact JSON with the C
+                encoder, several times faster for large documents
 
     Returns:
         Encrypted bytes ready to write to file
@@ -111,7 +306,8 @@ def encrypt_json(data: Dict[str, Any]) -> bytes:
         True
     """
     # Convert to JSON string with pretty formatting (same as original)
-    json_str = json.dumps(data, indent=2, ensure_ascii=False)
+    json_str = json.dumps(data, indent=indent, ensure_ascii=False,
+                          separators=None if indent is not None else (',', ':'))
 
     # Encode to UTF-8 bytes
     json_bytes = json_str.encode('utf-8')
@@ -153,15 +349,17 @@ def decrypt_json(encrypted_data: bytes) -> Dict[str, Any]:
     json_str = json_bytes.decode('utf-8')
 
     # Parse JSON
-    return json.loads(json_str)
+    with timings.timer("json"):
+        return json.loads(json_str)
 
 
 def load_json(file_bytes: bytes) -> Dict[str, Any]:
     """
-    Load JSON from bytes, auto-detecting encryption.
+    Load JSON from bytes, auto-detecting compression and encryption.
 
     This function provides backwards compatibility by detecting
     whether the file is encrypted or plain JSON and handling both.
+    Gzip-compressed files are decompressed first.
 
     Process:
     1. Detect if data is encrypted using is_encrypted()
@@ -176,7 +374,7 @@ def load_json(file_bytes: bytes) -> Dict[str, Any]:
 
     Raises:
         UnicodeDecodeError: If data is not valid UTF-8
-        json.JSONDecodeError: If data is not valid JSON
+        json.JSONDecodeError: If data is not valid JSON (or gzip)
 
     Example:
         >>> # Works with encrypted data
@@ -188,22 +386,28 @@ def load_json(file_bytes: bytes) -> Dict[str, Any]:
         >>> load_json(plain)
         {'a': 1}
     """
+    if is_compressed(file_bytes):
+        file_bytes = decompress(file_bytes)
+
     if is_encrypted(file_bytes):
         # File is encrypted, decrypt it
         return decrypt_json(file_bytes)
     else:
         # File is plain JSON, parse directly
         json_str = file_bytes.decode('utf-8')
-        return json.loads(json_str)
+        with timings.timer("json"):
+            return json.loads(json_str)
 
 
-def save_json(data: Dict[str, Any], encrypt: bool = True) -> bytes:
+def save_json(data: Dict[str, Any], encrypt: bool = True,
+              indent: Optional[int] = 2) -> bytes:
     """
     Save JSON to bytes with optional encryption.
 
     Args:
         data: Dictionary to save
         encrypt: Whether to encrypt (default True)
+        indent: JSON indentation (None for compact JSON)
 
     Returns:
         Bytes to write to file
@@ -220,8 +424,220 @@ def save_json(data: Dict[str, Any], encrypt: bool = True) -> bytes:
         False
     """
     if encrypt:
-        return encrypt_json(data)
+        return encrypt_json(data, indent)
     else:
         # Plain JSON with formatting
-        json_str = json.dumps(data, indent=2, ensure_ascii=False)
+        json_str = json.dumps(data, indent=indent, ensure_ascii=False,
+                              separators=None if indent is not None else (',', ':'))
         return json_str.encode('utf-8')
+
+
+# Suffix of the events produced for each element of a streamed array
+ITEM_SUFFIX = ".item"
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+def iter_raw(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read a file object in chunks, decompressing it if it is gzip data.
+
+    Decompressed chunks are at most ``chunk_size`` bytes long, whatever
+    the compression ratio.
+
+    Args:
+        stream: Binary file object opened for reading
+        chunk_size: Size of each read
+
+    Yields:
+        Non-empty chunks of (possibly encrypted) JSON bytes
+
+    Raises:
+        json.JSONDecodeError: If the gzip data is corrupt or truncated
+    """
+    with timings.timer("lecture"):
+        chunk = stream.read(max(chunk_size, len(GZIP_MAGIC)))
+    decompressor = None
+    if is_compressed(chunk):
+        decompressor = zlib.decompressobj(wbits=_GZIP_WBITS)
+    while chunk:
+        if decompressor is None:
+            yield chunk
+        else:
+            try:
+                while chunk:
+                    data = decompressor.decompress(chunk, chunk_size)
+                    if data:
+                        yield data
+                    chunk = decompressor.unconsumed_tail
+            except zlib.error as exc:
+                raise json.JSONDecodeError(
+                    f"Invalid gzip data: {exc}", "", 0
+                ) from exc
+        with timings.timer("lecture"):
+            chunk = stream.read(chunk_size)
+    if decompressor is not None and not decompressor.eof:
+        raise json.JSONDecodeError("Truncated gzip data", "", 0)
+
+
+def iter_decoded(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read a file object in chunks and yield decrypted UTF-8 text.
+
+    Compression is undone by iter_raw(); encryption is then detected on
+    the first chunk with is_encrypted(). UTF-8 sequences split across
+    chunk boundaries are handled by an incremental decoder, so at most one
+    chunk is held in memory at a time.
+
+    Args:
+        stream: Binary file object opened for reading
+        chunk_size: Size of each read
+
+    Yields:
+        Decoded text fragments, in order
+
+    Raises:
+        UnicodeDecodeError: If the (decrypted) data is not valid UTF-8
+        json.JSONDecodeError: If the gzip data is corrupt or truncated
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encrypted = None
+    for chunk in iter_raw(stream, chunk_size):
+        if encrypted is None:
+            encrypted = is_encrypted(chunk)
+        if encrypted:
+            with timings.timer("xor"):
+                chunk = _backend(chunk, XOR_KEY)
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+class _TextBuffer:
+    """Sliding window over a text stream, consumed by _JsonStream."""
+
+    def __init__(self, fragments: Iterator[str], compact_at: int) -> None:
+        self.fragments = fragments
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self.compact_at = compact_at
+
+    def fill(self) -> bool:
+        """Append a fragment to the buffer. Return False at end of stream."""
+        if self.eof:
+            return False
+        fragment = next(self.fragments, None)
+        if fragment is None:
+            self.eof = True
+            return False
+        if self.pos > self.compact_at:
+            # Drop the consumed prefix to keep memory bounded
+            self.text = self.text[self.pos :]
+            self.pos = 0
+        self.text += fragment
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at end of stream)."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self.text, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode a complete JSON value at the current position."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number cut at the end of the buffer ("12" for "123") decodes
+            # without error: the next character is needed to be sure.
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def stream_json(
+    stream: BinaryIO, array_key: str = "questions", chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parse a (possibly encrypted) JSON object from a file.
+
+    The top-level object is reported member by member as ``(key, value)``
+    events. When the member named ``array_key`` is an array, it is reported
+    as an empty list, followed by one ``(array_key + ITEM_SUFFIX, element)``
+    event per element. Memory use is bounded by the chunk size and the size
+    of the largest element, not by the size of the file.
+
+    Args:
+        stream: Binary file object opened for reading
+        array_key: Top-level member whose array elements are streamed
+        chunk_size: Size of each read
+
+    Yields:
+        (key, value) events in document order
+
+    Raises:
+        UnicodeDecodeError: If the (decrypted) data is not valid UTF-8
+        json.JSONDecodeError: If the data is not a valid JSON object
+
+    Example:
+        >>> import io
+        >>> raw = encrypt_json({"quiz_title": "T", "questions": [{"id": 1}]})
+        >>> list(stream_json(io.BytesIO(raw)))
+        [('quiz_title', 'T'), ('questions', []), ('questions.item', {'id': 1})]
+    """
+    buffer = _TextBuffer(iter_decoded(stream, chunk_size), compact_at=chunk_size)
+    item_key = array_key + ITEM_SUFFIX
+
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        key = buffer.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError(
+                "Expecting property name", buffer.text, buffer.pos
+            )
+        buffer.expect(":")
+
+        if key == array_key and buffer.peek() == "[":
+            buffer.expect("[")
+            yield key, []
+            if buffer.peek() == "]":
+                buffer.expect("]")
+            else:
+                while True:
+                    yield item_key, buffer.value()
+                    if buffer.expect(",]") == "]":
+                        break
+        else:
+            yield key, buffer.value()
+
+        if buffer.expect(",}") == "}":
+            return
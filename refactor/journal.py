@@ -0,0 +1,163 @@
+"""
+Journal des réponses.
+
+Chaque bonne réponse est ajoutée à la fin d'un fichier journal, à côté du
+fichier de résultats, sous forme d'un enregistrement de taille fixe :
+
+    id de la question (int64) + CRC32 de l'id (uint32), chiffré XOR
+
+Un ajout coûte un seul appel à write() de 12 octets, quelle que soit la
+taille du quiz. À la reprise, le journal est rejoué sur le dernier
+instantané ; un enregistrement incomplet ou corrompu (écriture interrompue)
+termine la relecture. Rejouer un enregistrement déjà présent dans
+l'instantané est sans effet, ce qui rend la compaction (écriture de
+l'instantané puis vidage du journal) sûre en cas d'arrêt entre les deux.
+
+La compaction peut se faire depuis un autre thread (voir le module
+autosave) : mark() repère la fin du journal au moment de l'instantané, et
+compact() ne retire que les enregistrements antérieurs à ce repère.
+
+Politiques de synchronisation (config.journal_fsync) :
+
+    always     fsync après chaque enregistrement (résiste aux coupures de courant)
+    interval   fsync au plus toutes les JOURNAL_FSYNC_INTERVAL secondes
+    never      pas de fsync (résiste à l'arrêt du processus, pas du système)
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator
+import atomic
+import config
+import crypto
+import timings
+
+SUFFIX = ".journal"
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+_RECORD = struct.Struct("<qI")
+
+
+def _checksum(question_id: int) -> int:
+    return zlib.crc32(question_id.to_bytes(8, "little", signed=True))
+
+
+def encode(question_id: int) -> bytes:
+    """Encode un enregistrement du journal."""
+    return crypto.xor_bytes(_RECORD.pack(question_id, _checksum(question_id)))
+
+
+def replay(path: Path) -> Iterator[int]:
+    """
+    Relit les ids enregistrés dans un journal, dans l'ordre d'écriture.
+
+    Un journal absent est vide. La relecture s'arrête au premier
+    enregistrement incomplet ou dont la somme de contrôle est fausse.
+    """
+    try:
+        data = crypto.xor_bytes(path.read_bytes())
+    except FileNotFoundError:
+        return
+    end = len(data) - len(data) % _RECORD.size
+    for question_id, checksum in _RECORD.iter_unpack(data[:end]):
+        if checksum != _checksum(question_id):
+            return
+        yield question_id
+
+
+def clear(path: Path) -> None:
+    """
+    Vide un journal (après compaction dans l'instantané).
+
+    À n'utiliser que si aucun Journal n'est ouvert sur ce fichier : sinon,
+    passer par Journal.compact().
+    """
+    try:
+        os.truncate(path, 0)
+    except FileNotFoundError:
+        pass
+
+
+class Journal:
+    """Journal ouvert en ajout."""
+
+    def __init__(self, path: Path, fsync: str | None = None) -> None:
+        self.path = path
+        self.fsync = fsync or config.journal_fsync
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"politique fsync inconnue : {self.fsync!r}")
+        self._fd = self._open()
+        self._last_sync = time.monotonic()
+        # Enregistrements déjà retirés par compact() depuis l'ouverture
+        self._base = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> int:
+        return os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+
+    @property
+    def pending(self) -> int:
+        """Nombre d'enregistrements non encore compactés."""
+        return os.fstat(self._fd).st_size // _RECORD.size
+
+    def append(self, question_id: int) -> None:
+        """Ajoute une bonne réponse au journal."""
+        with self._lock, timings.timer("journal.ajout"):
+            os.write(self._fd, encode(question_id))
+            if self.fsync == "always":
+                os.fsync(self._fd)
+            elif self.fsync == "interval":
+                now = time.monotonic()
+                if now - self._last_sync >= config.JOURNAL_FSYNC_INTERVAL:
+                    os.fsync(self._fd)
+                    self._last_sync = now
+
+    def mark(self) -> int:
+        """Repère la fin actuelle du journal (numéro absolu d'enregistrement)."""
+        with self._lock:
+            return self._base + self.pending
+
+    def compact(self, mark: int) -> None:
+        """
+        Retire les enregistrements antérieurs à `mark`, inclus dans un instantané.
+
+        Les enregistrements ajoutés depuis sont recopiés dans un nouveau
+        journal qui remplace l'ancien par renommage : un arrêt pendant la
+        compaction laisse l'ancien journal intact.
+        """
+        with self._lock:
+            drop = mark - self._base
+            if drop <= 0:
+                return
+            size = os.fstat(self._fd).st_size
+            tail = os.pread(self._fd, size, drop * _RECORD.size)
+            if tail:
+                atomic.write(self.path, tail, fsync=self.fsync != "never")
+                os.close(self._fd)
+                self._fd = self._open()
+            else:
+                os.ftruncate(self._fd, 0)
+            self._base += drop
+
+    def close(self) -> None:
+        """Synchronise (sauf politique never) et ferme le journal."""
+        with self._lock:
+            if self._fd < 0:
+                return
+            try:
+                if self.fsync != "never":
+                    os.fsync(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = -1
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
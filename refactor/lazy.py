@@ -0,0 +1,31 @@
+"""
+Imports différés.
+
+lazy_import(nom) retourne un module dont le code ne s'exécute qu'au premier
+accès à l'un de ses attributs (importlib.util.LazyLoader). Les modules
+rarement utilisés (sqlite3, validation, ...) et ceux dont `--help` ou
+`--list` n'ont pas besoin ne ralentissent plus le démarrage de ./quiz.
+
+Un module déjà importé est retourné tel quel ; un module introuvable lève
+ModuleNotFoundError dès l'appel, comme un import normal.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Importe un module de façon différée."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
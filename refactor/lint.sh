@@ -11,7 +11,7 @@ NC='\033[0m' # No Color
 source venv/bin/activate
 
 # Python files to check (excluding venv)
-PYTHON_FILES="config.py main.py quiz_data.py resultats_data.py ui.py"
+PYTHON_FILES="analytics.py atomic.py autosave.py batch.py bundle.py cache.py catalog.py config.py container.py journal.py lazy.py locking.py main.py migrate_encryption.py quiz_data.py resultats_data.py resultats_sqlite.py server.py session.py timings.py ui.py validator.py"
 
 echo -e "${YELLOW}=== Running Black Formatter ===${NC}"
 black $PYTHON_FILES
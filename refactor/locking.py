@@ -0,0 +1,186 @@
+"""
+Verrous consultatifs entre processus (fcntl.flock).
+
+Un verrou porte sur un fichier dédié (`<résultats>.lock`), jamais sur le
+fichier de données lui-même : celui-ci est remplacé par renommage à chaque
+sauvegarde, ce qui changerait l'inode verrouillé.
+
+    partagé     plusieurs lecteurs simultanés (chargement)
+    exclusif    un seul écrivain, aucun lecteur (sauvegarde, session)
+
+Les verrous sont réentrants au sein d'un même thread : reprendre un verrou
+déjà tenu (par exemple charger puis sauvegarder sous un même verrou
+exclusif) ne bloque pas. Chaque thread verrouille son propre descripteur :
+deux threads d'un même processus s'excluent donc comme deux processus. Un
+verrou peut être rendu par un autre thread que celui qui l'a pris (serveur :
+threads de l'exécuteur).
+
+Le titulaire d'un verrou exclusif inscrit son pid et sa machine dans le
+fichier de verrou, pour le signaler quand l'attente expire. Le noyau
+libère un verrou flock à la mort de son processus : le fichier de verrou
+n'est jamais supprimé pour « récupérer » un verrou. Un pid inscrit mort
+désigne seulement le dernier écrivain (arrêté sans rendre son verrou) ;
+le verrou est alors tenu par un lecteur, qui n'inscrit rien.
+"""
+
+import fcntl
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Attente entre deux tentatives d'acquisition (secondes, doublée jusqu'au max)
+POLL_MIN = 0.001
+POLL_MAX = 0.05
+
+
+class LockTimeout(TimeoutError):
+    """Le verrou n'a pas pu être obtenu dans le délai imparti."""
+
+    def __init__(self, path: Path, holder: Optional[str]) -> None:
+        self.path = path
+        self.holder = holder
+        if holder is None:
+            detail = ""
+        elif _is_dead(holder):
+            detail = f" (dernier écrivain {holder} terminé, tenu par un lecteur)"
+        else:
+            detail = f" (tenu par {holder})"
+        super().__init__(f"{path}: verrou indisponible{detail}.")
+
+
+# Verrous tenus par ce processus :
+# (chemin, thread propriétaire) -> [descripteur, exclusif, compteur]
+_held: Dict[Tuple[Path, int], List] = {}
+# Protège _held seulement : jamais tenu pendant l'attente d'un verrou
+_held_lock = threading.Lock()
+
+
+def _holder(path: Path) -> Optional[str]:
+    """Titulaire inscrit dans un fichier de verrou ("pid@machine"), ou None."""
+    try:
+        return path.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+
+def _is_dead(holder: str) -> bool:
+    """Indique si le titulaire inscrit est un processus mort de cette machine."""
+    if "@" not in holder:
+        return False
+    pid, host = holder.split("@", 1)
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+class FileLock:
+    """
+    Verrou consultatif sur un fichier, utilisable comme gestionnaire de contexte.
+
+    Args:
+        path: Fichier de verrou (créé au besoin)
+        shared: Verrou partagé (lecture) plutôt qu'exclusif (écriture)
+        timeout: Délai maximal d'attente en secondes (None : attente
+                 illimitée, 0 : échec immédiat si le verrou est pris)
+    """
+
+    def __init__(
+        self, path: Path, shared: bool = False, timeout: Optional[float] = None
+    ) -> None:
+        self.path = Path(path)
+        self.shared = shared
+        self.timeout = timeout
+        # Entrée de _held prise par acquire(), rendue par release()
+        self._key: Optional[Tuple[Path, int]] = None
+
+    def acquire(self) -> None:
+        """
+        Obtient le verrou.
+
+        Raises:
+            LockTimeout: Si le délai expire
+            RuntimeError: Si ce thread tient déjà le verrou en mode partagé
+                          et demande le mode exclusif
+        """
+        key = (self.path.absolute(), threading.get_ident())
+        with _held_lock:
+            held = _held.get(key)
+            if held is not None:
+                if not (held[1] or self.shared):
+                    raise RuntimeError(f"{self.path}: verrou partagé déjà tenu.")
+                held[2] += 1
+                self._key = key
+                return
+
+        # Seul ce thread peut enregistrer une entrée sous `key`
+        fd = self._acquire_fd()
+        with _held_lock:
+            _held[key] = [fd, not self.shared, 1]
+        self._key = key
+
+    def _acquire_fd(self) -> int:
+        mode = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        delay = POLL_MIN
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, mode | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+            else:
+                if self._same_file(fd):
+                    if not self.shared:
+                        os.ftruncate(fd, 0)
+                        os.pwrite(
+                            fd, f"{os.getpid()}@{socket.gethostname()}".encode(), 0
+                        )
+                    return fd
+                # Le fichier de verrou a été recréé entre open et flock
+                os.close(fd)
+                continue
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LockTimeout(self.path, _holder(self.path))
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_MAX)
+
+    def _same_file(self, fd: int) -> bool:
+        """Vérifie que le descripteur verrouillé désigne encore le fichier de verrou."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return False
+        fstat = os.fstat(fd)
+        return (stat.st_dev, stat.st_ino) == (fstat.st_dev, fstat.st_ino)
+
+    def release(self) -> None:
+        """Libère le verrou (le dernier niveau de réentrance le rend au système)."""
+        with _held_lock:
+            held = _held.get(self._key)
+            if held is None:
+                return
+            held[2] -= 1
+            if held[2] > 0:
+                return
+            del _held[self._key]
+            fd = held[0]
+            if held[1]:
+                os.ftruncate(fd, 0)
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -3,65 +3,47 @@
 Quiz Python - Application interactive de quiz en CLI
 
 Ce module gère l'exécution du questionnaire :
-- Orchestration du déroulement du quiz
-- Gestion de l'ordre des questions
-- Validation des réponses
+- Orchestration du déroulement du quiz (moteur : module session)
+- Saisie des réponses et sauvegarde des résultats
 """
 
 import argparse
-from typing import Dict, List
-import random
-import quiz_data
-import resultats_data
-import ui
-
-
-def is_answer_correct(choices: List[Dict], reponse: int | None) -> bool:
+from typing import Dict, List, Optional, Tuple
+import sys
+from lazy import lazy_import
+
+# Importés au premier usage : --help ne charge que argparse
+autosave = lazy_import("autosave")
+catalog = lazy_import("catalog")
+quiz_data = lazy_import("quiz_data")
+resultats_data = lazy_import("resultats_data")
+session = lazy_import("session")
+timings = lazy_import("timings")
+ui = lazy_import("ui")
+
+
+def run_questionnaire(
+    quiz: Dict,
+    resultats: "resultats_data.Resultats",
+    autosaver: Optional["autosave.AutoSaver"] = None,
+) -> "resultats_data.Resultats":
     """
-    Vérifie si la réponse donnée est correcte.
-
-    Args:
-        choices: Liste des choix avec leur statut correct/incorrect
-                 Format: [{"choix": "...", "correct": True/False}, ...]
-        reponse: Index de la réponse choisie (None si pas de réponse)
-
-    Returns:
-        True si la réponse est correcte, False sinon
+    Exécute le questionnaire interactif.
 
+    Chaque bonne réponse est confiée à la sauvegarde automatique si elle
+    est fournie (journal puis écriture en arrière-plan).
     """
-    # Handle no answer
-    if reponse is None:
-        return False
-
-    # Handle out of bounds (defensive)
-    if reponse < 0 or reponse >= len(choices):
-        return False
-
-    return choices[reponse]["correct"]
-
-
-def run_questionnaire(quiz: Dict, resultats: Dict) -> Dict:
-    """Exécute le questionnaire interactif."""
-    # Sélectionner les questions non répondues
-    questions_selectionnees = resultats_data.questions_a_poser(resultats)
-    total_questions = len(questions_selectionnees)
+    moteur = session.Session.start(quiz, resultats)
 
     try:
-        for index, question_id in enumerate(questions_selectionnees, 1):
-            question_pose = quiz_data.read_question(question_id, quiz)
-
-            # Mélanger les options
-            choix_propose = random.sample(
-                question_pose["liste_choix"], len(question_pose["liste_choix"])
-            )
-
+        while (posee := moteur.next_question()) is not None:
             reponse = ui.form_question(
-                question_pose["question"], choix_propose, index, total_questions
+                posee.question, posee.choices, posee.index, posee.total
             )
 
             # Si l'utilisateur a appuyé sur Entrée sans réponse, passer à la question suivante
-            if is_answer_correct(choix_propose, reponse):
-                resultats = resultats_data.valider_resultat(question_id, resultats)
+            if moteur.submit(reponse) and autosaver is not None:
+                autosaver.record(resultats, posee.question_id)
     except KeyboardInterrupt:
         # En cas de Ctrl+C, on ne propage pas l'exception pour permettre
         # le retour des résultats mis à jour qui seront sauvegardés
@@ -70,8 +52,21 @@ def run_questionnaire(quiz: Dict, resultats: Dict) -> Dict:
     return resultats
 
 
-def main() -> None:
-    """Point d'entrée principal de l'application."""
+def parse_ids(valeur: str) -> Tuple[int, int]:
+    """Convertit une plage d'ids "A-B" (bornes incluses) pour argparse."""
+    try:
+        debut, fin = (int(borne) for borne in valeur.split("-", 1))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"plage d'ids invalide : {valeur!r} (attendu : A-B)"
+        ) from exc
+    if debut > fin:
+        raise argparse.ArgumentTypeError(f"plage d'ids vide : {valeur!r}")
+    return debut, fin
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur de la ligne de commande."""
     parser = argparse.ArgumentParser(
         description="Quiz Python - Application interactive de quiz"
     )
@@ -93,13 +88,84 @@ def main() -> None:
         action="store_true",
         help="Reprendre un quiz sur les questions incorrectes du fichier de résultats",
     )
+    parser.add_argument(
+        "-l",
+        "--list",
+        action="store_true",
+        help="Lister les quiz disponibles avec leur titre et leur nombre de questions",
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        help="Nombre de questions tirées au hasard dans le quiz (défaut: toutes)",
+    )
+    parser.add_argument(
+        "--ids",
+        type=parse_ids,
+        metavar="A-B",
+        help="Ne tirer que les questions dont l'id est compris entre A et B",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile.json",
+        metavar="FICHIER",
+        help="Écrire à la sortie les durées de chaque étape (défaut: profile.json)",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Suivre aussi la mémoire (tracemalloc) : pic et allocations par étape",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="FICHIER",
+        help="Profiler toute la session avec cProfile (statistiques pstats)",
+    )
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Analyse et vérifie la ligne de commande (quitte en cas d'erreur)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.resume and (args.count is not None or args.ids is not None):
+        parser.error("--count et --ids ne s'appliquent pas à une reprise (--resume)")
+    if args.count is not None and args.count < 1:
+        parser.error("--count doit être un entier positif")
+    return args
 
-    # charger le quiz depuis le fichier source
-    quiz = quiz_data.load(args.quiz)
+
+def main() -> None:
+    """Point d'entrée principal de l'application."""
+    args = parse_args()
+
+    if args.profile is not None or args.profile_memory:
+        timings.enable(args.profile or "profile.json", memory=args.profile_memory)
+    if args.cprofile is not None:
+        timings.start_cprofile(args.cprofile)
+
+    if args.list:
+        ui.view_catalogue(catalog.list_banks())
+        return
+
+    # charger le quiz depuis le fichier source (ou un tirage de ses questions)
+    if args.count is not None or args.ids is not None:
+        quiz = quiz_data.load_sample(args.quiz, args.count or sys.maxsize, args.ids)
+    else:
+        quiz = quiz_data.load(args.quiz)
+
+    # Réserver le fichier de résultats : une seule session à la fois
+    try:
+        reservation = resultats_data.lock_session(args.output)
+    except resultats_data.QuizResultatError as exc:
+        sys.exit(str(exc))
 
     resultats = None
+    autosaver = None
     try:
         if args.resume:
             # Mode reprise: charger le fichier de résultats existant
@@ -107,10 +173,10 @@ def main() -> None:
 
             ui.view_reprise(
                 quiz["quiz_title"],
-                resultats["prenom"],
-                resultats["nom"],
-                resultats["correct_count"],
-                quiz["nombre_questions"],
+                resultats.prenom,
+                resultats.nom,
+                resultats.correct_count,
+                resultats.nombre_questions,
             )
 
         else:
@@ -122,19 +188,29 @@ def main() -> None:
             )
             resultats_data.save(resultats, args.output)
 
-        # Lancer le questionnaire
-        resultats = run_questionnaire(quiz, resultats)
+        # Lancer le questionnaire, les résultats étant sauvegardés au fil de l'eau
+        autosaver = autosave.AutoSaver(args.output)
+        resultats = run_questionnaire(quiz, resultats, autosaver)
 
     except KeyboardInterrupt:
         print("\n\n⚠️  Quiz interrompu par l'utilisateur.")
 
     finally:
-        # Sauvegarder les résultats
-        if resultats:
+        # Écrire le dernier instantané en attente et fermer le journal
+        if autosaver is not None:
+            autosaver.close()
+
+        # Sauvegarder les résultats (le journal y est compacté), puis
+        # supprimer journal et fichiers de verrou
+        if resultats is not None:
             resultats_data.save(resultats, args.output)
             ui.view_resultats(
-                quiz["quiz_title"], resultats["correct_count"], quiz["nombre_questions"]
+                quiz["quiz_title"],
+                resultats.correct_count,
+                resultats.nombre_questions,
             )
+            resultats_data.end_session(args.output, reservation)
+        reservation.release()
 
 
 if __name__ == "__main__":
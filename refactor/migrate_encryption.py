@@ -1,133 +1,436 @@
 #!/usr/bin/env python3
 """
-Outil de migration pour chiffrer les fichiers JSON existants.
+Outil de migration des fichiers de quiz et de résultats entre formats.
 
-Ce script parcourt les dossiers quiz/ et resultats/ et convertit
-tous les fichiers JSON clairs en format chiffré.
+Formats :
+    plain      JSON clair, indenté
+    xor        JSON chiffré XOR (voir crypto), format par défaut
+    gzip       JSON chiffré XOR puis compressé (gzip)
+    container  conteneur indexé (voir container), pour les quiz seulement
 
-Usage:
-    python3 migrate_encryption.py
+Ce script parcourt les dossiers quiz/ et resultats/ et convertit chaque
+fichier JSON dans le format demandé. Les fichiers sont convertis en flux
+(la mémoire utilisée ne dépend pas de leur taille) par un pool de
+processus, puis remplacés de façon atomique : fichier temporaire dans le
+même dossier, puis renommage. Un fichier de résultats est converti sous
+le verrou exclusif utilisé par l'application.
+
+Chaque dossier garde un manifeste (MANIFEST) : taille, date de
+modification, empreinte SHA-256 et format des fichiers traités. Un fichier
+dont la taille et la date n'ont pas changé depuis est ignoré sans être
+lu ; si seule la date a changé, l'empreinte tranche.
 
-Le script détecte automatiquement les fichiers déjà chiffrés et ne les
-modifie pas.
+Usage:
+    python3 migrate_encryption.py [--format xor] [--dry-run] [--jobs N]
 """
 
+import argparse
+import hashlib
+import json
+import os
+import stat
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
 from pathlib import Path
-import crypto
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import config
+import container
+import crypto
+import locking
+
+FORMATS = ("plain", "xor", "gzip", "container")
+
+# Manifeste de chaque dossier (sans extension .json : il n'est pas un quiz)
+MANIFEST = ".migration"
+
+# Tableau de premier niveau lu et écrit en flux
+ARRAY_KEY = "questions"
+_ITEM_KEY = container.QUESTION_ITEM
+
+# Statuts d'un fichier
+CONVERTI = "converti"
+A_CONVERTIR = "à convertir"
+A_JOUR = "à jour"
+INCHANGE = "inchangé"
+ERREUR = "erreur"
+STATUTS = (CONVERTI, A_CONVERTIR, A_JOUR, INCHANGE, ERREUR)
+
+# Résultat de migrate_file : (statut, entrée du manifeste, détail)
+Resultat = Tuple[str, Optional[Dict[str, Any]], str]
+
+
+def detect_format(head: bytes) -> str:
+    """Format d'un fichier d'après ses premiers octets."""
+    if container.is_container(head):
+        return "container"
+    if crypto.is_compressed(head):
+        return "gzip"
+    return "xor" if crypto.is_encrypted(head) else "plain"
+
+
+def _digest(path: Path) -> str:
+    """Empreinte SHA-256 du contenu d'un fichier."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(crypto.CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _entry(path: Path, file_format: str, digest: str = "") -> Dict[str, Any]:
+    """Entrée du manifeste pour un fichier dans le format `file_format`."""
+    info = path.stat()
+    return {
+        "size": info.st_size,
+        "mtime_ns": info.st_mtime_ns,
+        "sha256": digest or _digest(path),
+        "format": file_format,
+    }
+
+
+def _events(path: Path, file_format: str) -> Iterator[Tuple[str, Any]]:
+    """Membres du quiz en flux, comme crypto.stream_json, quel que soit le format."""
+    if file_format == "container":
+        with container.Container(path) as reader:
+            yield from reader.meta.items()
+            yield ARRAY_KEY, []
+            for position in range(len(reader)):
+                yield _ITEM_KEY, reader.record(position)
+        return
+    with open(path, "rb") as f:
+        yield from crypto.stream_json(f, ARRAY_KEY)
+
+
+def _indent(value: Any, level: int) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2).replace(
+        "\n", "\n" + "  " * level
+    )
+
+
+def _json_text(events: Iterable[Tuple[str, Any]]) -> Iterator[str]:
+    """
+    Texte JSON d'un flux de membres, identique à json.dumps(indent=2).
+
+    Le tableau ARRAY_KEY est écrit élément par élément.
+    """
+    yield "{"
+    members = 0
+    items = None  # éléments écrits du tableau ouvert (None : aucun tableau ouvert)
+    for key, value in events:
+        if key == _ITEM_KEY:
+            yield ("," if items else "") + "\n    " + _indent(value, 2)
+            items += 1
+            continue
+        if items is not None:
+            yield "\n  ]" if items else "]"
+            items = None
+        yield ("," if members else "") + f"\n  {json.dumps(key, ensure_ascii=False)}: "
+        members += 1
+        if key == ARRAY_KEY and value == []:
+            yield "["
+            items = 0
+        else:
+            yield _indent(value, 1)
+    if items is not None:
+        yield "\n  ]" if items else "]"
+    yield "\n}" if members else "}"
+
+
+def _blocks(texts: Iterable[str]) -> Iterator[bytes]:
+    """Regroupe des fragments de texte en blocs UTF-8 d'environ CHUNK_SIZE."""
+    pending: List[str] = []
+    size = 0
+    for text in texts:
+        pending.append(text)
+        size += len(text)
+        if size >= crypto.CHUNK_SIZE:
+            yield "".join(pending).encode("utf-8")
+            pending.clear()
+            size = 0
+    yield "".join(pending).encode("utf-8")
+
+
+def _write(events: Iterable[Tuple[str, Any]], path: Path, target: str) -> None:
+    """Écrit un flux de membres dans le format `target`."""
+    if target == "container":
+        meta: Dict[str, Any] = {}
+
+        def questions() -> Iterator[Dict]:
+            for key, value in events:
+                if key == _ITEM_KEY:
+                    yield value
+                elif key != ARRAY_KEY:
+                    meta[key] = value
+
+        container.write(path, meta, questions())
+        return
+
+    chunks = _blocks(_json_text(events))
+    if target in ("xor", "gzip"):
+        chunks = crypto.xor_chunks(chunks)
+    if target == "gzip":
+        chunks = crypto.compress_chunks(chunks)
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def _convert(path: Path, source: str, target: str) -> None:
+    """Convertit un fichier en place : fichier temporaire puis renommage."""
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as tmp:
+        tmp_path = Path(tmp.name)
+    try:
+        _write(_events(path, source), tmp_path, target)
+        with open(tmp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        # Le fichier temporaire est créé en 0600 : garder les droits d'origine
+        os.chmod(tmp_path, stat.S_IMODE(path.stat().st_mode))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
-def migrate_directory(directory: Path, description: str) -> tuple[int, int, int]:
+def migrate_file(
+    path: Path,
+    target: str,
+    known: Optional[Dict[str, Any]] = None,
+    dry_run: bool = False,
+    lock: bool = False,
+) -> Resultat:
     """
-    Migre tous les fichiers JSON d'un répertoire vers le format chiffré.
+    Convertit un fichier dans le format `target`.
+
+    Exécutée dans les processus du pool : le manifeste est tenu par
+    l'appelant, à partir des entrées retournées.
 
     Args:
-        directory: Chemin du répertoire à traiter
-        description: Description du répertoire pour l'affichage
+        path: Fichier à convertir
+        target: Format cible (voir FORMATS)
+        known: Entrée du manifeste pour ce fichier, s'il y en a une
+        dry_run: Ne rien écrire, seulement indiquer ce qui serait fait
+        lock: Prendre le verrou exclusif du fichier (fichiers de résultats)
 
     Returns:
-        Tuple (encrypted_count, already_encrypted_count, error_count)
+        (statut, nouvelle entrée du manifeste ou None, détail)
     """
-    print(f"\n{description}:")
-    print("─" * 60)
+    verrou = (
+        locking.FileLock(path.with_suffix(".lock"), timeout=config.LOCK_TIMEOUT)
+        if lock and not dry_run
+        else nullcontext()
+    )
+    try:
+        with verrou:
+            digest = ""
+            if known is not None and known["size"] == path.stat().st_size:
+                # Seule la date a changé : l'empreinte dit si le contenu aussi
+                digest = _digest(path)
+            if digest and digest == known["sha256"]:
+                source = known["format"]
+            else:
+                with open(path, "rb") as f:
+                    source = detect_format(f.read(len(container.MAGIC)))
+            if source == target:
+                return A_JOUR, _entry(path, target, digest), ""
+            detail = f"{source} → {target}"
+            if dry_run:
+                return A_CONVERTIR, None, detail
+            _convert(path, source, target)
+            return CONVERTI, _entry(path, target), detail
+    except (OSError, ValueError, container.ContainerError) as exc:
+        return ERREUR, None, str(exc)
 
-    # Chercher tous les fichiers .json
-    json_files = list(directory.glob("*.json"))
 
-    if not json_files:
-        print(f"  Aucun fichier trouvé dans {directory}")
-        return (0, 0, 0)
+def _unchanged(path: Path, known: Optional[Dict[str, Any]], target: str) -> bool:
+    """Le fichier est-il déjà au format cible et inchangé depuis le manifeste ?"""
+    if known is None or known.get("format") != target:
+        return False
+    info = path.stat()
+    return known["size"] == info.st_size and known["mtime_ns"] == info.st_mtime_ns
 
-    encrypted_count = 0
-    already_encrypted_count = 0
-    error_count = 0
 
-    for json_file in sorted(json_files):
-        try:
-            # Lire le fichier
-            with open(json_file, "rb") as f:
-                file_bytes = f.read()
+def _valid_entry(entry: Any) -> bool:
+    """L'entrée du manifeste a-t-elle les champs et les types d'_entry() ?"""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("size"), int)
+        and isinstance(entry.get("mtime_ns"), int)
+        and isinstance(entry.get("sha256"), str)
+        and entry.get("format") in FORMATS
+    )
 
-            # Vérifier si déjà chiffré
-            if crypto.is_encrypted(file_bytes):
-                print(f"  ✓ {json_file.name:<30} déjà chiffré")
-                already_encrypted_count += 1
-                continue
 
-            # Charger le JSON clair
-            data = crypto.load_json(file_bytes)
+def read_manifest(directory: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Lit le manifeste d'un dossier (vide s'il est absent ou illisible).
 
-            # Sauvegarder en format chiffré
-            encrypted_bytes = crypto.save_json(data, encrypt=True)
+    Les entrées malformées sont ignorées : leurs fichiers sont traités comme
+    non migrés, et relus.
+    """
+    try:
+        with open(directory / MANIFEST, "rb") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict):
+        return {}
+    return {nom: entry for nom, entry in manifest.items() if _valid_entry(entry)}
 
-            # Écrire le fichier
-            with open(json_file, "wb") as f:
-                f.write(encrypted_bytes)
 
-            print(f"  ✓ {json_file.name:<30} chiffré avec succès")
-            encrypted_count += 1
+def _write_manifest(directory: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Écrit le manifeste de façon atomique."""
+    path = directory / MANIFEST
+    with tempfile.NamedTemporaryFile(
+        "w",
+        dir=directory,
+        prefix=MANIFEST,
+        suffix=".tmp",
+        delete=False,
+        encoding="utf-8",
+    ) as tmp:
+        json.dump(manifest, tmp, indent=2, sort_keys=True)
+    os.replace(tmp.name, path)
 
-        except Exception as e:
-            print(f"  ✗ {json_file.name:<30} erreur: {e}")
-            error_count += 1
 
-    return (encrypted_count, already_encrypted_count, error_count)
+def migrate_directory(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    directory: Path,
+    description: str,
+    target: str = "xor",
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+    lock: bool = False,
+) -> Dict[str, int]:
+    """
+    Migre tous les fichiers JSON d'un répertoire vers le format `target`.
 
+    Args:
+        directory: Chemin du répertoire à traiter
+        description: Description du répertoire pour l'affichage
+        target: Format cible (voir FORMATS)
+        jobs: Nombre de processus (défaut : nombre de processeurs)
+        dry_run: Ne rien écrire, seulement indiquer ce qui serait fait
+        lock: Prendre le verrou exclusif de chaque fichier (résultats)
 
-def main():
+    Returns:
+        Nombre de fichiers par statut (voir STATUTS)
+    """
+    print(f"\n{description}:")
+    print("─" * 60)
+
+    counts = dict.fromkeys(STATUTS, 0)
+    json_files = sorted(directory.glob("*.json"))
+    if not json_files:
+        print(f"  Aucun fichier trouvé dans {directory}")
+        return counts
+
+    manifest = read_manifest(directory)
+    pending = []
+    for json_file in json_files:
+        known = manifest.get(json_file.name)
+        if _unchanged(json_file, known, target):
+            print(f"  ✓ {json_file.name:<30} {INCHANGE}")
+            counts[INCHANGE] += 1
+        else:
+            pending.append((json_file, known))
+
+    paths = [path for path, _ in pending]
+    arguments = (
+        paths,
+        repeat(target),
+        [known for _, known in pending],
+        repeat(dry_run),
+        repeat(lock),
+    )
+    if jobs == 1 or len(pending) < 2:
+        resultats: Iterable[Resultat] = map(migrate_file, *arguments)
+        executor = nullcontext()
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        resultats = executor.map(migrate_file, *arguments)
+
+    with executor:
+        for json_file, (statut, entry, detail) in zip(paths, resultats):
+            symbole = "✗" if statut == ERREUR else "✓"
+            suffixe = f" ({detail})" if detail else ""
+            print(f"  {symbole} {json_file.name:<30} {statut}{suffixe}")
+            counts[statut] += 1
+            if entry is not None:
+                manifest[json_file.name] = entry
+
+    if not dry_run:
+        present = {path.name for path in json_files}
+        _write_manifest(
+            directory, {nom: e for nom, e in manifest.items() if nom in present}
+        )
+    return counts
+
+
+def main() -> int:
     """Point d'entrée principal du script."""
+    parser = argparse.ArgumentParser(
+        description="Migration des fichiers de quiz et de résultats entre formats"
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="xor", help="Format cible (défaut: xor)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Afficher les conversions sans rien écrire",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Nombre de processus (défaut: nombre de processeurs)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
-    print("Outil de Migration - Chiffrement des fichiers Quiz")
+    print(f"Outil de Migration - Format {args.format}")
     print("=" * 60)
-
-    # Afficher la configuration
     print(f"\nRépertoire de données: {config.data_path}")
+    if args.dry_run:
+        print("Simulation : aucun fichier ne sera modifié.")
 
-    # Statistiques globales
-    total_encrypted = 0
-    total_already = 0
-    total_errors = 0
-
-    # Migrer les fichiers de quiz
-    quiz_dir = config.data_path / config.QUIZ_PATH
-    if quiz_dir.exists():
-        enc, already, err = migrate_directory(quiz_dir, "Fichiers Quiz")
-        total_encrypted += enc
-        total_already += already
-        total_errors += err
+    totaux = dict.fromkeys(STATUTS, 0)
+    dossiers = [(config.QUIZ_PATH, "Fichiers Quiz", False)]
+    if args.format == "container":
+        print("\n⚠ Le format container ne s'applique qu'aux quiz : résultats ignorés.")
     else:
-        print(f"\n⚠ Répertoire quiz non trouvé: {quiz_dir}")
-
-    # Migrer les fichiers de résultats
-    results_dir = config.data_path / config.RESULT_PATH
-    if results_dir.exists():
-        enc, already, err = migrate_directory(results_dir, "Fichiers Résultats")
-        total_encrypted += enc
-        total_already += already
-        total_errors += err
-    else:
-        print(f"\n⚠ Répertoire résultats non trouvé: {results_dir}")
+        dossiers.append((config.RESULT_PATH, "Fichiers Résultats", True))
+
+    for nom, description, lock in dossiers:
+        directory = config.data_path / nom
+        if not directory.exists():
+            print(f"\n⚠ Répertoire non trouvé: {directory}")
+            continue
+        counts = migrate_directory(
+            directory, description, args.format, args.jobs, args.dry_run, lock
+        )
+        for statut, nombre in counts.items():
+            totaux[statut] += nombre
 
-    # Afficher le résumé
     print("\n" + "=" * 60)
     print("Résumé de la migration:")
     print("=" * 60)
-    print(f"  Fichiers chiffrés:           {total_encrypted}")
-    print(f"  Fichiers déjà chiffrés:      {total_already}")
-    print(f"  Erreurs:                     {total_errors}")
-    print(f"  Total traité:                {total_encrypted + total_already + total_errors}")
+    for statut in STATUTS:
+        print(f"  {statut.capitalize() + ' :':<28} {totaux[statut]}")
     print("=" * 60)
 
-    if total_errors > 0:
+    if totaux[ERREUR] > 0:
         print("\n⚠ Des erreurs se sont produites. Vérifiez les messages ci-dessus.")
         return 1
-    elif total_encrypted == 0 and total_already == 0:
+    if not any(totaux.values()):
         print("\n⚠ Aucun fichier trouvé à migrer.")
         return 0
-    else:
-        print("\n✓ Migration terminée avec succès!")
-        return 0
+    print("\n✓ Migration terminée avec succès!")
+    return 0
 
 
 if __name__ == "__main__":
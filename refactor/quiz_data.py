@@ -2,20 +2,364 @@
 Modèle quiz
 """
 
+import bisect
 import json
-from typing import Dict, List
+import random
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import cache
 import config
+import container
 import crypto
+import timings
+from lazy import lazy_import
+
+validator = lazy_import("validator")
+
+# Version du format compilé dans le cache, à incrémenter quand il change
+MODEL_VERSION = 4
+
+# Pic de mémoire d'un chargement complet par load() : MEMORY_FACTOR fois la
+# taille du fichier JSON, plus les tampons de lecture en flux (bloc lu,
+# déchiffré et décodé). Mesuré avec tracemalloc, voir test_memory.
+MEMORY_FACTOR = 5
+MEMORY_OVERHEAD = 4 * crypto.CHUNK_SIZE
 
 
 class QuizFileError(Exception):
     """Erreur liée au fichier de quiz (format, lecture, validation)."""
 
 
+@dataclass(frozen=True, slots=True)
+class Question:
+    """
+    Question au format interne.
+
+    Les choix sont stockés dans l'ordre du fichier et seule la position de la
+    bonne réponse est conservée, au lieu d'un booléen par choix.
+    """
+
+    question_id: int
+    question: str
+    choices: Tuple[str, ...]
+    answer_index: int
+
+    def is_correct(self, choice_index: int) -> bool:
+        """Indique si le choix (position dans `choices`) est la bonne réponse."""
+        return choice_index == self.answer_index
+
+
+def quiz_path(quiz_name: str) -> Path:
+    """Retourne le chemin du fichier de quiz."""
+    return config.data_path / config.QUIZ_PATH / (quiz_name + ".json")
+
+
+def _check_question(question: Dict, i: int) -> None:
+    """
+    Valide une question du fichier source.
+
+    Raises:
+        QuizFileError: Si la question est malformée (première erreur)
+    """
+    errors = validator.check_question(question, i)
+    if errors:
+        raise QuizFileError(f"Erreur: {errors[0]}")
+
+
+def _transform_question(question: Dict, i: int, checked: bool = False) -> Question:
+    """
+    Valide une question du fichier source et la convertit au format interne.
+
+    Args:
+        question: Question au format du fichier (id, question, choices, answer_index)
+        i: Position de la question dans le fichier (à partir de 1)
+        checked: Question déjà validée au chargement
+
+    Returns:
+        Question au format interne
+
+    Raises:
+        QuizFileError: Si la question est malformée
+    """
+    if not checked:
+        with timings.timer("validation"):
+            _check_question(question, i)
+
+    # Les choix reviennent souvent d'une question à l'autre ("True", "None"...)
+    return Question(
+        question["id"],
+        question["question"],
+        tuple(sys.intern(choix) for choix in question["choices"]),
+        question["answer_index"],
+    )
+
+
+def build_index(ids: Iterable[int]) -> Union[range, Dict[int, int]]:
+    """
+    Construit l'index id -> position des questions d'un quiz.
+
+    Si les ids sont contigus et croissants (1, 2, 3, ...), l'index est un
+    simple `range` : la position se calcule sans table. Sinon c'est un dict.
+
+    Args:
+        ids: IDs des questions, dans l'ordre du quiz
+
+    Returns:
+        range ou dict donnant la position de chaque id
+
+    Raises:
+        QuizFileError: Si un id est dupliqué
+    """
+    index: Dict[int, int] = {}
+    first = None
+    dense = True
+    for position, question_id in enumerate(ids):
+        if question_id in index:
+            raise QuizFileError(
+                f"Erreur: question {position + 1} - id {question_id} dupliqué."
+            )
+        index[question_id] = position
+        if first is None:
+            first = question_id
+        dense = dense and question_id == first + position
+
+    if dense:
+        start = 0 if first is None else first
+        return range(start, start + len(index))
+    return index
+
+
+def _position(question_id: int, quiz: Dict) -> Optional[int]:
+    """Retourne la position d'une question dans quiz["questions"], ou None."""
+    index = quiz.get("index")
+    if index is None:
+        reader = quiz.get("container")
+        if reader is not None:
+            return reader.position(question_id)
+        # Quiz construit sans load() : indexer au premier accès
+        index = quiz["index"] = build_index(q.question_id for q in quiz["questions"])
+
+    if isinstance(index, range):
+        return question_id - index.start if question_id in index else None
+    return index.get(question_id)
+
+
+def _stream_source(path: Path, header: Dict) -> Iterator[Dict]:
+    """
+    Lit le fichier en flux et produit les questions au format source.
+
+    Les membres de premier niveau autres que les questions sont recopiés
+    dans `header`, validé une fois le fichier entièrement lu.
+    """
+    with open(path, "rb") as f:
+        yield from container.iter_json_questions(f, header)
+
+    if not isinstance(header.get("quiz_title"), str):
+        raise QuizFileError(f"Erreur: {path} format incorrect.")
+    if not isinstance(header.get("questions"), list):
+        raise QuizFileError(f"Erreur: {path} format incorrect.")
+
+
+def _validated(questions: Iterable[Dict]) -> Iterator[Dict]:
+    """
+    Valide au passage chaque question d'un flux au format source, ainsi que
+    l'unicité des ids.
+
+    Raises:
+        QuizFileError: À la première question malformée ou id dupliqué
+    """
+    seen = set()
+    for i, question in enumerate(questions, 1):
+        _check_question(question, i)
+        question_id = question["id"]
+        if question_id in seen:
+            raise QuizFileError(f"Erreur: question {i} - id {question_id} dupliqué.")
+        seen.add(question_id)
+        yield question
+
+
+class LazyQuestions(Sequence):
+    """
+    Questions d'un quiz construites à la demande.
+
+    La source (liste de questions au format fichier, ou conteneur) n'est
+    convertie en Question qu'au premier accès à chaque position ; le
+    résultat est ensuite conservé. Une session interrompue après quelques
+    questions ne paie donc que pour celles-ci. Une source qui n'a pas été
+    validée au chargement (conteneur fourni tel quel) l'est au même moment.
+    """
+
+    __slots__ = ("_source", "_built", "_checked")
+
+    def __init__(self, source: Sequence, checked: bool = False) -> None:
+        self._source = source
+        self._built: Dict[int, Question] = {}
+        self._checked = checked
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+
+        question = self._built.get(position)
+        if question is None:
+            question = _transform_question(
+                self._source[position], position + 1, self._checked
+            )
+            self._built[position] = question
+            if isinstance(self._source, list):
+                # La question source n'est plus utile une fois convertie
+                self._source[position] = None
+        return question
+
+
+def _is_container(path: Path) -> bool:
+    """Détecte le format conteneur à partir des premiers octets du fichier."""
+    with open(path, "rb") as f:
+        return container.is_container(f.read(len(container.MAGIC)))
+
+
+def _load_container(path: Path, quiz_name: str, checked: bool = False) -> Dict:
+    """
+    Ouvre un quiz au format conteneur sans décoder les questions.
+
+    checked indique un conteneur compilé par ce module (cache), dont les
+    questions ont été validées à la compilation.
+    """
+    try:
+        reader = container.Container(path)
+    except (container.ContainerError, UnicodeDecodeError) as exc:
+        raise QuizFileError(f"Erreur: {path} format de fichier incorrect.") from exc
+
+    if not isinstance(reader.meta.get("quiz_title"), str):
+        reader.close()
+        raise QuizFileError(f"Erreur: {path} format incorrect.")
+
+    quiz = {
+        "quiz_title": reader.meta["quiz_title"],
+        "nombre_questions": len(reader),
+        "quiz_name": quiz_name,
+        "questions": LazyQuestions(reader, checked),
+        "container": reader,
+    }
+
+    order = reader.meta.get(container.ORDER_KEY)
+    if order is not None:
+        # Quiz compilé dont les ids ne sont pas croissants : l'index garde
+        # l'ordre du fichier source
+        index = {question_id: reader.position(question_id) for question_id in order}
+        if len(index) != len(reader) or None in index.values():
+            reader.close()
+            raise QuizFileError(f"Erreur: {path} format incorrect.")
+        quiz["index"] = index
+        return quiz
+
+    # Les ids du conteneur sont triés et uniques : s'ils sont contigus, un
+    # range sert d'index, sinon la recherche dichotomique du conteneur
+    ids = reader.ids
+    if not ids or ids[-1] - ids[0] == len(ids) - 1:
+        quiz["index"] = range(ids[0], ids[-1] + 1) if ids else range(0)
+
+    return quiz
+
+
+def _compile(path: Path, destination: Path) -> None:
+    """
+    Compile un quiz JSON en conteneur (entrée du cache), en flux.
+
+    Chaque question est validée au passage : le cache ne contient que des
+    quiz valides. Le conteneur range les questions par id croissant : si le
+    fichier source suit un autre ordre, il est conservé dans les
+    métadonnées (container.ORDER_KEY).
+
+    Raises:
+        QuizFileError: Si le fichier est malformé
+        json.JSONDecodeError: Si le fichier n'est pas du JSON valide
+    """
+    header: Dict = {}
+    meta: Dict = {}
+    ids: List[int] = []
+
+    def questions() -> Iterator[Dict]:
+        for question in _validated(_stream_source(path, header)):
+            ids.append(question["id"])
+            yield question
+        # container.write sérialise `meta` après la dernière question
+        meta.update((k, v) for k, v in header.items() if k != "questions")
+        if ids != sorted(ids):
+            meta[container.ORDER_KEY] = ids
+
+    with timings.timer("quiz.compilation"):
+        container.write(destination, meta, questions())
+
+
+def estimate_memory(path: Path) -> int:
+    """Estime le pic de mémoire du chargement complet d'un quiz JSON (octets)."""
+    return path.stat().st_size * MEMORY_FACTOR + MEMORY_OVERHEAD
+
+
+def iter_questions(quiz_name: str) -> Iterator[Question]:
+    """
+    Parcourt les questions d'un quiz sans charger tout le fichier en mémoire.
+
+    Le fichier est déchiffré par blocs et analysé de façon incrémentale :
+    la mémoire utilisée ne dépend pas du nombre de questions.
+
+    Args:
+        quiz_name: Nom du fichier quiz (sans extension .json)
+
+    Yields:
+        Questions au format interne, dans l'ordre du fichier
+
+    Raises:
+        QuizFileError: Si le fichier est introuvable, invalide ou malformé
+    """
+    path = quiz_path(quiz_name)
+    try:
+        if _is_container(path):
+            quiz = _load_container(path, quiz_name)
+            with quiz["container"]:
+                yield from quiz["questions"]
+            return
+        for i, question in enumerate(_validated(_stream_source(path, {})), 1):
+            yield _transform_question(question, i, checked=True)
+    except FileNotFoundError as exc:
+        raise QuizFileError(f"Erreur: {path} Le fichier n'existe pas.") from exc
+    except json.JSONDecodeError as exc:
+        raise QuizFileError(f"Erreur: {path} format de fichier incorrect.") from exc
+
+
+@timings.timed("quiz.chargement")
 def load(quiz_name: str) -> Dict:
     """
     Charge un quiz depuis un fichier JSON et le transforme au format interne.
 
+    Toutes les questions d'un quiz JSON sont validées au chargement (une
+    seule fois, à la compilation dans le cache) ; chaque question n'est
+    construite qu'au premier appel de read_question (voir LazyQuestions).
+    Les questions d'un fichier au format conteneur sont validées à leur
+    première lecture.
+
+    Les fichiers au format conteneur (voir le module container) sont détectés
+    automatiquement : ils sont projetés en mémoire et leurs questions ne sont
+    décodées qu'à la lecture. Un quiz JSON est compilé une fois en conteneur
+    dans le cache (voir le module cache) et ouvert de la même façon tant que
+    le fichier source n'a pas changé ; sans cache, il est chargé en mémoire.
+
+    Un quiz JSON dont le chargement complet dépasserait config.memory_budget
+    passe par le cache même s'il est désactivé (il en est alors la seule
+    entrée) ; si le conteneur ne peut pas être écrit, le quiz est chargé en
+    entier.
+
     Args:
         quiz_name: Nom du fichier quiz (sans extension .json)
 
@@ -26,82 +370,153 @@ def load(quiz_name: str) -> Dict:
         QuizFileError: Si le fichier est introuvable, invalide ou malformé
     """
 
-    quiz_path = config.data_path / config.QUIZ_PATH / (quiz_name + ".json")
+    path = quiz_path(quiz_name)
+    header: Dict = {}
 
     try:
-        with open(quiz_path, "rb") as f:
-            file_bytes = f.read()
-            data = crypto.load_json(file_bytes)
-            if not "quiz_title" in data or not isinstance(data["quiz_title"], str):
-                raise QuizFileError(f"Erreur: {quiz_path} format incorrect.")
-
-            if not "questions" in data or not isinstance(data["questions"], list):
-                raise QuizFileError(f"Erreur: {quiz_path} format incorrect.")
-
-            # Validation des questions individuelles
-            questions = []
-            for i, question in enumerate(data["questions"], 1):
-                if "id" not in question or not isinstance(question["id"], int):
-                    raise QuizFileError(
-                        f"Erreur: question {i} - 'id' doit être un int."
-                    )
-                if "question" not in question or not isinstance(
-                    question["question"], str
-                ):
-                    raise QuizFileError(
-                        f"Erreur: question {i} - 'question' doit être un str."
-                    )
-                if "choices" not in question or not isinstance(
-                    question["choices"], list
-                ):
-                    raise QuizFileError(
-                        f"Erreur: question {i} - 'choices' doit être une liste."
-                    )
-                if "answer_index" not in question or not isinstance(
-                    question["answer_index"], int
-                ):
-                    raise QuizFileError(
-                        f"Erreur: question {i} - 'answer_index' doit être un entier."
-                    )
-                if not 0 <= question["answer_index"] < len(question["choices"]):
-                    raise QuizFileError(
-                        f"Erreur: question {i} - 'answer_index' hors limites."
-                    )
-
-                liste_choix = [
-                    {"choix": choix, "correct": (index == question["answer_index"])}
-                    for index, choix in enumerate(question["choices"])
-                ]
-
-                questions.append(
-                    {
-                        "question_id": question["id"],
-                        "question": question["question"],
-                        "liste_choix": liste_choix,
-                    }
-                )
-
-            quiz = {
-                "quiz_title": data["quiz_title"],
-                "nombre_questions": len(data["questions"]),
-                "quiz_name": quiz_name,
-                "questions": questions,
-            }
-
-            return quiz
+        if _is_container(path):
+            return _load_container(path, quiz_name)
+
+        over_budget = 0 < config.memory_budget < estimate_memory(path)
+        if over_budget:
+            timings.count("quiz.budget_depasse")
+
+        compiled = cache.lookup(path, MODEL_VERSION, required=over_budget)
+        if compiled is not None:
+            try:
+                quiz = _load_container(compiled, quiz_name, checked=True)
+            except (QuizFileError, FileNotFoundError):
+                # Entrée corrompue, ou évincée par un autre processus depuis
+                # lookup() : recompilée ci-dessous
+                pass
+            else:
+                timings.count("cache.succes")
+                return quiz
+        timings.count("cache.echec")
 
+        cache_key = cache.fingerprint(path, MODEL_VERSION)
+        compiled = cache.store(
+            path, cache_key, lambda tmp: _compile(path, tmp), required=over_budget
+        )
+        if compiled is not None:
+            try:
+                return _load_container(compiled, quiz_name, checked=True)
+            except FileNotFoundError:
+                pass  # Évincée aussitôt par un autre processus
+
+        # Cache désactivé, non inscriptible ou entrée évincée : chargement
+        # en mémoire
+        # Analyse incrémentale : inclut la lecture et le déchiffrement par blocs
+        with timings.timer("json"):
+            source = list(_validated(_stream_source(path, header)))
+        index = build_index(question["id"] for question in source)
     except FileNotFoundError as exc:
-        raise QuizFileError(f"Erreur: {quiz_path} Le fichier n'existe pas.") from exc
+        raise QuizFileError(f"Erreur: {path} Le fichier n'existe pas.") from exc
     except json.JSONDecodeError as exc:
-        raise QuizFileError(
-            f"Erreur: {quiz_path} format de fichier incorrect."
-        ) from exc
+        raise QuizFileError(f"Erreur: {path} format de fichier incorrect.") from exc
+
+    return {
+        "quiz_title": header["quiz_title"],
+        "nombre_questions": len(source),
+        "quiz_name": quiz_name,
+        "questions": LazyQuestions(source, checked=True),
+        "index": index,
+    }
+
+
+def _reservoir(items: Iterable[Dict], count: int, rng: random.Random) -> List[Dict]:
+    """
+    Tire `count` éléments au hasard d'un flux de longueur inconnue (algorithme R).
+
+    Un seul passage, mémoire proportionnelle à `count` ; chaque élément a la
+    même probabilité d'être retenu.
+    """
+    reservoir: List[Dict] = []
+    for seen, item in enumerate(items):
+        if seen < count:
+            reservoir.append(item)
+        else:
+            slot = rng.randrange(seen + 1)
+            if slot < count:
+                reservoir[slot] = item
+    return reservoir
 
 
-def read_question(question_id: int, quiz: Dict) -> Dict:
+def load_sample(  # pylint: disable=too-many-locals
+    quiz_name: str,
+    count: int,
+    id_range: Optional[Tuple[int, int]] = None,
+    rng: Optional[random.Random] = None,
+) -> Dict:
+    """
+    Charge `count` questions tirées au hasard d'un quiz, sans charger tout le quiz.
+
+    Pour un quiz JSON, le fichier est lu en flux et les questions sont tirées
+    par échantillonnage de réservoir : seules les questions retenues sont
+    conservées. Pour un conteneur, les positions sont tirées directement dans
+    la table des ids et seules les questions retenues sont décodées.
+
+    Args:
+        quiz_name: Nom du fichier quiz (sans extension .json)
+        count: Nombre de questions à tirer (toutes si le quiz en a moins)
+        id_range: Bornes (incluses) des ids autorisés, ou None
+        rng: Générateur aléatoire (défaut : module random)
+
+    Returns:
+        Quiz au format interne limité aux questions tirées
+
+    Raises:
+        QuizFileError: Si le fichier est introuvable, invalide ou malformé
+    """
+    rng = rng or random.Random()
+    low, high = id_range if id_range is not None else (None, None)
+    path = quiz_path(quiz_name)
+    header: Dict = {}
+
+    try:
+        if _is_container(path):
+            reader = _load_container(path, quiz_name)["container"]
+            with reader:
+                ids = reader.ids
+                first = 0 if low is None else bisect.bisect_left(ids, low)
+                stop = len(ids) if high is None else bisect.bisect_right(ids, high)
+                candidates = range(first, max(first, stop))
+                positions = rng.sample(candidates, min(count, len(candidates)))
+                source = [reader.record(position) for position in positions]
+                header.update(reader.meta)
+            for position, question in zip(positions, source):
+                _check_question(question, position + 1)
+        else:
+
+            def in_range(stream: Iterable[Dict]) -> Iterator[Dict]:
+                for question in _validated(stream):
+                    question_id = question["id"]
+                    if (low is None or question_id >= low) and (
+                        high is None or question_id <= high
+                    ):
+                        yield question
+
+            source = _reservoir(in_range(_stream_source(path, header)), count, rng)
+    except FileNotFoundError as exc:
+        raise QuizFileError(f"Erreur: {path} Le fichier n'existe pas.") from exc
+    except json.JSONDecodeError as exc:
+        raise QuizFileError(f"Erreur: {path} format de fichier incorrect.") from exc
+
+    return {
+        "quiz_title": header["quiz_title"],
+        "nombre_questions": len(source),
+        "quiz_name": quiz_name,
+        "questions": LazyQuestions(source, checked=True),
+        "index": build_index(question["id"] for question in source),
+    }
+
+
+def read_question(question_id: int, quiz: Dict) -> Question:
     """
     Retourne une question spécifique par son ID.
 
+    La recherche passe par l'index construit au chargement (temps constant).
+
     Args:
         quiz: Quiz au format interne
         question_id: ID de la question recherchée
@@ -113,9 +528,9 @@ def read_question(question_id: int, quiz: Dict) -> Dict:
         QuizFileError: Si la question n'est pas trouvée
     """
 
-    for question in quiz["questions"]:
-        if question["question_id"] == question_id:
-            return question
+    position = _position(question_id, quiz)
+    if position is not None:
+        return quiz["questions"][position]
 
     raise QuizFileError(f"Question ID {question_id} introuvable dans le quiz.")
 
@@ -130,4 +545,11 @@ def liste_questions(quiz) -> List[int]:
     Returns:
         Liste des IDs de questions
     """
-    return [q["question_id"] for q in quiz["questions"]]
+    if "index" in quiz:
+        return list(quiz["index"])
+
+    reader = quiz.get("container")
+    if reader is not None:
+        return list(reader.ids)
+
+    return [q.question_id for q in quiz["questions"]]
@@ -2,94 +2,396 @@
 Modèle resultats
 """
 
-import json
-from typing import Dict, List
+import os
+import re
+from array import array
+from collections.abc import Mapping
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List
 import random
+from pathlib import Path
+import atomic
 import config
 import crypto
+import journal
+import locking
+import timings
+from lazy import lazy_import
+
+# Utilisés par le seul backend SQLite : importés au premier usage
+sqlite3 = lazy_import("sqlite3")
+resultats_sqlite = lazy_import("resultats_sqlite")
+
+# Noms de fichiers de résultats (et de quiz) acceptés d'un client : pas de chemin
+NAME = re.compile(r"[\w-]{1,100}")
+
+# Clés du format fichier, exposées aussi en lecture par Resultats
+KEYS = ("quiz_name", "nom", "prenom", "correct_count", "questions")
+
+# Inverse un octet 0/1 (questions restant à poser)
+_NON_CORRECT = bytes([1, 0]) + bytes(254)
 
 
 class QuizResultatError(Exception):
     """Erreur liée au fichier de quiz (format, lecture, validation)."""
 
 
-def load(resultat_file: str) -> Dict:
-    """Charge un quiz depuis un fichier JSON."""
+class Resultats(Mapping):  # pylint: disable=too-many-instance-attributes
+    """
+    Résultats d'un quiz, mis à jour de façon incrémentale.
+
+    La réussite de chaque question est un octet (0 ou 1) d'un bytearray
+    indexé par la position de la question, et le nombre de bonnes réponses
+    est tenu à jour : marquer une question coûte O(1) au lieu de recopier
+    toute la liste.
+
+    snapshot() retourne une copie en O(1) qui partage le tableau de
+    réussite ; le premier des deux objets modifié recopie le tableau
+    (copie sur écriture). Le format fichier historique reste accessible en
+    lecture (resultats["questions"], resultats["correct_count"], ...).
+    """
+
+    __slots__ = (
+        "quiz_name",
+        "nom",
+        "prenom",
+        "ids",
+        "_positions",
+        "_correct",
+        "_count",
+        "_shared",
+    )
+
+    def __init__(
+        self,
+        quiz_name: str,
+        nom: str,
+        prenom: str,
+        ids: Iterable[int],
+        correct: bytes | None = None,
+    ) -> None:
+        self.quiz_name = quiz_name
+        self.nom = nom
+        self.prenom = prenom
+        self.ids = array("q", ids)
+        self._positions: Dict[int, int] = {}
+        for position, question_id in enumerate(self.ids):
+            if self._positions.setdefault(question_id, position) != position:
+                raise QuizResultatError(f"Erreur: id {question_id} dupliqué.")
+        self._correct = bytearray(correct) if correct else bytearray(len(self.ids))
+        if len(self._correct) != len(self.ids):
+            raise QuizResultatError("Erreur: résultats incohérents.")
+        self._count = self._correct.count(1)
+        self._shared = [False]
+
+    @property
+    def correct_count(self) -> int:
+        """Nombre de questions répondues correctement."""
+        return self._count
+
+    @property
+    def nombre_questions(self) -> int:
+        """Nombre de questions du quiz suivies par ces résultats."""
+        return len(self.ids)
+
+    def is_correct(self, question_id: int) -> bool:
+        """Indique si une question a été répondue correctement."""
+        position = self._positions.get(question_id)
+        return position is not None and self._correct[position] == 1
+
+    def marquer_correct(self, question_id: int) -> None:
+        """Marque une question comme correcte, en place (id inconnu ignoré)."""
+        position = self._positions.get(question_id)
+        if position is None or self._correct[position]:
+            return
+        if self._shared[0]:
+            # Un instantané partage encore le tableau : le détacher
+            self._correct = bytearray(self._correct)
+            self._shared = [False]
+        self._correct[position] = 1
+        self._count += 1
+
+    def snapshot(self) -> "Resultats":
+        """Retourne une copie figée en O(1) (copie sur écriture)."""
+        copie = Resultats.__new__(Resultats)
+        for name in self.__slots__:
+            setattr(copie, name, getattr(self, name))
+        self._shared[0] = True
+        return copie
+
+    @property
+    def reussites(self) -> bytes:
+        """Réussite de chaque question (octet 0 ou 1), dans l'ordre des ids."""
+        return bytes(self._correct)
+
+    def non_correctes(self) -> List[int]:
+        """Ids des questions non encore répondues correctement, dans l'ordre."""
+        return list(compress(self.ids, self._correct.translate(_NON_CORRECT)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retourne les résultats au format fichier."""
+        return {key: self[key] for key in KEYS}
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Resultats":
+        """
+        Construit des résultats à partir du format fichier.
+
+        Raises:
+            QuizResultatError: Si la structure est incorrecte
+        """
+        try:
+            questions = data["questions"]
+            return cls(
+                data["quiz_name"],
+                data["nom"],
+                data["prenom"],
+                (q["question_id"] for q in questions),
+                bytes(1 if q["correct"] else 0 for q in questions),
+            )
+        except (KeyError, TypeError, OverflowError) as exc:
+            raise QuizResultatError("Erreur: format de résultats incorrect.") from exc
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "questions":
+            return [
+                {"question_id": question_id, "correct": bool(correct)}
+                for question_id, correct in zip(self.ids, self._correct)
+            ]
+        if key == "correct_count":
+            return self._count
+        if key in ("quiz_name", "nom", "prenom"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    def __repr__(self) -> str:
+        return (
+            f"Resultats({self.quiz_name!r}, {self.prenom!r} {self.nom!r}, "
+            f"{self._count}/{len(self.ids)})"
+        )
+
+
+def journal_path(resultat_file: str) -> Path:
+    """Retourne le chemin du journal associé à un fichier de résultats."""
+    return config.data_path / config.RESULT_PATH / (resultat_file + journal.SUFFIX)
+
+
+def lock(resultat_file: str, shared: bool = False) -> locking.FileLock:
+    """
+    Verrou (partagé pour lire, exclusif pour écrire) d'un fichier de
+    résultats et de son journal, réentrant au sein d'un processus.
+    """
+    path = config.data_path / config.RESULT_PATH / (resultat_file + ".lock")
+    return locking.FileLock(path, shared=shared, timeout=config.LOCK_TIMEOUT)
+
+
+def lock_session(resultat_file: str) -> locking.FileLock:
+    """
+    Réserve un fichier de résultats pour une session interactive.
+
+    Raises:
+        QuizResultatError: Si une autre session utilise déjà ce fichier
+    """
+    path = config.data_path / config.RESULT_PATH / (resultat_file + ".session")
+    session = locking.FileLock(path, timeout=0)
+    try:
+        session.acquire()
+    except locking.LockTimeout as exc:
+        detail = f" (processus {exc.holder})" if exc.holder else ""
+        raise QuizResultatError(
+            f"Erreur: {resultat_file} est déjà utilisé par une autre session{detail}."
+        ) from exc
+    return session
+
+
+def end_session(resultat_file: str, session: locking.FileLock) -> None:
+    """
+    Termine une session après sa sauvegarde finale : supprime le journal
+    (vidé par save), le fichier de verrou et celui de la réservation, puis
+    rend la réservation.
+
+    Les fichiers de verrou sont supprimés verrou tenu : un processus qui
+    attendait sur l'ancien fichier le détecte et reprend sur un nouveau
+    (voir locking). Le nettoyage est facultatif : s'il échoue, les fichiers
+    restent et seront réutilisés.
+    """
+    try:
+        with lock(resultat_file) as verrou:
+            path = journal_path(resultat_file)
+            if path.exists() and path.stat().st_size == 0:
+                path.unlink()
+            verrou.path.unlink(missing_ok=True)
+        session.path.unlink(missing_ok=True)
+    except (locking.LockTimeout, OSError):
+        pass
+    finally:
+        session.release()
+
+
+def _load_sqlite(resultat_file: str) -> Resultats:
+    """Charge une session depuis la base SQLite (voir resultats_sqlite)."""
+    try:
+        return Resultats(*resultats_sqlite.load(resultat_file))
+    except LookupError as exc:
+        raise QuizResultatError(
+            f"Erreur: session {resultat_file} introuvable dans "
+            f"{resultats_sqlite.db_path()}."
+        ) from exc
+    except sqlite3.Error as exc:
+        raise QuizResultatError(
+            f"Erreur: {resultats_sqlite.db_path()} base de résultats illisible."
+        ) from exc
+
+
+@timings.timed("resultats.chargement")
+def load(resultat_file: str) -> Resultats:
+    """
+    Charge des résultats depuis un fichier JSON (ou la base SQLite, selon
+    config.result_backend).
+
+    Les bonnes réponses enregistrées dans le journal depuis la dernière
+    sauvegarde sont rejouées sur le contenu du fichier.
+
+    Raises:
+        QuizResultatError: Si le fichier est introuvable, illisible ou mal
+                           formé, ou si le verrou n'est pas obtenu à temps
+    """
 
     resultat_path = config.data_path / config.RESULT_PATH / (resultat_file + ".json")
 
     try:
-        with open(resultat_path, "rb") as f:
-            file_bytes = f.read()
-            return crypto.load_json(file_bytes)
+        with lock(resultat_file, shared=True):
+            if config.result_backend == "sqlite":
+                resultats = _load_sqlite(resultat_file)
+            else:
+                with open(resultat_path, "rb") as f, timings.timer("lecture"):
+                    file_bytes = f.read()
+                resultats = Resultats.from_dict(crypto.load_json(file_bytes))
+            for question_id in journal.replay(journal_path(resultat_file)):
+                resultats.marquer_correct(question_id)
+        return resultats
+    except locking.LockTimeout as exc:
+        raise QuizResultatError(f"Erreur: {exc}") from exc
     except FileNotFoundError as exc:
         raise QuizResultatError(
             f"Erreur: {resultat_path} Le fichier n'existe pas."
         ) from exc
-    except json.JSONDecodeError as exc:
+    except OSError as exc:
+        raise QuizResultatError(
+            f"Erreur: {resultat_path} lecture impossible ({exc.strerror})."
+        ) from exc
+    except ValueError as exc:  # JSONDecodeError, UnicodeDecodeError
         raise QuizResultatError(
             f"Erreur: {resultat_path} format de fichier incorrect."
         ) from exc
 
 
-def save(resultats: Dict, resultat_file: str) -> None:
-    """Enregistre les résultats du quiz dans un fichier JSON."""
+@timings.timed("resultats.sauvegarde")
+def save_snapshot(resultats: Resultats, resultat_file: str, fsync: bool = True) -> None:
+    """
+    Enregistre les résultats dans le fichier JSON (ou la base SQLite, selon
+    config.result_backend), sans toucher au journal.
 
-    resultat_path = config.data_path / config.RESULT_PATH / (resultat_file + ".json")
+    Voir autosave.AutoSaver, qui compacte ensuite le journal ouvert.
+    fsync=False laisse au système le soin d'écrire le fichier sur disque
+    (écritures en masse, voir sync et batch).
 
-    encrypted_bytes = crypto.save_json(resultats, encrypt=True)
-    with open(resultat_path, "wb") as fichier:
-        fichier.write(encrypted_bytes)
+    Raises:
+        locking.LockTimeout: Si le verrou exclusif n'est pas obtenu à temps
+    """
+    with lock(resultat_file):
+        if config.result_backend == "sqlite":
+            session = (resultats.quiz_name, resultats.nom, resultats.prenom)
+            resultats_sqlite.save(
+                resultat_file, (*session, list(resultats.ids), resultats.reussites)
+            )
+            return
 
+        resultat_path = (
+            config.data_path / config.RESULT_PATH / (resultat_file + ".json")
+        )
+        atomic.write(
+            resultat_path,
+            crypto.save_json(resultats.to_dict(), encrypt=True, indent=None),
+            fsync=fsync,
+        )
 
-def create(quiz_name: str, liste_questions: List[int], prenom: str, nom: str) -> Dict:
-    """Construit la structure du quiz à partir des données chargées."""
-    resultats = {
-        "quiz_name": quiz_name,
-        "nom": nom,
-        "prenom": prenom,
-        "correct_count": 0,
-        "questions": [],
-    }
 
-    resultats["questions"] = [
-        {"question_id": question_id, "correct": False}
-        for question_id in liste_questions
-    ]
+def sync(resultat_files: Iterable[str]) -> None:
+    """
+    Écrit sur disque des résultats enregistrés avec fsync=False : un fsync
+    par fichier, puis un du dossier (hors Windows) pour les renommages.
+    """
+    if config.result_backend == "sqlite":
+        return
+    directory = config.data_path / config.RESULT_PATH
+    for resultat_file in resultat_files:
+        with open(directory / (resultat_file + ".json"), "rb+") as f:
+            os.fsync(f.fileno())
+    if os.name != "nt":
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
 
-    return resultats
+def save(resultats: Resultats, resultat_file: str, fsync: bool = True) -> None:
+    """
+    Enregistre les résultats du quiz dans un fichier JSON.
 
+    L'écriture est atomique. Le journal associé, qui ne doit pas être
+    ouvert, est ensuite vidé : son contenu est désormais inclus dans le
+    fichier (compaction).
 
-def valider_resultat(question_id: int, resultats: Dict) -> Dict:
+    Raises:
+        locking.LockTimeout: Si le verrou exclusif n'est pas obtenu à temps
     """
-    Retourne un nouveau dict de résultats avec la question marquée comme correcte.
+    with lock(resultat_file):
+        save_snapshot(resultats, resultat_file, fsync=fsync)
+        journal.clear(journal_path(resultat_file))
+
+
+def open_journal(resultat_file: str) -> journal.Journal:
+    """Ouvre en ajout le journal associé à un fichier de résultats."""
+    return journal.Journal(journal_path(resultat_file))
+
+
+def create(
+    quiz_name: str, liste_questions: List[int], prenom: str, nom: str
+) -> Resultats:
+    """Construit la structure du quiz à partir des données chargées."""
+    return Resultats(quiz_name, nom, prenom, liste_questions)
+
+
+def valider_resultat(question_id: int, resultats: Resultats) -> Resultats:
+    """
+    Retourne de nouveaux résultats avec la question marquée comme correcte.
     Pure function: Ne modifie pas l'input, retourne une nouvelle structure.
 
+    Pour une mise à jour en place en O(1), utiliser resultats.marquer_correct().
+
     Args:
         question_id: ID de la question à marquer comme correcte
-        resultats: Dict des résultats actuels (non modifié)
+        resultats: Résultats actuels (non modifiés)
 
     Returns:
-        Nouveau dict avec la question mise à jour
+        Nouveaux résultats avec la question mise à jour
     """
-    # Create new questions list with updated question
-    new_questions = [
-        {**q, "correct": True} if q["question_id"] == question_id else dict(q)
-        for q in resultats["questions"]
-    ]
-
-    # Recalculate correct count from the new data (single source of truth)
-    correct_count = sum(1 for q in new_questions if q["correct"])
-
-    # Return new dict with updated values (shallow copy for top level)
-    return {**resultats, "questions": new_questions, "correct_count": correct_count}
+    nouveaux = resultats.snapshot()
+    nouveaux.marquer_correct(question_id)
+    return nouveaux
 
 
-def questions_a_poser(resultats: Dict) -> List:
+def questions_a_poser(resultats: Resultats) -> List:
     """Retourne une liste aléatoire des questions non encore répondues correctement."""
-    questions_non_repondues = [
-        q["question_id"] for q in resultats["questions"] if not q["correct"]
-    ]
+    questions_non_repondues = resultats.non_correctes()
 
     if not questions_non_repondues:
         return []
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Stockage des résultats dans une base SQLite.
+
+Alternative aux fichiers JSON chiffrés (un fichier par élève) pour les
+déploiements en classe : toutes les sessions sont rangées dans une seule
+base (config.data_path / config.RESULT_PATH / config.RESULT_DB), avec une
+ligne par question et par session. Les requêtes transverses (taux de
+réussite d'une question, résultats d'un élève) n'ont plus à ouvrir chaque
+fichier. Le mode WAL permet à plusieurs sessions d'écrire en même temps.
+
+Le backend est choisi par config.result_backend ("json" ou "sqlite") et
+utilisé par resultats_data.load/save : le reste de l'application n'en
+dépend pas.
+
+Usage (import des fichiers de résultats existants) :
+    python3 resultats_sqlite.py [FICHIER_OU_DOSSIER ...]
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, List, Tuple
+import config
+import crypto
+import journal
+
+# Délai d'attente d'un verrou d'écriture tenu par une autre session (secondes)
+BUSY_TIMEOUT = 10.0
+
+# Index (quiz, élève, question) en deux étapes : le quiz et l'élève sont
+# dans sessions (index sessions_quiz_eleve, qui couvre aussi l'id), la
+# question dans answers (clé primaire session_id, question_id). Un index
+# composite unique obligerait à recopier quiz et élève dans chaque réponse.
+# answers_question sert les statistiques par question, tous élèves confondus.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    resultat_file TEXT NOT NULL UNIQUE,
+    quiz_name TEXT NOT NULL,
+    nom TEXT NOT NULL,
+    prenom TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_quiz_eleve
+    ON sessions (quiz_name, nom, prenom);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (session_id, question_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS answers_question
+    ON answers (question_id, correct);
+"""
+
+# Contenu d'une session : quiz_name, nom, prenom, ids, réussites (octets 0/1)
+Session = Tuple[str, str, str, List[int], bytes]
+
+
+def db_path() -> Path:
+    """Retourne le chemin de la base de résultats."""
+    return config.data_path / config.RESULT_PATH / config.RESULT_DB
+
+
+def connect() -> sqlite3.Connection:
+    """Ouvre la base (créée au besoin) en mode WAL."""
+    connection = sqlite3.connect(db_path(), timeout=BUSY_TIMEOUT)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def load(resultat_file: str) -> Session:
+    """
+    Lit une session.
+
+    Raises:
+        LookupError: Si la session n'existe pas
+        sqlite3.Error: Si la base est illisible
+    """
+    connection = connect()
+    try:
+        row = connection.execute(
+            "SELECT id, quiz_name, nom, prenom FROM sessions WHERE resultat_file = ?",
+            (resultat_file,),
+        ).fetchone()
+        if row is None:
+            raise LookupError(resultat_file)
+        session_id, quiz_name, nom, prenom = row
+        answers = connection.execute(
+            "SELECT question_id, correct FROM answers"
+            " WHERE session_id = ? ORDER BY position",
+            (session_id,),
+        ).fetchall()
+    finally:
+        connection.close()
+    return (
+        quiz_name,
+        nom,
+        prenom,
+        [question_id for question_id, _ in answers],
+        bytes(correct for _, correct in answers),
+    )
+
+
+def list_sessions() -> List[str]:
+    """Noms des sessions enregistrées, triés."""
+    connection = connect()
+    try:
+        rows = connection.execute(
+            "SELECT resultat_file FROM sessions ORDER BY resultat_file"
+        ).fetchall()
+    finally:
+        connection.close()
+    return [name for (name,) in rows]
+
+
+def _save(connection: sqlite3.Connection, resultat_file: str, session: Session) -> None:
+    quiz_name, nom, prenom, ids, correct = session
+    session_id = connection.execute(
+        "INSERT INTO sessions (resultat_file, quiz_name, nom, prenom)"
+        " VALUES (?, ?, ?, ?)"
+        " ON CONFLICT (resultat_file) DO UPDATE SET"
+        " quiz_name = excluded.quiz_name, nom = excluded.nom,"
+        " prenom = excluded.prenom"
+        " RETURNING id",
+        (resultat_file, quiz_name, nom, prenom),
+    ).fetchone()[0]
+    connection.execute("DELETE FROM answers WHERE session_id = ?", (session_id,))
+    connection.executemany(
+        "INSERT INTO answers (session_id, position, question_id, correct)"
+        " VALUES (?, ?, ?, ?)",
+        (
+            (session_id, position, question_id, correct[position])
+            for position, question_id in enumerate(ids)
+        ),
+    )
+
+
+def save(resultat_file: str, session: Session) -> None:
+    """Enregistre une session (remplace la précédente du même nom)."""
+    connection = connect()
+    try:
+        with connection:
+            _save(connection, resultat_file, session)
+    finally:
+        connection.close()
+
+
+def _import(
+    connection: sqlite3.Connection, resultat_file: str, session: Session
+) -> None:
+    """Enregistre une session dans un point de sauvegarde, annulé en cas d'échec."""
+    connection.execute("SAVEPOINT import_session")
+    try:
+        _save(connection, resultat_file, session)
+    except sqlite3.Error:
+        connection.execute("ROLLBACK TO import_session")
+        raise
+    finally:
+        connection.execute("RELEASE import_session")
+
+
+def import_files(paths: Iterable[Path]) -> Tuple[int, List[str]]:
+    """
+    Importe des fichiers de résultats JSON (et leur journal) dans la base.
+
+    Chaque fichier devient la session du même nom. L'import se fait en une
+    seule transaction ; un fichier rejeté par la base (id de question
+    dupliqué, champ nul) est annulé seul et signalé comme les autres erreurs.
+
+    Returns:
+        Nombre de sessions importées et liste des erreurs
+    """
+    count, errors = 0, []
+    connection = connect()
+    try:
+        with connection:
+            connection.execute("BEGIN")
+            for path in paths:
+                try:
+                    data = crypto.load_json(path.read_bytes())
+                    questions = data["questions"]
+                    ids = [q["question_id"] for q in questions]
+                    correct = bytearray(1 if q["correct"] else 0 for q in questions)
+                    positions = {question_id: i for i, question_id in enumerate(ids)}
+                    for question_id in journal.replay(path.with_suffix(journal.SUFFIX)):
+                        if question_id in positions:
+                            correct[positions[question_id]] = 1
+                    session = (data["quiz_name"], data["nom"], data["prenom"], ids)
+                    _import(connection, path.stem, (*session, bytes(correct)))
+                    count += 1
+                except (
+                    OSError,
+                    ValueError,
+                    KeyError,
+                    TypeError,
+                    sqlite3.IntegrityError,
+                ) as exc:
+                    errors.append(f"{path.name}: {exc}")
+    finally:
+        connection.close()
+    return count, errors
+
+
+def main() -> int:
+    """Point d'entrée : importe des fichiers de résultats dans la base."""
+    arguments = sys.argv[1:] or [str(config.data_path / config.RESULT_PATH)]
+    paths: List[Path] = []
+    for argument in arguments:
+        path = Path(argument)
+        paths.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+
+    count, errors = import_files(paths)
+    for error in errors:
+        print(f"  ✗ {error}")
+    print(f"✓ {count} session(s) importée(s) dans {db_path()}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
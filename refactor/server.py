@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP du quiz (asyncio, bibliothèque standard uniquement).
+
+API JSON (HTTP/1.1, connexions persistantes) :
+
+    POST /start                      {"quiz", "resultat", "nom", "prenom",
+                                      "count" (facultatif)} : nouvelle session
+    POST /resume                     {"resultat"} : reprise des questions
+                                     non réussies d'un fichier de résultats
+    GET  /sessions/<jeton>/question  question en cours (choix mélangés)
+    POST /sessions/<jeton>/answer    {"choice": n} : position du choix
+                                     affiché (null : pas de réponse)
+    POST /sessions/<jeton>/close     termine la session et enregistre
+
+L'ordre des choix d'une question est tiré par la requête POST qui la rend
+courante (start, resume ou la réponse précédente) : GET /question ne
+modifie pas la session et peut être répété ou relancé sans effet.
+
+Chaque quiz n'est chargé qu'une fois et partagé par toutes les sessions.
+Une session ne tient que ses résultats et l'état compact de son moteur
+(voir session.Session) : des centaines de sessions tiennent sur un seul
+cœur.
+
+La persistance reprend celle de l'application en ligne de commande : le
+fichier de résultats est réservé (resultats_data.lock_session), chaque
+bonne réponse est ajoutée au journal et un instantané est écrit au plus
+toutes les config.AUTOSAVE_DELAY secondes (autosave.write). Ces accès
+disque passent par le pool de threads de la boucle, qui ne bloque jamais.
+
+Usage:
+    python3 server.py [--host HOTE] [--port PORT]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import sys
+import time
+from contextlib import suppress
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import autosave
+import config
+import quiz_data
+import resultats_data
+from journal import Journal
+from locking import FileLock
+from resultats_data import Resultats
+from session import Session
+
+# Taille maximale de l'en-tête et du corps d'une requête (octets)
+MAX_HEADER = 16 * 1024
+MAX_BODY = 64 * 1024
+
+# Intervalle de recherche des sessions inactives (secondes)
+REAP_INTERVAL = 60.0
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+Reponse = Tuple[int, Dict[str, Any]]
+
+
+class HttpError(Exception):
+    """Erreur renvoyée au client avec un code HTTP."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class SessionWeb:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
+    """Session d'un élève : déroulement du quiz et persistance des résultats."""
+
+    __slots__ = (
+        "token",
+        "resultat_file",
+        "moteur",
+        "verrou",
+        "journal",
+        "sauvegarde",
+        "ecriture",
+        "vue",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        resultat_file: str,
+        quiz: Dict,
+        resultats: Resultats,
+        verrou: FileLock,
+        journal: Journal,
+    ) -> None:
+        self.token = secrets.token_urlsafe(12)
+        self.resultat_file = resultat_file
+        self.moteur = Session.start(quiz, resultats)
+        self.verrou = verrou
+        self.journal = journal
+        self.sauvegarde: Optional[asyncio.Task] = None
+        self.ecriture: Optional[asyncio.Future] = None
+        self.vue = time.monotonic()
+
+    @property
+    def resultats(self) -> Resultats:
+        """Résultats de la session."""
+        return self.moteur.resultats
+
+    def score(self) -> Dict[str, int]:
+        """Score courant."""
+        return {
+            "score": self.resultats.correct_count,
+            "total": self.resultats.nombre_questions,
+        }
+
+
+def _executer(fonction: Callable, *args) -> asyncio.Future:
+    """Exécute une fonction bloquante dans le pool de threads de la boucle."""
+    return asyncio.get_running_loop().run_in_executor(None, fonction, *args)
+
+
+def _charger_quiz(quiz_name: str) -> Tuple[Dict, List[int]]:
+    quiz = quiz_data.load(quiz_name)
+    return quiz, quiz_data.liste_questions(quiz)
+
+
+def _fermer(session: SessionWeb) -> None:
+    """
+    Ferme le journal, enregistre les résultats et libère le fichier (en
+    supprimant journal et fichiers de verrou si l'enregistrement a réussi).
+    """
+    try:
+        session.journal.close()
+        resultats_data.save(session.resultats, session.resultat_file)
+        resultats_data.end_session(session.resultat_file, session.verrou)
+    finally:
+        session.verrou.release()
+
+
+def _nom(body: Dict, key: str) -> str:
+    valeur = body.get(key)
+    if not isinstance(valeur, str) or not resultats_data.NAME.fullmatch(valeur):
+        raise HttpError(400, f"{key} : nom invalide")
+    return valeur
+
+
+def _texte(body: Dict, key: str) -> str:
+    valeur = body.get(key, "")
+    if not isinstance(valeur, str):
+        raise HttpError(400, f"{key} : texte attendu")
+    return valeur.strip()
+
+
+def _entier(body: Dict, key: str) -> Optional[int]:
+    valeur = body.get(key)
+    if valeur is not None and (isinstance(valeur, bool) or not isinstance(valeur, int)):
+        raise HttpError(400, f"{key} : entier attendu")
+    return valeur
+
+
+class QuizServer:
+    """Sessions en cours et quiz partagés, servis par asyncio."""
+
+    def __init__(
+        self, delay: Optional[float] = None, idle_timeout: Optional[float] = None
+    ) -> None:
+        self.delay = config.AUTOSAVE_DELAY if delay is None else delay
+        self.idle_timeout = (
+            config.SESSION_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        )
+        self.quizzes: Dict[str, asyncio.Future] = {}
+        self.sessions: Dict[str, SessionWeb] = {}
+        self._reserves: Set[str] = set()
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def quiz(self, quiz_name: str) -> Tuple[Dict, List[int]]:
+        """
+        Quiz et liste de ses ids, chargés une seule fois pour toutes les
+        sessions (les demandes simultanées attendent le même chargement).
+        """
+        future = self.quizzes.get(quiz_name)
+        if future is None:
+            future = _executer(_charger_quiz, quiz_name)
+            self.quizzes[quiz_name] = future
+        try:
+            return await asyncio.shield(future)
+        except quiz_data.QuizFileError as exc:
+            if self.quizzes.get(quiz_name) is future:
+                del self.quizzes[quiz_name]
+            raise HttpError(404, str(exc)) from exc
+
+    # Sessions
+
+    async def _ouvrir(
+        self,
+        resultat_file: str,
+        quiz: Optional[Dict] = None,
+        resultats: Optional[Resultats] = None,
+    ) -> SessionWeb:
+        """
+        Réserve un fichier de résultats et ouvre sa session : les résultats
+        fournis sont enregistrés, sinon ils sont relus (reprise).
+        """
+        # lock_session est réentrant au sein d'un thread, et un même thread de
+        # l'exécuteur sert plusieurs requêtes : les sessions du serveur sont
+        # départagées ici
+        if resultat_file in self._reserves:
+            raise HttpError(
+                409, f"Erreur: {resultat_file} est déjà utilisé par une autre session."
+            )
+        self._reserves.add(resultat_file)
+        try:
+            verrou = await _executer(resultats_data.lock_session, resultat_file)
+        except resultats_data.QuizResultatError as exc:
+            self._reserves.discard(resultat_file)
+            raise HttpError(409, str(exc)) from exc
+
+        try:
+            if resultats is None:
+                try:
+                    resultats = await _executer(resultats_data.load, resultat_file)
+                except resultats_data.QuizResultatError as exc:
+                    raise HttpError(404, str(exc)) from exc
+                quiz, _ = await self.quiz(resultats.quiz_name)
+            else:
+                await _executer(resultats_data.save, resultats, resultat_file)
+            journal = await _executer(resultats_data.open_journal, resultat_file)
+        except BaseException:
+            verrou.release()
+            self._reserves.discard(resultat_file)
+            raise
+
+        session = SessionWeb(resultat_file, quiz, resultats, verrou, journal)
+        self.sessions[session.token] = session
+        return session
+
+    async def close_session(self, session: SessionWeb) -> None:
+        """Termine une session : dernière écriture et libération du fichier."""
+        if self.sessions.pop(session.token, None) is None:
+            return
+        if session.sauvegarde is not None:
+            session.sauvegarde.cancel()
+            await asyncio.gather(session.sauvegarde, return_exceptions=True)
+        if session.ecriture is not None:
+            # Une écriture en cours dans le pool ne s'interrompt pas
+            await asyncio.gather(session.ecriture, return_exceptions=True)
+        try:
+            await _executer(_fermer, session)
+        finally:
+            self._reserves.discard(session.resultat_file)
+
+    def _planifier(self, session: SessionWeb) -> None:
+        """Planifie l'écriture d'un instantané (une seule à la fois par session)."""
+        if session.sauvegarde is None:
+            session.sauvegarde = asyncio.create_task(self._sauvegarder(session))
+
+    async def _sauvegarder(self, session: SessionWeb) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.delay)
+                mark = session.journal.mark()
+                session.ecriture = _executer(
+                    autosave.write,
+                    session.resultats.snapshot(),
+                    session.resultat_file,
+                    session.journal,
+                    mark,
+                )
+                await asyncio.shield(session.ecriture)
+                session.ecriture = None
+                # Réponses journalisées pendant l'écriture : nouvel instantané
+                if session.journal.mark() == mark:
+                    break
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # Le journal conserve les réponses : close() réessaiera
+            print(f"✗ {session.resultat_file}: {exc}", file=sys.stderr)
+        finally:
+            session.sauvegarde = None
+
+    async def _reap(self) -> None:
+        """Ferme périodiquement les sessions inactives."""
+        while True:
+            await asyncio.sleep(min(REAP_INTERVAL, self.idle_timeout))
+            limite = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+                if session.vue < limite:
+                    await self.close_session(session)
+
+    # Points d'entrée de l'API
+
+    async def start(self, body: Dict) -> Reponse:
+        """POST /start : nouvelle session sur un quiz."""
+        quiz_name = _nom(body, "quiz")
+        resultat_file = _nom(body, "resultat")
+        nom, prenom = _texte(body, "nom"), _texte(body, "prenom")
+        count = _entier(body, "count")
+        if count is not None and count < 1:
+            raise HttpError(400, "count doit être un entier positif")
+
+        quiz, ids = await self.quiz(quiz_name)
+        if count is not None and count < len(ids):
+            ids = random.sample(ids, count)
+        resultats = resultats_data.create(quiz_name, ids, prenom, nom)
+        session = await self._ouvrir(resultat_file, quiz, resultats)
+        self._tirer(session)
+        return 201, self._etat(session)
+
+    async def resume(self, body: Dict) -> Reponse:
+        """POST /resume : reprise d'un fichier de résultats."""
+        session = await self._ouvrir(_nom(body, "resultat"))
+        self._tirer(session)
+        return 200, self._etat(session)
+
+    @staticmethod
+    def _etat(session: SessionWeb) -> Dict[str, Any]:
+        return {
+            "session": session.token,
+            "quiz_title": session.moteur.quiz["quiz_title"],
+            "prenom": session.resultats.prenom,
+            "nom": session.resultats.nom,
+            "questions": session.moteur.total,
+            **session.score(),
+        }
+
+    @staticmethod
+    def _tirer(session: SessionWeb) -> None:
+        """
+        Tire l'ordre des choix de la question suivante. Appelé par les
+        requêtes POST seulement : GET /question ne modifie pas la session.
+        """
+        try:
+            session.moteur.draw()
+        except quiz_data.QuizFileError:
+            pass  # Question absente du quiz : signalée par GET /question
+
+    @staticmethod
+    def question(session: SessionWeb) -> Reponse:
+        """GET /sessions/<jeton>/question : question en cours (lecture seule)."""
+        posee = session.moteur.current()
+        if posee is None:
+            return 200, {"done": True, **session.score()}
+        return 200, {
+            "done": False,
+            "index": posee.index,
+            "count": posee.total,
+            "id": posee.question_id,
+            "question": posee.question,
+            "choices": posee.choices,
+        }
+
+    async def answer(self, session: SessionWeb, body: Dict) -> Reponse:
+        """POST /sessions/<jeton>/answer : réponse à la question en cours."""
+        reponse = _entier(body, "choice")
+        if session.moteur.done or not session.moteur.permutation:
+            raise HttpError(409, "aucune question en cours")
+        question_id = session.moteur.ordre[session.moteur.position]
+        # L'état avance avant toute attente : une requête concurrente sur la
+        # même session voit déjà la question suivante
+        correct = session.moteur.submit(reponse)
+        self._tirer(session)
+        if correct:
+            await _executer(session.journal.append, question_id)
+            self._planifier(session)
+        return 200, {"correct": correct, **session.score()}
+
+    async def close(self, session: SessionWeb) -> Reponse:
+        """POST /sessions/<jeton>/close : fin de session."""
+        await self.close_session(session)
+        return 200, {"done": True, **session.score()}
+
+    async def dispatch(self, method: str, path: str, body: Any) -> Reponse:
+        """Aiguille une requête vers son point d'entrée."""
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if parts in (["start"], ["resume"]):
+            if method != "POST":
+                raise HttpError(405, "méthode non autorisée")
+            if not isinstance(body, dict):
+                raise HttpError(400, "objet JSON attendu")
+            return await (self.start if parts[0] == "start" else self.resume)(body)
+
+        if len(parts) != 3 or parts[0] != "sessions":
+            raise HttpError(404, "ressource inconnue")
+        session = self.sessions.get(parts[1])
+        if session is None:
+            raise HttpError(404, "session inconnue")
+        session.vue = time.monotonic()
+        action = parts[2]
+        if action == "question":
+            if method != "GET":
+                raise HttpError(405, "méthode non autorisée")
+            return self.question(session)
+        if action not in ("answer", "close"):
+            raise HttpError(404, "ressource inconnue")
+        if method != "POST":
+            raise HttpError(405, "méthode non autorisée")
+        if action == "close":
+            return await self.close(session)
+        if not isinstance(body, dict):
+            raise HttpError(400, "objet JSON attendu")
+        return await self.answer(session, body)
+
+    # Protocole HTTP
+
+    async def _requete(
+        self, head: bytes, reader: asyncio.StreamReader
+    ) -> Tuple[int, Dict[str, Any], bool]:
+        """Lit et traite une requête ; retourne (code, contenu, connexion gardée)."""
+        try:
+            method, target, length, keep_alive = _entete(head)
+        except HttpError as exc:
+            # Corps de longueur inconnue : la connexion ne peut pas être reprise
+            return exc.status, {"error": str(exc)}, False
+        data = await reader.readexactly(length) if length else b""
+
+        try:
+            body = json.loads(data) if data else {}
+            return (*await self.dispatch(method, target, body), keep_alive)
+        except json.JSONDecodeError:
+            return 400, {"error": "JSON invalide"}, keep_alive
+        except HttpError as exc:
+            return exc.status, {"error": str(exc)}, keep_alive
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            print(f"✗ {method} {target}: {exc!r}", file=sys.stderr)
+            return 500, {"error": "erreur interne"}, keep_alive
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Sert les requêtes successives d'une connexion."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(_reponse(413, {"error": "en-tête trop long"}, False))
+                    await writer.drain()
+                    break
+                status, payload, keep_alive = await self._requete(head, reader)
+                writer.write(_reponse(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def listen(self, host: str, port: int) -> asyncio.Server:
+        """Ouvre le port d'écoute et lance la fermeture des sessions inactives."""
+        self._reaper = asyncio.create_task(self._reap())
+        return await asyncio.start_server(
+            self.handle, host, port, limit=MAX_HEADER, backlog=1024
+        )
+
+    async def shutdown(self) -> None:
+        """Termine toutes les sessions (écriture des résultats)."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+        for session in list(self.sessions.values()):
+            await self.close_session(session)
+
+
+def _entete(head: bytes) -> Tuple[str, str, int, bool]:
+    """
+    Analyse l'en-tête d'une requête.
+
+    Returns:
+        Méthode, cible, longueur du corps et maintien de la connexion
+
+    Raises:
+        HttpError: Si l'en-tête est invalide ou le corps trop volumineux
+    """
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError as exc:
+        raise HttpError(400, "requête invalide") from exc
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "transfer-encoding" in headers:
+        raise HttpError(501, "transfer-encoding non géré")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError as exc:
+        raise HttpError(400, "content-length invalide") from exc
+    if not 0 <= length <= MAX_BODY:
+        raise HttpError(413, "requête trop volumineuse")
+
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        return method, target, length, connection != "close"
+    return method, target, length, connection == "keep-alive"
+
+
+def _reponse(status: int, payload: Dict[str, Any], keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    return (
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode() + body
+
+
+async def serve(
+    host: str = config.SERVER_HOST,
+    port: int = config.SERVER_PORT,
+    ready: Optional[Callable[[int], None]] = None,
+) -> None:
+    """
+    Sert l'API jusqu'à l'annulation de la tâche (Ctrl+C).
+
+    Args:
+        host: Adresse d'écoute
+        port: Port d'écoute (0 : port libre choisi par le système)
+        ready: Appelée avec le port effectif une fois le serveur à l'écoute
+    """
+    app = QuizServer()
+    server = await app.listen(host, port)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await app.shutdown()
+
+
+def main() -> int:
+    """Point d'entrée : lance le serveur HTTP du quiz."""
+    parser = argparse.ArgumentParser(description="Serveur HTTP du quiz")
+    parser.add_argument("--host", default=config.SERVER_HOST, help="Adresse d'écoute")
+    parser.add_argument(
+        "--port", type=int, default=config.SERVER_PORT, help="Port d'écoute"
+    )
+    args = parser.parse_args()
+
+    def ready(port: int) -> None:
+        print(f"✓ Serveur à l'écoute sur http://{args.host}:{port}")
+
+    try:
+        asyncio.run(serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"✗ {exc}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
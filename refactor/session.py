@@ -0,0 +1,218 @@
+"""
+Moteur de session du quiz, indépendant de l'interface.
+
+Une session enchaîne les questions restantes d'un quiz dans un ordre tiré
+au hasard, propose les choix de chaque question dans un ordre mélangé et
+note les réponses dans les résultats :
+
+    session = Session.start(quiz, resultats)
+    while (posee := session.next_question()) is not None:
+        reponse = ...  # position du choix affiché, ou None
+        session.submit(reponse)
+
+La ligne de commande (main) et le serveur HTTP (server) pilotent le même
+moteur ; la persistance des résultats reste à la charge de l'appelant.
+
+L'état propre d'une session se limite à l'ordre des questions, la position
+courante et l'ordre des choix de la question affichée. Il est stocké dans
+des tableaux compacts (8 octets par question, 2 par choix) et s'exporte en
+un seul bloc d'octets (to_bytes / from_bytes) : des milliers de sessions
+inactives tiennent en mémoire et se sauvegardent ou se restaurent en
+quelques microsecondes. Le quiz, partagé, et les résultats, enregistrés
+par resultats_data, n'en font pas partie.
+"""
+
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import quiz_data
+import resultats_data
+from resultats_data import Resultats
+
+# En-tête de l'état exporté : nombre de questions, position, nombre de choix
+_HEADER = struct.Struct("<IIH")
+
+
+class QuestionPosee(NamedTuple):
+    """Question telle qu'affichée : choix dans l'ordre mélangé de la session."""
+
+    index: int
+    total: int
+    question_id: int
+    question: str
+    choices: List[str]
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode, data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class Session:
+    """
+    Déroulement d'un questionnaire : question en cours et réponses.
+
+    Args:
+        quiz: Quiz au format interne (partagé entre sessions)
+        resultats: Résultats mis à jour par submit()
+        ordre: Ids des questions à poser, dans l'ordre
+        position: Nombre de questions déjà répondues
+        permutation: Ordre des choix de la question affichée (vide si
+                     aucune question n'est affichée)
+    """
+
+    __slots__ = ("quiz", "resultats", "ordre", "position", "permutation")
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        quiz: Dict,
+        resultats: Resultats,
+        ordre: Iterable[int],
+        position: int = 0,
+        permutation: Iterable[int] = (),
+    ) -> None:
+        self.quiz = quiz
+        self.resultats = resultats
+        self.ordre = array("q", ordre)
+        self.position = position
+        self.permutation = array("H", permutation)
+
+    @classmethod
+    def start(cls, quiz: Dict, resultats: Resultats) -> "Session":
+        """Nouvelle session sur les questions non encore réussies, mélangées."""
+        return cls(quiz, resultats, resultats_data.questions_a_poser(resultats))
+
+    @property
+    def total(self) -> int:
+        """Nombre de questions de la session."""
+        return len(self.ordre)
+
+    @property
+    def done(self) -> bool:
+        """Indique si toutes les questions ont été répondues."""
+        return self.position >= len(self.ordre)
+
+    def next_question(self) -> Optional[QuestionPosee]:
+        """
+        Question en cours, ou None si la session est terminée.
+
+        L'ordre des choix est tiré au premier appel (draw) puis conservé
+        jusqu'à la réponse : rappeler next_question() réaffiche la même
+        question.
+
+        Raises:
+            quiz_data.QuizFileError: Si la question n'existe pas dans le quiz
+        """
+        self.draw()
+        return self.current()
+
+    def draw(self) -> None:
+        """
+        Tire l'ordre des choix de la question en cours, s'il ne l'est pas déjà.
+
+        Raises:
+            quiz_data.QuizFileError: Si la question n'existe pas dans le quiz
+        """
+        if self.done or self.permutation:
+            return
+        question = quiz_data.read_question(self.ordre[self.position], self.quiz)
+        nombre_choix = len(question.choices)
+        self.permutation = array("H", random.sample(range(nombre_choix), nombre_choix))
+
+    def current(self) -> Optional[QuestionPosee]:
+        """
+        Question en cours telle qu'affichée, sans modifier l'état ; None si
+        la session est terminée.
+
+        Raises:
+            quiz_data.QuizFileError: Si la question n'existe pas dans le quiz
+            RuntimeError: Si l'ordre des choix n'a pas été tiré (voir draw)
+        """
+        if self.done:
+            return None
+        question = quiz_data.read_question(self.ordre[self.position], self.quiz)
+        if not self.permutation:
+            raise RuntimeError("ordre des choix non tiré")
+        return QuestionPosee(
+            self.position + 1,
+            len(self.ordre),
+            question.question_id,
+            question.question,
+            [question.choices[i] for i in self.permutation],
+        )
+
+    def submit(self, reponse: Optional[int]) -> bool:
+        """
+        Note la réponse à la question en cours et passe à la suivante.
+
+        Args:
+            reponse: Position du choix affiché (None si pas de réponse)
+
+        Returns:
+            True si la réponse est correcte (la question est alors marquée
+            dans les résultats), False sinon
+
+        Raises:
+            RuntimeError: Si aucune question n'est affichée
+        """
+        if self.done or not self.permutation:
+            raise RuntimeError("aucune question en cours")
+        question_id = self.ordre[self.position]
+        question = quiz_data.read_question(question_id, self.quiz)
+        correct = (
+            reponse is not None
+            and 0 <= reponse < len(self.permutation)
+            and question.is_correct(self.permutation[reponse])
+        )
+        self.position += 1
+        self.permutation = array("H")
+        if correct:
+            self.resultats.marquer_correct(question_id)
+        return correct
+
+    def to_bytes(self) -> bytes:
+        """Exporte l'état de la session (ordre, position, choix affichés)."""
+        return (
+            _HEADER.pack(len(self.ordre), self.position, len(self.permutation))
+            + _little_endian(self.ordre)
+            + _little_endian(self.permutation)
+        )
+
+    @classmethod
+    def from_bytes(cls, quiz: Dict, resultats: Resultats, data: bytes) -> "Session":
+        """
+        Restaure une session exportée par to_bytes().
+
+        Raises:
+            ValueError: Si l'état est tronqué ou incohérent (taille, position,
+                        ou ordre des choix qui n'est pas une permutation)
+        """
+        try:
+            total, position, choix = _HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise ValueError("état de session tronqué") from exc
+        fin_ordre = _HEADER.size + 8 * total
+        if len(data) != fin_ordre + 2 * choix or position > total:
+            raise ValueError("état de session incohérent")
+        permutation = _from_little_endian("H", data[fin_ordre:])
+        # submit() indexe les choix de la question par la permutation
+        if (choix and position == total) or sorted(permutation) != list(range(choix)):
+            raise ValueError("ordre des choix incohérent")
+        return cls(
+            quiz,
+            resultats,
+            _from_little_endian("q", data[_HEADER.size : fin_ordre]),
+            position,
+            permutation,
+        )
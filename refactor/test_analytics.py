@@ -0,0 +1,103 @@
+"""
+Tests unitaires pour le module analytics.
+
+Lance les tests avec : python3 -m unittest test_analytics
+"""
+
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import analytics
+import config
+import resultats_data
+
+
+class TestAnalytics(unittest.TestCase):
+    """Tests pour le chargement et les statistiques"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        data_path = Path(self.tmp.name)
+        (data_path / config.RESULT_PATH).mkdir()
+        patcher = patch.object(config, "data_path", data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Élève k (0 à 9) réussit les questions 1 à k ; la question 4 n'est
+        # réussie que par les meilleurs, la question 1 par presque tous
+        for k in range(10):
+            resultats = resultats_data.create("quiz", [1, 2, 3, 4, 5], "E", str(k))
+            for question_id in range(1, min(k, 5) + 1):
+                resultats.marquer_correct(question_id)
+            resultats_data.save(resultats, f"eleve{k}")
+        autre = resultats_data.create("autre", [1], "X", "Y")
+        resultats_data.save(autre, "autre")
+        (data_path / config.RESULT_PATH / "casse.json").write_text("{")
+
+    def test_load_all_parallel(self):
+        """Tous les fichiers sont chargés, les fichiers invalides signalés"""
+        # Encodage invalide : signalé comme les autres, sans arrêter le pool
+        (config.data_path / config.RESULT_PATH / "binaire.json").write_bytes(b"\xff{")
+        lignes, erreurs = analytics.load_all(analytics.list_results(), workers=2)
+        self.assertEqual(len(lignes), 11)
+        self.assertEqual(len(erreurs), 2)
+
+    def test_statistics(self):
+        """Taux de réussite, discrimination et distribution des scores"""
+        lignes, _ = analytics.load_all(analytics.list_results(), workers=1)
+        stats = analytics.analyse(lignes, "quiz")
+        self.assertEqual(stats.eleves, 10)
+        self.assertEqual(stats.question_ids, [1, 2, 3, 4, 5])
+        self.assertEqual(stats.reussies, [9, 8, 7, 6, 5])
+        self.assertAlmostEqual(stats.taux_reussite(0), 0.9)
+        # Groupes de 3 élèves : scores 100 % (k = 5 à 9) contre k = 0, 1, 2
+        self.assertAlmostEqual(stats.discrimination[0], 1 - 2 / 3)
+        self.assertAlmostEqual(stats.discrimination[4], 1.0)
+        self.assertEqual(sum(stats.distribution), 10)
+        self.assertEqual(stats.distribution[-1], 5)
+
+    def test_partial_sessions(self):
+        """Une question absente d'une session (tirage -n) n'est pas comptée"""
+        lignes = [
+            ("a", "quiz", [1, 2], b"\1\0"),
+            ("b", "quiz", [2, 3], b"\1\1"),
+        ]
+        stats = analytics.analyse(lignes, "quiz")
+        self.assertEqual(stats.posees, [1, 2, 1])
+        self.assertEqual(stats.reussies, [1, 1, 1])
+
+    def test_grouped_by_quiz(self):
+        """Les questions de même id de quiz différents ne sont pas mélangées"""
+        lignes, _ = analytics.load_all(analytics.list_results(), workers=1)
+        rapports = analytics.analyse_par_quiz(lignes)
+        self.assertEqual([stats.quiz_name for stats in rapports], ["autre", "quiz"])
+        autre, quiz = rapports
+        self.assertEqual((autre.eleves, autre.posees, autre.reussies), (1, [1], [0]))
+        self.assertEqual(quiz.eleves, 10)
+        self.assertEqual(quiz.posees[0], 10)
+        self.assertEqual(quiz.reussies[0], 9)
+
+    def test_exports(self):
+        """Les rapports JSON et CSV reprennent les statistiques de chaque quiz"""
+        lignes, erreurs = analytics.load_all(analytics.list_results(), workers=1)
+        rapports = analytics.analyse_par_quiz(lignes)
+        json_path = Path(self.tmp.name) / "rapport.json"
+        csv_path = Path(self.tmp.name) / "rapport.csv"
+        analytics.export_json(rapports, erreurs, json_path)
+        analytics.export_csv(rapports, csv_path)
+        rapport = json.loads(json_path.read_text(encoding="utf-8"))
+        self.assertEqual(rapport["quiz"][1]["quiz_name"], "quiz")
+        self.assertEqual(rapport["quiz"][1]["questions"][0]["reussite"], 0.9)
+        self.assertEqual(len(rapport["erreurs"]), 1)
+        with open(csv_path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual((rows[5]["quiz"], rows[5]["reussie"]), ("quiz", "5"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests unitaires pour le module atomic.
+
+Lance les tests avec : python3 -m unittest test_atomic
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import atomic
+
+
+class TestWrite(unittest.TestCase):
+    """Tests pour atomic.write()"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "fichier.json"
+
+    def test_new_file_follows_umask(self):
+        """Un nouveau fichier reçoit les droits d'open() (0666 moins le umask)"""
+        umask = os.umask(0o027)
+        self.addCleanup(os.umask, umask)
+        atomic.write(self.path, b"contenu")
+        self.assertEqual(self.path.read_bytes(), b"contenu")
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o640)
+
+    def test_keeps_mode(self):
+        """Un fichier remplacé garde ses droits d'accès"""
+        self.path.write_bytes(b"ancien")
+        self.path.chmod(0o604)
+        atomic.write(self.path, b"nouveau", fsync=False)
+        self.assertEqual(self.path.read_bytes(), b"nouveau")
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o604)
+
+    def test_failure_keeps_old_file(self):
+        """Un échec d'écriture laisse l'ancien fichier et aucun temporaire"""
+        self.path.write_bytes(b"ancien")
+        with patch.object(atomic.os, "replace", side_effect=OSError("disque plein")):
+            with self.assertRaises(OSError):
+                atomic.write(self.path, b"nouveau")
+        self.assertEqual(self.path.read_bytes(), b"ancien")
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests unitaires pour le module autosave.
+
+Lance les tests avec : python3 -m unittest test_autosave
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import autosave
+import config
+import resultats_data
+
+
+class TestAutoSaver(unittest.TestCase):
+    """Tests pour AutoSaver"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        data_path = Path(self.tmp.name)
+        (data_path / config.RESULT_PATH).mkdir()
+        patcher = patch.object(config, "data_path", data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resultats = resultats_data.create("quiz", list(range(1, 101)), "A", "B")
+        resultats_data.save(self.resultats, "test")
+
+    def answer(self, autosaver, question_id):
+        self.resultats.marquer_correct(question_id)
+        autosaver.record(self.resultats, question_id)
+
+    def test_rapid_updates_coalesced(self):
+        """Des réponses rapprochées ne produisent qu'une écriture"""
+        with autosave.AutoSaver("test", delay=0.2) as autosaver:
+            for question_id in range(1, 51):
+                self.answer(autosaver, question_id)
+            autosaver.flush()
+            self.assertEqual(autosaver.writes, 1)
+            self.assertEqual(resultats_data.journal_path("test").stat().st_size, 0)
+        self.assertEqual(resultats_data.load("test").correct_count, 50)
+
+    def test_close_flushes_pending(self):
+        """close() écrit le dernier instantané sans attendre le délai"""
+        autosaver = autosave.AutoSaver("test", delay=60)
+        self.answer(autosaver, 7)
+        autosaver.close()
+        self.assertEqual(autosaver.writes, 1)
+        relus = resultats_data.load("test")
+        self.assertTrue(relus.is_correct(7))
+
+    def test_journal_survives_failed_write(self):
+        """Une écriture en échec est signalée et les réponses restent journalisées"""
+        with patch.object(
+            resultats_data, "save_snapshot", side_effect=OSError("disque plein")
+        ):
+            with autosave.AutoSaver("test", delay=0) as autosaver:
+                self.answer(autosaver, 3)
+                autosaver.flush()
+                self.assertIsInstance(autosaver.error, OSError)
+        self.assertTrue(resultats_data.load("test").is_correct(3))
+
+
+if __name__ == "__main__":
+    unittest.main()
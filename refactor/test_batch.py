@@ -0,0 +1,121 @@
+"""
+Tests unitaires pour le module batch.
+
+Lance les tests avec : python3 -m unittest test_batch
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+import batch
+import config
+import resultats_data
+from test_quiz_data import QuizDirTestCase, make_quiz
+
+
+class TestBatch(QuizDirTestCase):
+    """Tests pour la correction de feuilles de réponses"""
+
+    def setUp(self):
+        super().setUp()
+        # Question i : bonne réponse en position i % 3
+        self.write_quiz("test", make_quiz(6))
+        batch.corrige_de.cache_clear()
+
+    def test_grade_by_index_and_text(self):
+        """Une réponse est acceptée par position d'origine ou par texte"""
+        sheet = {
+            "nom": "Dupont",
+            "prenom": "Jean",
+            # 1 et 2 justes (position, texte), 3 faux, 4 juste (position 1)
+            "answers": {"1": 1, "2": " print(1)\nprint(2) ", "3": 2, "4": 1},
+        }
+        [(name, score, total, erreurs)] = batch.grade("test", [("jean", sheet)])
+        self.assertEqual((name, score, total, erreurs), ("jean", 3, 6, []))
+        resultats = resultats_data.load("jean")
+        self.assertEqual(resultats.non_correctes(), [3, 5, 6])
+        self.assertEqual(resultats.nom, "Dupont")
+
+    def test_invalid_answers_reported(self):
+        """Les questions inconnues et réponses invalides sont signalées"""
+        sheet = {"answers": {"99": 0, "x": 0, "1": None, "2": True}}
+        [(_, score, _, erreurs)] = batch.grade("test", [("s", sheet)])
+        self.assertEqual(score, 0)
+        self.assertEqual(len(erreurs), 4)
+
+    def test_bad_sheets_rejected(self):
+        """Les feuilles mal formées ou hors de resultats/ sont rejetées sans écriture"""
+        sheets = [
+            ("../x", {"answers": {"1": 1}}),
+            (5, {"answers": {"1": 1}}),
+            ("liste", [1, 2]),
+            ("reponses", {"answers": [1]}),
+            ("nom", {"nom": 3}),
+            ("ok", {"answers": {"1": 1}}),
+        ]
+        bilans = batch.grade("test", sheets)
+        self.assertEqual([b[2] for b in bilans], [0, 0, 0, 0, 0, 6])
+        self.assertTrue(all(len(b[3]) == 1 for b in bilans[:5]))
+        self.assertFalse((config.data_path / "x.json").exists())
+        written = (config.data_path / config.RESULT_PATH).glob("*.json")
+        self.assertEqual([p.name for p in written], ["ok.json"])
+
+    def test_read_sheets(self):
+        """Les feuilles sont lues depuis un dossier ou un fichier JSONL"""
+        directory = self.tmp_path("feuilles")
+        directory.mkdir()
+        (directory / "a.json").write_text(json.dumps({"answers": {}}))
+        (directory / "b.json").write_text(json.dumps({"resultat": "bb"}))
+        (directory / "c.json").write_text('{"answers": ')
+        (directory / "d.json").write_bytes(b'{"nom": "\xff"}')
+        feuilles = list(batch.read_sheets(str(directory)))
+        self.assertEqual([n for n, _ in feuilles], ["a", "bb", "c", "d"])
+        self.assertEqual(
+            [isinstance(f, batch.Rejet) for _, f in feuilles],
+            [False, False, True, True],
+        )
+
+        jsonl = self.tmp_path("lot.jsonl")
+        jsonl.write_bytes(
+            b'{"resultat": "x"}\n\n{"answers": {}}\n[1]\n{"nom\n{"nom": "\xff"}\n'
+        )
+        feuilles = list(batch.read_sheets(str(jsonl)))
+        self.assertEqual(
+            [n for n, _ in feuilles], ["x", "lot_3", "lot_4", "lot_5", "lot_6"]
+        )
+        self.assertTrue(all(isinstance(f, batch.Rejet) for _, f in feuilles[3:]))
+
+    def test_unreadable_and_duplicate_sheets_rejected(self):
+        """Une feuille illisible ou en double est rejetée sans arrêter le lot"""
+        sheets = [
+            ("a", {"answers": {"1": 1}}),
+            ("casse", batch.Rejet("feuille illisible")),
+            ("a", {"answers": {"1": 0}}),
+            ("b", {"answers": {}}),
+        ]
+        bilans = batch.grade("test", sheets)
+        self.assertEqual(
+            [(b[0], b[2]) for b in bilans], [("a", 6), ("casse", 0), ("a", 0), ("b", 6)]
+        )
+        self.assertIn("déjà utilisé", bilans[2][3][0])
+        # La première feuille n'est pas écrasée par son double
+        self.assertTrue(resultats_data.load("a").is_correct(1))
+
+    def test_parallel_batch(self):
+        """Un grand lot est corrigé par un pool de processus"""
+        sheets = [(f"e{k}", {"answers": {"1": k % 3}}) for k in range(60)]
+        with patch.object(batch, "PARALLEL_MIN", 10), patch.object(
+            batch, "CHUNK_SIZE", 16
+        ):
+            bilans = batch.grade("test", sheets, workers=2)
+        self.assertEqual([b[0] for b in bilans], [f"e{k}" for k in range(60)])
+        self.assertEqual(sum(b[1] for b in bilans), 20)
+        self.assertTrue(resultats_data.load("e58").is_correct(1))
+
+    def tmp_path(self, name):
+        """Chemin dans le répertoire de données temporaire."""
+        return config.data_path / name
+
+
+if __name__ == "__main__":
+    unittest.main()
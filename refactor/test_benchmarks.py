@@ -0,0 +1,62 @@
+"""
+Tests du générateur et des scénarios de benchmarks.
+
+Lance les tests avec : python3 -m unittest test_benchmarks
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import config
+import quiz_data
+import resultats_data
+from benchmarks import generateur, scenarios
+
+
+class TestGenerateur(unittest.TestCase):
+    """Tests du générateur de banques"""
+
+    def test_deterministic(self):
+        """Une même graine produit le même fichier, octet pour octet"""
+        with tempfile.TemporaryDirectory() as tmp:
+            premier, second = Path(tmp) / "a.json", Path(tmp) / "b.json"
+            with patch.object(generateur, "BLOC", 512):
+                generateur.write_quiz(premier, 200, seed=3)
+            generateur.write_quiz(second, 200, seed=3)
+            self.assertEqual(premier.read_bytes(), second.read_bytes())
+
+    def test_banque_loads(self):
+        """La banque et ses résultats se chargent avec les modules de l'application"""
+        with tempfile.TemporaryDirectory() as tmp, patch.object(
+            config, "data_path", Path(tmp)
+        ):
+            nom = generateur.banque(Path(tmp), 50)
+            quiz = quiz_data.load(nom)
+            self.assertEqual(quiz["nombre_questions"], 50)
+            question = quiz_data.read_question(50, quiz)
+            self.assertTrue(any("\n" in choix for choix in question.choices))
+            resultats = resultats_data.load(nom)
+            self.assertEqual(resultats.nombre_questions, 50)
+            self.assertEqual(resultats.prenom, "Élodie")
+
+
+class TestScenarios(unittest.TestCase):
+    """Tests des scénarios chronométrés"""
+
+    def test_run(self):
+        """Chaque scénario retourne une durée par taille"""
+        mesures = scenarios.run((20,), repeat=1)
+        self.assertEqual(set(mesures), set(scenarios.SCENARIOS))
+        for durees in mesures.values():
+            self.assertGreater(durees["20"], 0)
+
+    def test_baseline_covers_scenarios(self):
+        """La référence enregistrée couvre tous les scénarios"""
+        reference = json.loads(scenarios.BASELINE.read_text(encoding="utf-8"))
+        self.assertEqual(set(reference["scenarios"]), set(scenarios.SCENARIOS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests unitaires pour le module catalog.
+
+Lance les tests avec : python3 -m unittest test_catalog
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+import cache
+import catalog
+import container
+import quiz_data
+from test_quiz_data import QuizDirTestCase, make_quiz
+
+
+class TestCatalog(QuizDirTestCase):
+    """Tests pour refresh() et list_banks()"""
+
+    def test_describes_all_formats(self):
+        """Titre, nombre de questions et format de chaque quiz"""
+        self.write_quiz("clair", make_quiz(3), encrypt=False)
+        source = self.write_quiz("chiffre", make_quiz(4))
+        container.convert(source, quiz_data.quiz_path("indexe"))
+        banks = {bank["name"]: bank for bank in catalog.list_banks()}
+        self.assertEqual(
+            {name: (b["questions"], b["format"]) for name, b in banks.items()},
+            {"chiffre": (4, "xor"), "clair": (3, "plain"), "indexe": (4, "container")},
+        )
+        self.assertEqual(banks["clair"]["title"], "Quiz de test")
+        self.assertEqual(len(banks["clair"]["sha256"]), 64)
+        self.assertTrue(catalog.catalog_path().exists())
+        # Rien d'autre que les quiz dans leur dossier (suivi par git)
+        self.assertEqual(
+            sorted(path.name for path in quiz_data.quiz_path("a").parent.iterdir()),
+            ["chiffre.json", "clair.json", "indexe.json"],
+        )
+        # Le catalogue n'est pas une entrée du cache de quiz compilés
+        cache.evict(0)
+        self.assertTrue(catalog.catalog_path().exists())
+
+    def test_incremental_refresh(self):
+        """Seuls les fichiers modifiés sont relus"""
+        self.write_quiz("a", make_quiz(3))
+        path_b = self.write_quiz("b", make_quiz(3))
+        catalog.refresh()
+
+        self.write_quiz("a", make_quiz(5))
+        stat = path_b.stat()
+        os.utime(path_b, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with patch("catalog.describe", wraps=catalog.describe) as describe:
+            banks = catalog.refresh()
+        self.assertEqual(describe.call_count, 1)
+        self.assertEqual(banks["a"]["questions"], 5)
+
+    def test_removed_and_invalid_files(self):
+        """Les fichiers supprimés disparaissent, les fichiers invalides sont signalés"""
+        self.write_quiz("a", make_quiz(3))
+        catalog.refresh()
+        quiz_data.quiz_path("a").unlink()
+        quiz_data.quiz_path("b").write_bytes(b"{pas du json")
+        banks = catalog.refresh()
+        self.assertEqual(list(banks), ["b"])
+        self.assertIn("error", banks["b"])
+
+    def test_catalog_mode(self):
+        """Le catalogue suit le umask d'open(), puis garde ses droits"""
+        self.write_quiz("a", make_quiz(3))
+        umask = os.umask(0o022)
+        os.umask(umask)
+        catalog.refresh()
+        path = catalog.catalog_path()
+        self.assertEqual(path.stat().st_mode & 0o777, 0o666 & ~umask)
+        path.chmod(0o640)
+        self.write_quiz("b", make_quiz(3))
+        catalog.refresh()
+        self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,8 @@ Tests unitaires pour le module crypto.
 Lance les tests avec : python3 -m unittest test_crypto
 """
 
+import io
+import json
 import unittest
 import crypto
 
@@ -43,6 +45,42 @@ class TestXorBytes(unittest.TestCase):
         self.assertEqual(data, decrypted)
 
 
+class TestXorBackends(unittest.TestCase):
+    """Tests pour les backends XOR et le traitement par blocs"""
+
+    def tearDown(self):
+        crypto.set_backend("translate")
+
+    def test_backends_identical(self):
+        """Tous les backends doivent produire le même résultat"""
+        data = bytes(range(256)) * 3
+        expected = bytes(b ^ crypto.XOR_KEY for b in data)
+        for name in crypto.BACKENDS:
+            with self.subTest(backend=name):
+                crypto.set_backend(name)
+                self.assertEqual(crypto.xor_bytes(data), expected)
+                self.assertEqual(crypto.xor_bytes(b""), b"")
+
+    def test_unknown_backend(self):
+        """Un backend inconnu doit lever ValueError"""
+        with self.assertRaises(ValueError):
+            crypto.set_backend("inconnu")
+
+    def test_memoryview_chunked(self):
+        """Un memoryview plus grand qu'un bloc est traité par morceaux"""
+        data = bytes(range(256)) * (crypto.CHUNK_SIZE // 256 + 7)
+        result = crypto.xor_bytes(memoryview(data))
+        self.assertIsInstance(result, bytes)
+        self.assertEqual(result, crypto.xor_bytes(data))
+        self.assertEqual(crypto.xor_bytes(result), data)
+
+    def test_xor_chunks(self):
+        """xor_chunks sur des morceaux équivaut à xor_bytes sur le tout"""
+        data = "Élève à l'école".encode("utf-8") * 100
+        chunks = crypto.iter_chunks(data, chunk_size=7)
+        self.assertEqual(b"".join(crypto.xor_chunks(chunks)), crypto.xor_bytes(data))
+
+
 class TestIsEncrypted(unittest.TestCase):
     """Tests pour la fonction is_encrypted()"""
 
@@ -218,6 +256,71 @@ class TestSaveJson(unittest.TestCase):
         self.assertEqual(result, data)
 
 
+class TestStreamJson(unittest.TestCase):
+    """Tests pour stream_json() (lecture incrémentale)"""
+
+    QUIZ = {
+        "quiz_title": "Quiz Français",
+        "questions": [
+            {"id": i, "question": f"Q{i} é", "choices": ["a", "b\nc"], "answer_index": 1}
+            for i in range(1, 40)
+        ],
+        "language": "fr",
+        "version": 12345,
+    }
+
+    def events(self, raw, chunk_size):
+        return list(crypto.stream_json(io.BytesIO(raw), chunk_size=chunk_size))
+
+    def test_stream_matches_load(self):
+        """Les événements reconstituent le document, quelle que soit la taille des blocs"""
+        for encrypt in (True, False):
+            raw = crypto.save_json(self.QUIZ, encrypt=encrypt)
+            for chunk_size in (1, 2, 5, 64, 4096):
+                with self.subTest(encrypt=encrypt, chunk_size=chunk_size):
+                    events = self.events(raw, chunk_size)
+                    items = [v for k, v in events if k == "questions.item"]
+                    header = {k: v for k, v in events if k != "questions.item"}
+                    self.assertEqual(items, self.QUIZ["questions"])
+                    self.assertEqual(header, {**self.QUIZ, "questions": []})
+
+    def test_stream_compressed(self):
+        """Un fichier compressé (clair ou chiffré) est lu en flux"""
+        for encrypt in (True, False):
+            raw = crypto.compress(crypto.save_json(self.QUIZ, encrypt=encrypt))
+            self.assertTrue(crypto.is_compressed(raw))
+            self.assertEqual(crypto.load_json(raw), self.QUIZ)
+            for chunk_size in (1, 5, 4096):
+                with self.subTest(encrypt=encrypt, chunk_size=chunk_size):
+                    events = self.events(raw, chunk_size)
+                    items = [v for k, v in events if k == "questions.item"]
+                    self.assertEqual(items, self.QUIZ["questions"])
+
+    def test_stream_compressed_truncated_raises(self):
+        """Des données compressées tronquées doivent lever JSONDecodeError"""
+        raw = crypto.compress(crypto.encrypt_json(self.QUIZ))
+        with self.assertRaises(json.JSONDecodeError):
+            crypto.load_json(raw[:-20])
+        with self.assertRaises(json.JSONDecodeError):
+            self.events(raw[:-20], 16)
+
+    def test_stream_empty_array(self):
+        """Un tableau vide est signalé sans élément"""
+        events = self.events(b'{"questions": []}', 4)
+        self.assertEqual(events, [("questions", [])])
+
+    def test_stream_non_array_value(self):
+        """Une valeur non tableau est retournée telle quelle"""
+        events = self.events(b'{"questions": 3}', 4)
+        self.assertEqual(events, [("questions", 3)])
+
+    def test_stream_truncated_raises(self):
+        """Un fichier tronqué doit lever JSONDecodeError"""
+        raw = crypto.encrypt_json(self.QUIZ)[:-20]
+        with self.assertRaises(json.JSONDecodeError):
+            self.events(raw, 16)
+
+
 class TestRealWorldScenarios(unittest.TestCase):
     """Tests de scénarios réels d'utilisation"""
 
@@ -10,6 +10,7 @@ from unittest.mock import patch, MagicMock
 import main
 import quiz_data
 import resultats_data
+from quiz_data import Question
 
 
 class TestKeyboardInterrupt(unittest.TestCase):
@@ -23,47 +24,16 @@ class TestKeyboardInterrupt(unittest.TestCase):
             "quiz_name": "test",
             "nombre_questions": 3,
             "questions": [
-                {
-                    "question_id": 1,
-                    "question": "Question 1",
-                    "liste_choix": [
-                        {"choix": "A", "correct": True},
-                        {"choix": "B", "correct": False},
-                    ],
-                },
-                {
-                    "question_id": 2,
-                    "question": "Question 2",
-                    "liste_choix": [
-                        {"choix": "A", "correct": False},
-                        {"choix": "B", "correct": True},
-                    ],
-                },
-                {
-                    "question_id": 3,
-                    "question": "Question 3",
-                    "liste_choix": [
-                        {"choix": "A", "correct": True},
-                        {"choix": "B", "correct": False},
-                    ],
-                },
+                Question(1, "Question 1", ("A", "B"), 0),
+                Question(2, "Question 2", ("A", "B"), 1),
+                Question(3, "Question 3", ("A", "B"), 0),
             ],
         }
 
         # Créer les résultats initiaux
-        self.resultats = {
-            "quiz_name": "test",
-            "nom": "Doe",
-            "prenom": "John",
-            "correct_count": 0,
-            "questions": [
-                {"question_id": 1, "correct": False},
-                {"question_id": 2, "correct": False},
-                {"question_id": 3, "correct": False},
-            ],
-        }
+        self.resultats = resultats_data.create("test", [1, 2, 3], "John", "Doe")
 
-    @patch("main.random.sample")
+    @patch("session.random.sample")
     @patch("main.ui.form_question")
     @patch("main.quiz_data.read_question")
     @patch("main.resultats_data.questions_a_poser")
@@ -82,7 +52,7 @@ class TestKeyboardInterrupt(unittest.TestCase):
 
         # Simuler la lecture des questions
         mock_read_question.side_effect = lambda q_id, quiz: next(
-            q for q in self.quiz["questions"] if q["question_id"] == q_id
+            q for q in self.quiz["questions"] if q.question_id == q_id
         )
 
         # Simuler les réponses de l'utilisateur:
@@ -0,0 +1,193 @@
+"""
+Tests unitaires pour le module locking, dont un test de charge multi-processus.
+
+Lance les tests avec : python3 -m unittest test_locking
+"""
+
+import multiprocessing
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import config
+import locking
+import resultats_data
+
+# Le test de charge suppose que les processus fils héritent de config.data_path
+_FORK = multiprocessing.get_context("fork")
+
+WORKERS = 8
+ROUNDS = 25
+
+
+def _hold(path, shared, ready, done):
+    """Tient un verrou dans un autre processus jusqu'à `done`."""
+    with locking.FileLock(path, shared=shared):
+        ready.set()
+        done.wait(10)
+
+
+def _hold_session(name, ready, done):
+    session = resultats_data.lock_session(name)
+    ready.set()
+    done.wait(10)
+    session.release()
+
+
+def _answer_many(name):
+    """Cycle lecture-modification-écriture répété sous verrou exclusif."""
+    for _ in range(ROUNDS):
+        with resultats_data.lock(name):
+            resultats = resultats_data.load(name)
+            resultats.marquer_correct(resultats.non_correctes()[0])
+            resultats_data.save(resultats, name)
+
+
+class LockTestCase(unittest.TestCase):
+    """Répertoire de données temporaire"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.data_path = Path(self.tmp.name)
+        (self.data_path / config.RESULT_PATH).mkdir()
+        patcher = patch.object(config, "data_path", self.data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = self.data_path / "test.lock"
+
+    def in_other_process(self, target, *args):
+        """Lance `target` dans un processus fils et attend qu'il soit prêt."""
+        ready, done = _FORK.Event(), _FORK.Event()
+        process = _FORK.Process(target=target, args=(*args, ready, done))
+        process.start()
+        self.addCleanup(process.join)
+        self.addCleanup(done.set)
+        self.assertTrue(ready.wait(10))
+
+
+class TestFileLock(LockTestCase):
+    """Tests pour FileLock"""
+
+    def test_shared_locks_coexist(self):
+        """Deux verrous partagés de processus différents coexistent"""
+        self.in_other_process(_hold, self.path, True)
+        with locking.FileLock(self.path, shared=True, timeout=0):
+            pass
+
+    def test_exclusive_timeout(self):
+        """Un verrou exclusif tenu ailleurs fait expirer l'attente"""
+        self.in_other_process(_hold, self.path, False)
+        debut = time.monotonic()
+        with self.assertRaises(locking.LockTimeout) as context:
+            locking.FileLock(self.path, shared=True, timeout=0.1).acquire()
+        self.assertLess(time.monotonic() - debut, 1)
+        self.assertIsNotNone(context.exception.holder)
+
+    def test_reentrant(self):
+        """Un processus peut reprendre un verrou qu'il tient déjà"""
+        with locking.FileLock(self.path):
+            with locking.FileLock(self.path, shared=True, timeout=0):
+                pass
+            with locking.FileLock(self.path, timeout=0):
+                pass
+        with self.assertRaises(RuntimeError):
+            with locking.FileLock(self.path, shared=True):
+                locking.FileLock(self.path).acquire()
+
+    def test_dead_writer_not_recovered(self):
+        """Un pid inscrit mort ne libère pas un verrou tenu par un lecteur"""
+        dead = _FORK.Process(target=int)
+        dead.start()
+        dead.join()
+        # Écrivain arrêté sans rendre son verrou : son pid reste inscrit
+        self.path.write_text(f"{dead.pid}@{socket.gethostname()}", encoding="utf-8")
+        inode = self.path.stat().st_ino
+        self.in_other_process(_hold, self.path, True)
+        with self.assertRaises(locking.LockTimeout) as context:
+            locking.FileLock(self.path, timeout=0.05).acquire()
+        self.assertEqual(context.exception.holder, f"{dead.pid}@{socket.gethostname()}")
+        self.assertIn("lecteur", str(context.exception))
+        self.assertEqual(self.path.stat().st_ino, inode)
+
+    def test_threads_exclude_each_other(self):
+        """Deux threads d'un même processus s'excluent sur un même fichier"""
+        erreurs = []
+
+        def prendre():
+            try:
+                locking.FileLock(self.path, timeout=0.05).acquire()
+            except locking.LockTimeout as exc:
+                erreurs.append(exc)
+
+        with locking.FileLock(self.path):
+            thread = threading.Thread(target=prendre)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(erreurs), 1)
+
+    def test_waiting_does_not_block_other_files(self):
+        """L'attente d'un verrou ne bloque pas les verrous d'autres fichiers"""
+        self.in_other_process(_hold, self.path, False)
+        attente = threading.Thread(
+            target=self.assertRaises,
+            args=(locking.LockTimeout, locking.FileLock(self.path, timeout=1).acquire),
+        )
+        attente.start()
+        self.addCleanup(attente.join)
+        time.sleep(0.05)
+        debut = time.monotonic()
+        with locking.FileLock(self.data_path / "autre.lock", timeout=0):
+            pass
+        self.assertLess(time.monotonic() - debut, 0.5)
+
+    def test_release_from_other_thread(self):
+        """Un verrou pris par un thread peut être rendu par un autre"""
+        verrou = locking.FileLock(self.path)
+        thread = threading.Thread(target=verrou.acquire)
+        thread.start()
+        thread.join()
+        verrou.release()
+        with locking.FileLock(self.path, timeout=0):
+            pass
+
+    def test_latency(self):
+        """Prendre et rendre un verrou coûte bien moins qu'une sauvegarde"""
+        debut = time.perf_counter()
+        for _ in range(1000):
+            with locking.FileLock(self.path):
+                pass
+        self.assertLess((time.perf_counter() - debut) / 1000, 0.002)
+
+
+class TestResultsLocking(LockTestCase):
+    """Verrouillage des fichiers de résultats"""
+
+    def test_second_session_refused(self):
+        """Une deuxième session sur le même fichier est refusée"""
+        self.in_other_process(_hold_session, "alice")
+        with self.assertRaises(resultats_data.QuizResultatError):
+            resultats_data.lock_session("alice")
+        resultats_data.lock_session("bob").release()
+
+    def test_concurrent_writers(self):
+        """Des écrivains concurrents ne perdent aucune mise à jour"""
+        total = WORKERS * ROUNDS
+        resultats = resultats_data.create("quiz", list(range(total)), "A", "B")
+        resultats_data.save(resultats, "stress")
+        processes = [
+            _FORK.Process(target=_answer_many, args=("stress",)) for _ in range(WORKERS)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        self.assertEqual(resultats_data.load("stress").correct_count, total)
+
+
+if __name__ == "__main__":
+    unittest.main()
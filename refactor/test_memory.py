@@ -0,0 +1,140 @@
+"""
+Tests de non-régression mémoire (tracemalloc).
+
+Les seuils laissent une marge d'environ 25 % au-dessus des mesures faites
+sur des banques synthétiques (voir benchmarks.generateur) : les dépasser
+signale une copie ou une structure de trop dans le chargement.
+
+Lance les tests avec : python3 -m unittest test_memory
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import cache
+import config
+import quiz_data
+import resultats_data
+import timings
+from benchmarks import generateur
+
+QUESTIONS = 5000
+
+# Mémoire conservée par un quiz chargé en entier, rapportée au fichier JSON
+FULL_LOAD_RATIO = 5
+
+# Pic du chargement d'un quiz converti en conteneur, quelle que soit sa taille
+LAZY_LOAD_PEAK = 64 * 1024
+
+# Résultats d'un élève : mémoire conservée et pic, par question suivie
+RESULTATS_BYTES = 128
+RESULTATS_PEAK_BYTES = 448
+
+
+def traced(action):
+    """Exécute `action` sous tracemalloc ; retourne (mémoire conservée, pic)."""
+    tracemalloc.start()
+    try:
+        resultat = action()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultat
+    return current, peak
+
+
+class TestMemory(unittest.TestCase):
+    """Seuils mémoire du chargement des quiz et des résultats"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp.cleanup)
+        self.data_path = Path(tmp.name)
+        for name, value in (("data_path", self.data_path), ("cache_max_bytes", 0)):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.nom = generateur.banque(self.data_path, QUESTIONS)
+        self.path = quiz_data.quiz_path(self.nom)
+
+    def test_full_load(self):
+        """Le chargement complet reste sous son estimation et son seuil"""
+        with patch.object(config, "memory_budget", 0):
+            current, peak = traced(lambda: quiz_data.load(self.nom))
+        self.assertLess(peak, quiz_data.estimate_memory(self.path))
+        self.assertLess(current, FULL_LOAD_RATIO * self.path.stat().st_size)
+
+    def test_budget_switches_to_lazy_load(self):
+        """Au-delà du budget, le quiz est lu à la demande au lieu d'être chargé"""
+        with patch.object(config, "memory_budget", 1024 * 1024):
+            quiz = quiz_data.load(self.nom)
+            self.addCleanup(quiz["container"].close)
+            self.assertEqual(quiz["nombre_questions"], QUESTIONS)
+            self.assertEqual(quiz_data.read_question(42, quiz).question_id, 42)
+
+            # Conteneur déjà converti : pic indépendant de la taille du quiz
+            _, peak = traced(lambda: quiz_data.load(self.nom)["container"].close())
+        self.assertLess(peak, LAZY_LOAD_PEAK)
+
+    def test_lazy_load_follows_source(self):
+        """Le conteneur est reconverti quand le fichier source change"""
+        with patch.object(config, "memory_budget", 1):
+            quiz_data.load(self.nom)["container"].close()
+            generateur.write_quiz(self.path, 10, titre="Modifié")
+            stat = self.path.stat()
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            quiz = quiz_data.load(self.nom)
+            self.addCleanup(quiz["container"].close)
+        self.assertEqual(quiz["quiz_title"], "Modifié")
+        self.assertEqual(quiz["nombre_questions"], 10)
+
+    def test_lazy_load_uses_cache_limits(self):
+        """Les conteneurs des gros quiz sont des entrées du cache comme les autres"""
+        autre = generateur.banque(self.data_path, 10)
+        with patch.object(config, "memory_budget", 1):
+            for nom in (self.nom, autre):
+                quiz_data.load(nom)["container"].close()
+        # Cache désactivé : seule la dernière entrée est conservée
+        entrees = {path.stem for path in cache.cache_dir().iterdir()}
+        self.assertEqual(
+            entrees, {cache.derived_path(quiz_data.quiz_path(autre), "").stem}
+        )
+
+    def test_resultats_load(self):
+        """Les résultats d'un élève restent compacts"""
+        current, peak = traced(lambda: resultats_data.load(self.nom))
+        self.assertLess(current, RESULTATS_BYTES * QUESTIONS)
+        self.assertLess(peak, RESULTATS_PEAK_BYTES * QUESTIONS)
+
+
+class TestMemoryReport(unittest.TestCase):
+    """Tests du rapport mémoire de timings"""
+
+    def tearDown(self):
+        timings.reset()
+
+    def test_stage_allocations(self):
+        """Chaque étape rapporte sa mémoire conservée et son pic"""
+        timings.enable(memory=True)
+        with timings.timer("englobante"):
+            with timings.timer("temporaire"):
+                tampon = bytearray(1 << 20)
+                del tampon
+            conserve = bytearray(1 << 19)
+        rapport = timings.report()
+        temporaire = rapport["etapes"]["temporaire"]
+        englobante = rapport["etapes"]["englobante"]
+        self.assertGreaterEqual(temporaire["pic_kio"], 1024)
+        self.assertLess(temporaire["alloue_kio"], 64)
+        # Le pic de l'étape imbriquée compte aussi pour l'englobante
+        self.assertGreaterEqual(englobante["pic_kio"], 1024)
+        self.assertGreaterEqual(englobante["alloue_kio"], 512)
+        self.assertGreaterEqual(rapport["memoire"]["pic_kio"], 1024)
+        del conserve
+
+
+if __name__ == "__main__":
+    unittest.main()
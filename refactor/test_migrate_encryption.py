@@ -0,0 +1,144 @@
+"""
+Tests unitaires pour l'outil de migration entre formats.
+
+Lance les tests avec : python3 -m unittest test_migrate_encryption
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import config
+import crypto
+import migrate_encryption
+import quiz_data
+
+QUIZ = {
+    "quiz_title": "Quiz de test",
+    "language": "fr",
+    "questions": [
+        {
+            "id": i,
+            "question": f"Question n°{i} : que vaut l'expression ?",
+            "choices": ["True", "False", "for x in l:\n    print(x)", "Élève"],
+            "answer_index": i % 4,
+        }
+        for i in range(1, 21)
+    ],
+}
+
+
+class TestMigration(unittest.TestCase):
+    """Tests de la migration d'un dossier de quiz"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp.cleanup)
+        self.data_path = Path(tmp.name)
+        self.directory = self.data_path / config.QUIZ_PATH
+        self.directory.mkdir()
+        self.path = self.directory / "test.json"
+        self.path.write_bytes(crypto.save_json(QUIZ, encrypt=False))
+        patcher = patch.object(config, "data_path", self.data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def migrate(self, target, **kwargs):
+        """Migre le dossier sans affichage ; retourne les compteurs."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            return migrate_encryption.migrate_directory(
+                self.directory, "Quiz", target, jobs=1, **kwargs
+            )
+
+    def test_formats_round_trip(self):
+        """Chaque format se relit à l'identique, jusqu'au retour en clair"""
+        for target in ("xor", "gzip", "container", "gzip", "plain"):
+            with self.subTest(target=target):
+                self.assertEqual(self.migrate(target)[migrate_encryption.CONVERTI], 1)
+                with open(self.path, "rb") as f:
+                    head = f.read(4)
+                self.assertEqual(migrate_encryption.detect_format(head), target)
+                quiz = quiz_data.load("test")
+                self.assertEqual(quiz["quiz_title"], "Quiz de test")
+                self.assertEqual(quiz_data.read_question(7, quiz).answer_index, 3)
+                if "container" in quiz:
+                    quiz["container"].close()
+        self.assertEqual(self.path.read_bytes(), crypto.save_json(QUIZ, encrypt=False))
+
+    def test_xor_matches_save_json(self):
+        """La conversion en flux produit les mêmes octets que crypto.save_json"""
+        self.migrate("xor")
+        self.assertEqual(self.path.read_bytes(), crypto.save_json(QUIZ, encrypt=True))
+
+    def test_manifest_skips_unchanged_files(self):
+        """Un fichier inchangé depuis le manifeste n'est pas relu"""
+        self.migrate("xor")
+        with patch.object(
+            migrate_encryption, "migrate_file", side_effect=AssertionError
+        ):
+            counts = self.migrate("xor")
+        self.assertEqual(counts[migrate_encryption.INCHANGE], 1)
+
+    def test_manifest_touched_file(self):
+        """Si seule la date a changé, l'empreinte évite la conversion"""
+        self.migrate("xor")
+        contenu = self.path.read_bytes()
+        info = self.path.stat()
+        os.utime(self.path, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+        counts = self.migrate("xor")
+        self.assertEqual(counts[migrate_encryption.A_JOUR], 1)
+        self.assertEqual(self.path.read_bytes(), contenu)
+        self.assertEqual(self.migrate("xor")[migrate_encryption.INCHANGE], 1)
+
+    def test_malformed_manifest_entries(self):
+        """Une entrée malformée du manifeste vaut « non migré »"""
+        self.migrate("xor")
+        manifest = self.directory / migrate_encryption.MANIFEST
+        for entry in ([], {"format": "xor"}, {"size": "1", "mtime_ns": 0}):
+            with self.subTest(entry=entry):
+                manifest.write_text(json.dumps({"test.json": entry}))
+                counts = self.migrate("xor")
+                self.assertEqual(counts[migrate_encryption.A_JOUR], 1)
+
+    def test_dry_run(self):
+        """La simulation n'écrit ni fichier ni manifeste"""
+        contenu = self.path.read_bytes()
+        counts = self.migrate("gzip", dry_run=True)
+        self.assertEqual(counts[migrate_encryption.A_CONVERTIR], 1)
+        self.assertEqual(self.path.read_bytes(), contenu)
+        self.assertFalse((self.directory / migrate_encryption.MANIFEST).exists())
+
+    def test_error_leaves_file_intact(self):
+        """Un fichier invalide est signalé et laissé tel quel, sans temporaire"""
+        invalide = self.directory / "invalide.json"
+        invalide.write_bytes(b'{"quiz_title": "T", "questions": [')
+        counts = self.migrate("xor")
+        self.assertEqual(counts[migrate_encryption.ERREUR], 1)
+        self.assertEqual(invalide.read_bytes(), b'{"quiz_title": "T", "questions": [')
+        self.assertEqual(list(self.directory.glob("*.tmp")), [])
+
+    def test_preserves_permissions(self):
+        """Le fichier converti garde ses droits d'accès"""
+        self.path.chmod(0o644)
+        self.migrate("xor")
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o644)
+
+    def test_process_pool(self):
+        """Plusieurs fichiers sont convertis par le pool de processus"""
+        for i in range(3):
+            (self.directory / f"copie{i}.json").write_bytes(self.path.read_bytes())
+        with contextlib.redirect_stdout(io.StringIO()):
+            counts = migrate_encryption.migrate_directory(
+                self.directory, "Quiz", "gzip", jobs=2
+            )
+        self.assertEqual(counts[migrate_encryption.CONVERTI], 4)
+        for path in self.directory.glob("*.json"):
+            self.assertEqual(crypto.load_json(path.read_bytes()), QUIZ)
+
+
+if __name__ == "__main__":
+    unittest.main()
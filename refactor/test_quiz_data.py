@@ -0,0 +1,374 @@
+"""
+Tests unitaires pour le module quiz_data.
+
+Lance les tests avec : python3 -m unittest test_quiz_data
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import cache
+import config
+import container
+import crypto
+import quiz_data
+
+
+def make_quiz(count: int = 3) -> dict:
+    """Construit un quiz au format fichier avec `count` questions."""
+    return {
+        "quiz_title": "Quiz de test",
+        "language": "fr",
+        "questions": [
+            {
+                "id": i,
+                "question": f"Question {i} ?",
+                "choices": ["Réponse A", "Réponse B", "print(1)\nprint(2)"],
+                "answer_index": i % 3,
+            }
+            for i in range(1, count + 1)
+        ],
+    }
+
+
+class QuizDirTestCase(unittest.TestCase):
+    """Crée un répertoire de données temporaire utilisé par config.data_path"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        data_path = Path(self.tmp.name)
+        (data_path / config.QUIZ_PATH).mkdir()
+        (data_path / config.RESULT_PATH).mkdir()
+        patcher = patch.object(config, "data_path", data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_quiz(self, name: str, data: dict, encrypt: bool = True) -> Path:
+        """Écrit un fichier de quiz dans le répertoire temporaire."""
+        path = quiz_data.quiz_path(name)
+        path.write_bytes(crypto.save_json(data, encrypt=encrypt))
+        return path
+
+
+class TestLoad(QuizDirTestCase):
+    """Tests pour load()"""
+
+    def test_load_encrypted_and_plain(self):
+        """Un quiz chiffré ou clair est transformé au format interne"""
+        for encrypt in (True, False):
+            with self.subTest(encrypt=encrypt):
+                self.write_quiz("test", make_quiz(), encrypt=encrypt)
+                quiz = quiz_data.load("test")
+                self.assertEqual(quiz["quiz_title"], "Quiz de test")
+                self.assertEqual(quiz["nombre_questions"], 3)
+                self.assertEqual(quiz_data.liste_questions(quiz), [1, 2, 3])
+                question = quiz_data.read_question(2, quiz)
+                self.assertEqual(question.question, "Question 2 ?")
+                self.assertEqual(question.choices[2], "print(1)\nprint(2)")
+                self.assertTrue(question.is_correct(2))
+
+    def test_missing_file(self):
+        """Un fichier absent lève QuizFileError"""
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.load("absent")
+
+    def test_invalid_question(self):
+        """Une question invalide lève QuizFileError avec sa position au chargement"""
+        data = make_quiz()
+        data["questions"][1]["answer_index"] = 7
+        self.write_quiz("test", data)
+        for max_bytes in (config.cache_max_bytes, 0):
+            with self.subTest(cache_max_bytes=max_bytes), patch.object(
+                config, "cache_max_bytes", max_bytes
+            ):
+                with self.assertRaisesRegex(quiz_data.QuizFileError, "question 2"):
+                    quiz_data.load("test")
+        with self.assertRaisesRegex(quiz_data.QuizFileError, "question 2"):
+            list(quiz_data.iter_questions("test"))
+        self.assertEqual(list(cache.cache_dir().glob("*.qzix")), [])
+
+    def test_invalid_id_rejected_at_load(self):
+        """Les ids sont validés dès le chargement"""
+        data = make_quiz()
+        data["questions"][2]["id"] = "3"
+        self.write_quiz("test", data)
+        with self.assertRaisesRegex(quiz_data.QuizFileError, "question 3"):
+            quiz_data.load("test")
+
+    def test_questions_built_lazily(self):
+        """Les questions ne sont construites qu'au premier accès, puis conservées"""
+        self.write_quiz("test", make_quiz(100))
+        with patch(
+            "quiz_data._transform_question", wraps=quiz_data._transform_question
+        ) as transform:
+            quiz = quiz_data.load("test")
+            self.assertEqual(transform.call_count, 0)
+            first = quiz_data.read_question(42, quiz)
+            self.assertIs(quiz_data.read_question(42, quiz), first)
+            self.assertEqual(transform.call_count, 1)
+
+    def test_missing_title(self):
+        """Un quiz sans titre lève QuizFileError"""
+        data = make_quiz()
+        del data["quiz_title"]
+        self.write_quiz("test", data)
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.load("test")
+
+    def test_iter_questions(self):
+        """iter_questions produit les questions dans l'ordre du fichier"""
+        self.write_quiz("test", make_quiz(5))
+        ids = [q.question_id for q in quiz_data.iter_questions("test")]
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+
+
+class TestIndex(QuizDirTestCase):
+    """Tests pour l'index id -> position"""
+
+    def test_dense_ids_use_range(self):
+        """Des ids contigus donnent un index range"""
+        self.write_quiz("test", make_quiz(10))
+        quiz = quiz_data.load("test")
+        self.assertIsInstance(quiz["index"], range)
+        self.assertEqual(quiz_data.read_question(7, quiz).question_id, 7)
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.read_question(11, quiz)
+
+    def test_sparse_ids_use_dict(self):
+        """Des ids non contigus donnent un index dict"""
+        data = make_quiz(4)
+        for question, question_id in zip(data["questions"], (40, 3, 17, 8)):
+            question["id"] = question_id
+        self.write_quiz("test", data)
+        quiz = quiz_data.load("test")
+        self.assertIsInstance(quiz["index"], dict)
+        self.assertEqual(quiz_data.liste_questions(quiz), [40, 3, 17, 8])
+        self.assertEqual(quiz_data.read_question(17, quiz).question_id, 17)
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.read_question(4, quiz)
+
+    def test_duplicate_ids_rejected(self):
+        """Un id dupliqué est refusé au chargement"""
+        data = make_quiz(4)
+        data["questions"][3]["id"] = 2
+        self.write_quiz("test", data)
+        with self.assertRaisesRegex(quiz_data.QuizFileError, "question 4 - id 2"):
+            quiz_data.load("test")
+
+    def test_quiz_without_index(self):
+        """Un quiz construit à la main est indexé au premier accès"""
+        questions = [
+            quiz_data.Question(5, "Q5", ("a", "b"), 0),
+            quiz_data.Question(9, "Q9", ("a", "b"), 1),
+        ]
+        quiz = {"questions": questions}
+        self.assertIs(quiz_data.read_question(9, quiz), questions[1])
+        self.assertEqual(quiz["index"], {5: 0, 9: 1})
+
+
+class TestCompileCache(QuizDirTestCase):
+    """Tests pour le cache des quiz compilés"""
+
+    def test_second_load_skips_parsing(self):
+        """Le second chargement ne relit pas le JSON ni ne revalide les questions"""
+        self.write_quiz("test", make_quiz())
+        first = quiz_data.load("test")
+        with patch("quiz_data.crypto.stream_json", side_effect=AssertionError), patch(
+            "quiz_data.validator.check_question", side_effect=AssertionError
+        ):
+            second = quiz_data.load("test")
+            self.assertEqual(list(second["questions"]), list(first["questions"]))
+        self.assertEqual(second["quiz_title"], first["quiz_title"])
+
+    def test_modified_file_invalidates(self):
+        """Une modification du fichier source invalide l'entrée"""
+        self.write_quiz("test", make_quiz(3))
+        quiz_data.load("test")
+        self.write_quiz("test", make_quiz(4))
+        self.assertEqual(quiz_data.load("test")["nombre_questions"], 4)
+
+    def test_touched_file_reuses_entry(self):
+        """Un fichier dont seule la date change garde son entrée (empreinte)"""
+        path = self.write_quiz("test", make_quiz())
+        quiz_data.load("test")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with patch("quiz_data.crypto.stream_json", side_effect=AssertionError):
+            quiz_data.load("test")
+        # La nouvelle date est enregistrée : le fichier n'est plus haché
+        with patch("cache._digest", side_effect=AssertionError):
+            quiz_data.load("test")
+
+    def test_foreign_entry_ignored(self):
+        """Une entrée modifiable par d'autres utilisateurs n'est pas relue"""
+        self.write_quiz("test", make_quiz())
+        quiz_data.load("test")
+        for entry in cache.cache_dir().iterdir():
+            entry.chmod(0o666)
+        with patch("quiz_data.crypto.stream_json", wraps=crypto.stream_json) as parse:
+            self.assertEqual(quiz_data.load("test")["nombre_questions"], 3)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_corrupt_entry_ignored(self):
+        """Une entrée corrompue est ignorée"""
+        self.write_quiz("test", make_quiz())
+        quiz_data.load("test")
+        for entry in cache.cache_dir().iterdir():
+            entry.write_bytes(b"corrompu")
+        self.assertEqual(quiz_data.load("test")["nombre_questions"], 3)
+
+    def test_evicted_entry_recompiled(self):
+        """Une entrée évincée entre lookup() et son ouverture est recompilée"""
+        self.write_quiz("test", make_quiz())
+        quiz_data.load("test")
+        lookup = cache.lookup
+
+        def lookup_then_evict(*args, **kwargs):
+            entry = lookup(*args, **kwargs)
+            entry.unlink()
+            return entry
+
+        with patch.object(cache, "lookup", side_effect=lookup_then_evict):
+            self.assertEqual(quiz_data.load("test")["nombre_questions"], 3)
+
+    def test_lru_eviction(self):
+        """Au-delà de la taille maximale, les entrées les plus anciennes partent"""
+        for name in ("a", "b", "c"):
+            self.write_quiz(name, make_quiz(20))
+            quiz_data.load(name)
+        entries = sorted(cache.cache_dir().glob("*.qzix"), key=os.path.getmtime)
+        size = sum(
+            p.stat().st_size for p in cache.cache_dir().glob(entries[0].stem + ".*")
+        )
+        with patch.object(config, "cache_max_bytes", 2 * size + size // 2):
+            self.write_quiz("d", make_quiz(20))
+            quiz_data.load("d")
+        remaining = {p.stem for p in cache.cache_dir().iterdir()}
+        self.assertEqual(len(remaining), 2)
+        self.assertNotIn(entries[0].stem, remaining)
+
+
+class TestContainer(QuizDirTestCase):
+    """Tests pour le format conteneur indexé"""
+
+    def setUp(self):
+        super().setUp()
+        source = self.write_quiz("source", make_quiz(50))
+        container.convert(source, quiz_data.quiz_path("test"))
+
+    def test_load_detects_container(self):
+        """load() ouvre un conteneur sans décoder les questions"""
+        quiz = quiz_data.load("test")
+        self.addCleanup(quiz["container"].close)
+        self.assertEqual(quiz["quiz_title"], "Quiz de test")
+        self.assertEqual(quiz["nombre_questions"], 50)
+        self.assertEqual(quiz_data.liste_questions(quiz), list(range(1, 51)))
+
+    def test_read_question(self):
+        """read_question() décode la question demandée"""
+        quiz = quiz_data.load("test")
+        self.addCleanup(quiz["container"].close)
+        legacy = quiz_data.read_question(42, quiz_data.load("source"))
+        self.assertEqual(quiz_data.read_question(42, quiz), legacy)
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.read_question(51, quiz)
+
+    def test_iter_questions(self):
+        """iter_questions() parcourt aussi un conteneur, puis le referme"""
+        with patch.object(
+            container.Container,
+            "close",
+            autospec=True,
+            side_effect=container.Container.close,
+        ) as close:
+            ids = [q.question_id for q in quiz_data.iter_questions("test")]
+            self.assertEqual(ids, list(range(1, 51)))
+            close.assert_called_once()
+            questions = quiz_data.iter_questions("test")
+            next(questions)
+            questions.close()
+            self.assertEqual(close.call_count, 2)
+
+    def test_duplicate_id_rejected(self):
+        """Un id dupliqué empêche l'écriture du conteneur"""
+        data = make_quiz(3)
+        data["questions"][2]["id"] = 1
+        with self.assertRaises(ValueError):
+            container.write(
+                quiz_data.quiz_path("dup"), {"quiz_title": "x"}, data["questions"]
+            )
+
+    def test_convert_keeps_source_order(self):
+        """convert() conserve l'ordre des ids du fichier source"""
+        data = make_quiz(5)
+        data["questions"].reverse()
+        source = self.write_quiz("inverse", data)
+        container.convert(source, quiz_data.quiz_path("inverse_indexe"))
+        quiz = quiz_data.load("inverse_indexe")
+        self.addCleanup(quiz["container"].close)
+        self.assertEqual(quiz_data.liste_questions(quiz), [5, 4, 3, 2, 1])
+
+    def test_truncated_container(self):
+        """Un conteneur tronqué lève QuizFileError"""
+        path = quiz_data.quiz_path("test")
+        path.write_bytes(path.read_bytes()[:-5])
+        with self.assertRaises(quiz_data.QuizFileError):
+            quiz_data.load("test")
+
+
+class TestLoadSample(QuizDirTestCase):
+    """Tests pour load_sample()"""
+
+    def setUp(self):
+        super().setUp()
+        source = self.write_quiz("source", make_quiz(200))
+        container.convert(source, quiz_data.quiz_path("indexed"))
+
+    def test_sample_size_and_ids(self):
+        """Le tirage contient `count` questions distinctes, lisibles par id"""
+        for name in ("source", "indexed"):
+            with self.subTest(name=name):
+                quiz = quiz_data.load_sample(name, 40, rng=random.Random(1))
+                ids = quiz_data.liste_questions(quiz)
+                self.assertEqual(quiz["nombre_questions"], 40)
+                self.assertEqual(len(set(ids)), 40)
+                self.assertTrue(set(ids) <= set(range(1, 201)))
+                for question_id in ids:
+                    question = quiz_data.read_question(question_id, quiz)
+                    self.assertEqual(question.question, f"Question {question_id} ?")
+
+    def test_id_range(self):
+        """Seules les questions de la plage d'ids sont tirées"""
+        for name in ("source", "indexed"):
+            with self.subTest(name=name):
+                quiz = quiz_data.load_sample(name, 10, (50, 59))
+                self.assertEqual(
+                    sorted(quiz_data.liste_questions(quiz)), list(range(50, 60))
+                )
+                quiz = quiz_data.load_sample(name, 10, (500, 600))
+                self.assertEqual(quiz["nombre_questions"], 0)
+
+    def test_count_larger_than_bank(self):
+        """Demander plus de questions que le quiz n'en contient les retourne toutes"""
+        quiz = quiz_data.load_sample("source", 1000)
+        self.assertEqual(sorted(quiz_data.liste_questions(quiz)), list(range(1, 201)))
+
+    def test_uniform(self):
+        """Chaque question a la même probabilité d'être tirée"""
+        rng = random.Random(7)
+        counts = [0] * 20
+        data = make_quiz(20)
+        items = data["questions"]
+        for _ in range(2000):
+            for question in quiz_data._reservoir(iter(items), 5, rng):
+                counts[question["id"] - 1] += 1
+        # Espérance : 2000 * 5 / 20 = 500 tirages par question
+        self.assertTrue(all(400 < count < 600 for count in counts), counts)
+
+
+if __name__ == "__main__":
+    unittest.main()
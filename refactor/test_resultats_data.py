@@ -0,0 +1,216 @@
+"""
+Tests unitaires pour le module resultats_data.
+
+Lance les tests avec : python3 -m unittest test_resultats_data
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import config
+import journal
+import resultats_data
+
+
+class TestResultats(unittest.TestCase):
+    """Tests pour le modèle Resultats"""
+
+    def setUp(self):
+        self.resultats = resultats_data.create("quiz", [10, 20, 30], "Ada", "Lovelace")
+
+    def test_marquer_correct(self):
+        """Le compteur suit les questions marquées, sans double comptage"""
+        self.resultats.marquer_correct(20)
+        self.resultats.marquer_correct(20)
+        self.resultats.marquer_correct(99)
+        self.assertEqual(self.resultats.correct_count, 1)
+        self.assertTrue(self.resultats.is_correct(20))
+        self.assertFalse(self.resultats.is_correct(10))
+
+    def test_valider_resultat_is_pure(self):
+        """valider_resultat() ne modifie pas les résultats reçus"""
+        nouveaux = resultats_data.valider_resultat(10, self.resultats)
+        self.assertEqual(nouveaux.correct_count, 1)
+        self.assertEqual(self.resultats.correct_count, 0)
+        self.assertFalse(self.resultats.is_correct(10))
+
+    def test_snapshot_copy_on_write(self):
+        """Un instantané reste figé quand l'original est modifié"""
+        instantane = self.resultats.snapshot()
+        self.resultats.marquer_correct(30)
+        self.assertFalse(instantane.is_correct(30))
+        self.assertEqual(instantane.correct_count, 0)
+        instantane.marquer_correct(10)
+        self.assertFalse(self.resultats.is_correct(10))
+
+    def test_questions_a_poser(self):
+        """Seules les questions non correctes restent à poser"""
+        self.resultats.marquer_correct(20)
+        self.assertEqual(
+            sorted(resultats_data.questions_a_poser(self.resultats)), [10, 30]
+        )
+        self.resultats.marquer_correct(10)
+        self.resultats.marquer_correct(30)
+        self.assertEqual(resultats_data.questions_a_poser(self.resultats), [])
+
+    def test_legacy_format(self):
+        """Le format fichier historique reste lisible et relisible"""
+        self.resultats.marquer_correct(30)
+        data = self.resultats.to_dict()
+        self.assertEqual(data["correct_count"], 1)
+        self.assertEqual(data["questions"][2], {"question_id": 30, "correct": True})
+        self.assertEqual(self.resultats["prenom"], "Ada")
+        self.assertEqual(resultats_data.Resultats.from_dict(data), data)
+
+    def test_from_dict_invalid(self):
+        """Une structure incorrecte lève QuizResultatError"""
+        with self.assertRaises(resultats_data.QuizResultatError):
+            resultats_data.Resultats.from_dict({"quiz_name": "quiz"})
+
+
+class TestSaveLoad(unittest.TestCase):
+    """Tests pour save() et load()"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        data_path = Path(self.tmp.name)
+        (data_path / config.RESULT_PATH).mkdir()
+        patcher = patch.object(config, "data_path", data_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        """Les résultats enregistrés sont relus à l'identique"""
+        resultats = resultats_data.create("quiz", [1, 2, 3], "Ada", "Lovelace")
+        resultats.marquer_correct(2)
+        resultats_data.save(resultats, "test")
+        relus = resultats_data.load("test")
+        self.assertEqual(relus.correct_count, 1)
+        self.assertEqual(relus.non_correctes(), [1, 3])
+        self.assertEqual(relus.to_dict(), resultats.to_dict())
+
+    def test_unreadable_file(self):
+        """Un fichier illisible ou mal encodé lève QuizResultatError"""
+        path = config.data_path / config.RESULT_PATH / "test.json"
+        for contenu in (b"{", b"\xff\xfe{", b'"texte"'):
+            with self.subTest(contenu=contenu):
+                path.write_bytes(contenu)
+                with self.assertRaises(resultats_data.QuizResultatError):
+                    resultats_data.load("test")
+
+    def test_file_mode(self):
+        """Un nouveau fichier suit le umask, un fichier existant garde ses droits"""
+        path = config.data_path / config.RESULT_PATH / "test.json"
+        resultats = resultats_data.create("quiz", [1], "Ada", "Lovelace")
+        umask = os.umask(0o022)
+        os.umask(umask)
+        resultats_data.save(resultats, "test")
+        self.assertEqual(path.stat().st_mode & 0o777, 0o666 & ~umask)
+        path.chmod(0o640)
+        resultats_data.save(resultats, "test")
+        self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+
+
+class TestJournal(TestSaveLoad):
+    """Tests pour le journal des réponses"""
+
+    def setUp(self):
+        super().setUp()
+        self.resultats = resultats_data.create("quiz", [1, 2, 3, 4], "Ada", "Lovelace")
+        resultats_data.save(self.resultats, "test")
+
+    def answer(self, journal_ouvert, question_id):
+        self.resultats.marquer_correct(question_id)
+        journal_ouvert.append(question_id)
+
+    def test_replay_on_load(self):
+        """Les réponses journalisées sont rejouées sans sauvegarde"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 2)
+            self.answer(journal_ouvert, 4)
+        relus = resultats_data.load("test")
+        self.assertEqual(relus.non_correctes(), [1, 3])
+
+    def test_torn_record_ignored(self):
+        """Un enregistrement incomplet en fin de journal est ignoré"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 2)
+        path = resultats_data.journal_path("test")
+        path.write_bytes(path.read_bytes() + journal.encode(3)[:5])
+        self.assertEqual(resultats_data.load("test").non_correctes(), [1, 3, 4])
+
+    def test_save_compacts(self):
+        """save() intègre le journal et le vide"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+            resultats_data.save(self.resultats, "test")
+            self.assertEqual(journal_ouvert.pending, 0)
+            self.answer(journal_ouvert, 3)
+            self.assertEqual(journal_ouvert.pending, 1)
+        self.assertEqual(resultats_data.load("test").non_correctes(), [2, 4])
+
+    def test_compact_keeps_later_records(self):
+        """compact() ne retire que les enregistrements antérieurs au repère"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+            self.answer(journal_ouvert, 2)
+            mark = journal_ouvert.mark()
+            instantane = self.resultats.snapshot()
+            self.answer(journal_ouvert, 3)
+            resultats_data.save_snapshot(instantane, "test")
+            journal_ouvert.compact(mark)
+            self.assertEqual(journal_ouvert.pending, 1)
+            # Un repère antérieur à une compaction est sans effet
+            journal_ouvert.compact(mark)
+            self.assertEqual(journal_ouvert.pending, 1)
+            self.answer(journal_ouvert, 4)
+        self.assertEqual(resultats_data.load("test").correct_count, 4)
+
+    def test_compact_keeps_mode(self):
+        """La compaction garde les droits du journal"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+            mark = journal_ouvert.mark()
+            self.answer(journal_ouvert, 2)
+            path = resultats_data.journal_path("test")
+            path.chmod(0o640)
+            journal_ouvert.compact(mark)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+        # Seul l'enregistrement postérieur au repère reste à rejouer
+        self.assertEqual(resultats_data.load("test").non_correctes(), [1, 3, 4])
+
+    def test_end_session_removes_files(self):
+        """Une session terminée ne laisse que son fichier de résultats"""
+        session = resultats_data.lock_session("test")
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+        resultats_data.save(self.resultats, "test")
+        resultats_data.end_session("test", session)
+        directory = config.data_path / config.RESULT_PATH
+        self.assertEqual([p.name for p in directory.iterdir()], ["test.json"])
+        # La réservation est rendue et le fichier réutilisable
+        resultats_data.lock_session("test").release()
+        self.assertEqual(resultats_data.load("test").non_correctes(), [2, 3, 4])
+
+    def test_end_session_keeps_pending_journal(self):
+        """Un journal non vide (sauvegarde finale manquée) est conservé"""
+        session = resultats_data.lock_session("test")
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+        resultats_data.end_session("test", session)
+        self.assertEqual(resultats_data.load("test").non_correctes(), [2, 3, 4])
+
+    def test_new_session_discards_journal(self):
+        """Une nouvelle session n'hérite pas du journal de la précédente"""
+        with resultats_data.open_journal("test") as journal_ouvert:
+            self.answer(journal_ouvert, 1)
+        nouveaux = resultats_data.create("quiz", [1, 2, 3, 4], "Ada", "Lovelace")
+        resultats_data.save(nouveaux, "test")
+        self.assertEqual(resultats_data.load("test").correct_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
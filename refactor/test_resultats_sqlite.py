@@ -0,0 +1,117 @@
+"""
+Tests unitaires pour le module resultats_sqlite.
+
+Lance les tests avec : python3 -m unittest test_resultats_sqlite
+"""
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import config
+import crypto
+import resultats_data
+import resultats_sqlite
+
+
+class SqliteTestCase(unittest.TestCase):
+    """Répertoire de données temporaire, backend SQLite"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        data_path = Path(self.tmp.name)
+        (data_path / config.RESULT_PATH).mkdir()
+        for name, value in (("data_path", data_path), ("result_backend", "sqlite")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestBackend(SqliteTestCase):
+    """Tests de resultats_data avec le backend SQLite"""
+
+    def test_round_trip(self):
+        """load() relit ce que save() a enregistré, sans fichier JSON"""
+        resultats = resultats_data.create("quiz", [5, 3, 9], "Ada", "Lovelace")
+        resultats.marquer_correct(3)
+        resultats_data.save(resultats, "ada")
+        relus = resultats_data.load("ada")
+        self.assertEqual(relus.to_dict(), resultats.to_dict())
+        self.assertFalse(list(resultats_sqlite.db_path().parent.glob("*.json")))
+
+    def test_save_replaces_session(self):
+        """Une nouvelle session du même nom remplace la précédente"""
+        resultats_data.save(resultats_data.create("quiz", [1, 2], "A", "B"), "s")
+        resultats_data.save(resultats_data.create("autre", [7], "A", "B"), "s")
+        relus = resultats_data.load("s")
+        self.assertEqual(relus.quiz_name, "autre")
+        self.assertEqual(list(relus.ids), [7])
+
+    def test_missing_session(self):
+        """Une session absente lève QuizResultatError"""
+        with self.assertRaises(resultats_data.QuizResultatError):
+            resultats_data.load("absent")
+
+    def test_wal_and_indexes(self):
+        """La base est en mode WAL, avec une ligne par réponse"""
+        resultats = resultats_data.create("quiz", [1, 2, 3], "A", "B")
+        resultats_data.save(resultats, "s")
+        connection = sqlite3.connect(resultats_sqlite.db_path())
+        self.addCleanup(connection.close)
+        mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        count = connection.execute("SELECT count(*) FROM answers").fetchone()[0]
+        self.assertEqual(count, 3)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT avg(correct) FROM answers WHERE question_id = 2"
+        ).fetchall()
+        self.assertIn("answers_question", str(plan))
+
+    def test_quiz_student_question_lookup(self):
+        """Une réponse se retrouve par quiz, élève et question sans parcours de table"""
+        resultats_data.save(resultats_data.create("quiz", [1, 2, 3], "A", "B"), "s")
+        connection = sqlite3.connect(resultats_sqlite.db_path())
+        self.addCleanup(connection.close)
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT correct FROM sessions"
+            " JOIN answers ON answers.session_id = sessions.id"
+            " WHERE quiz_name = ? AND nom = ? AND prenom = ? AND question_id = ?",
+            ("quiz", "A", "B", 2),
+        ).fetchall()
+        details = [row[-1] for row in plan]
+        self.assertEqual(len(details), 2)
+        self.assertIn("INDEX sessions_quiz_eleve", details[0])
+        self.assertIn("PRIMARY KEY (session_id=? AND question_id=?)", details[1])
+
+
+class TestImport(SqliteTestCase):
+    """Tests pour import_files()"""
+
+    def test_import_json_files(self):
+        """Les fichiers JSON (et leur journal) sont importés dans la base"""
+        with patch.object(config, "result_backend", "json"):
+            resultats = resultats_data.create("quiz", [1, 2, 3], "Ada", "Lovelace")
+            resultats.marquer_correct(1)
+            resultats_data.save(resultats, "ada")
+            with resultats_data.open_journal("ada") as journal_ouvert:
+                journal_ouvert.append(3)
+        directory = config.data_path / config.RESULT_PATH
+        # Id de question dupliqué : refusé par la clé primaire de la base
+        doublon = crypto.load_json((directory / "ada.json").read_bytes())
+        doublon["questions"][2]["question_id"] = 1
+        (directory / "doublon.json").write_bytes(crypto.save_json(doublon))
+        (directory / "casse.json").write_text("{", encoding="utf-8")
+
+        count, errors = resultats_sqlite.import_files(sorted(directory.glob("*.json")))
+        self.assertEqual(count, 1)
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(any(error.startswith("doublon.json: ") for error in errors))
+        self.assertEqual(resultats_sqlite.list_sessions(), ["ada"])
+        (directory / "ada.journal").unlink()
+        self.assertEqual(resultats_data.load("ada").non_correctes(), [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests unitaires pour le module server.
+
+Lance les tests avec : python3 -m unittest test_server
+"""
+
+import asyncio
+import json
+import unittest
+import resultats_data
+import server
+from test_quiz_data import QuizDirTestCase, make_quiz
+
+
+class Client:
+    """Client HTTP minimal sur une connexion persistante."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, method, path, body=None):
+        """Envoie une requête et retourne (code, contenu JSON)."""
+        data = b"" if body is None else json.dumps(body).encode()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: test\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode().split("\r\n")
+        headers = dict(line.lower().split(": ", 1) for line in lines[1:] if line)
+        payload = await self.reader.readexactly(int(headers["content-length"]))
+        return int(lines[0].split(" ")[1]), json.loads(payload)
+
+    def close(self):
+        """Ferme la connexion."""
+        self.writer.close()
+
+
+class TestServer(QuizDirTestCase, unittest.IsolatedAsyncioTestCase):
+    """Tests de l'API HTTP"""
+
+    async def asyncSetUp(self):
+        # Question i : bonne réponse en position i % 3
+        self.write_quiz("test", make_quiz(4))
+        self.app = server.QuizServer(delay=0)
+        self.server = await self.app.listen("127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.app.shutdown()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def client(self):
+        """Ouvre une connexion au serveur."""
+        client = Client(*await asyncio.open_connection("127.0.0.1", self.port))
+        self.addCleanup(client.close)
+        return client
+
+    async def play(self, client, token, good):
+        """Répond à toutes les questions, juste pour les ids de `good`."""
+        while True:
+            status, question = await client.request(
+                "GET", f"/sessions/{token}/question"
+            )
+            self.assertEqual(status, 200)
+            if question["done"]:
+                return question
+            question_id = question["id"]
+            bonne = make_quiz(4)["questions"][question_id - 1]
+            texte = bonne["choices"][bonne["answer_index"]]
+            choice = question["choices"].index(texte)
+            if question_id not in good:
+                choice = (choice + 1) % len(question["choices"])
+            status, reponse = await client.request(
+                "POST", f"/sessions/{token}/answer", {"choice": choice}
+            )
+            self.assertEqual((status, reponse["correct"]), (200, question_id in good))
+
+    async def test_full_session_and_resume(self):
+        """Une session complète est enregistrée puis reprise sur les erreurs"""
+        client = await self.client()
+        status, etat = await client.request(
+            "POST",
+            "/start",
+            {"quiz": "test", "resultat": "jean", "nom": "Dupont", "prenom": "Jean"},
+        )
+        self.assertEqual((status, etat["questions"], etat["score"]), (201, 4, 0))
+        fin = await self.play(client, etat["session"], {1, 3})
+        self.assertEqual((fin["score"], fin["total"]), (2, 4))
+        status, _ = await client.request("POST", f"/sessions/{etat['session']}/close")
+        self.assertEqual(status, 200)
+        self.assertEqual(resultats_data.load("jean").non_correctes(), [2, 4])
+
+        status, etat = await client.request("POST", "/resume", {"resultat": "jean"})
+        self.assertEqual((status, etat["questions"], etat["nom"]), (200, 2, "Dupont"))
+        fin = await self.play(client, etat["session"], {2, 4})
+        self.assertEqual(fin["score"], 4)
+        await client.request("POST", f"/sessions/{etat['session']}/close")
+        self.assertEqual(resultats_data.load("jean").correct_count, 4)
+
+    async def test_get_question_is_idempotent(self):
+        """GET /question ne tire rien : l'ordre des choix vient des POST"""
+        client = await self.client()
+        _, etat = await client.request("POST", "/start", {"quiz": "test", "resultat": "a"})
+        moteur = self.app.sessions[etat["session"]].moteur
+        avant = moteur.to_bytes()
+        chemin = f"/sessions/{etat['session']}/question"
+        _, premiere = await client.request("GET", chemin)
+        _, seconde = await client.request("GET", chemin)
+        self.assertEqual(seconde, premiere)
+        self.assertEqual(moteur.to_bytes(), avant)
+
+        # Réponse sans GET préalable : la question suivante est déjà tirée
+        await client.request("POST", f"/sessions/{etat['session']}/answer", {"choice": 0})
+        status, _ = await client.request(
+            "POST", f"/sessions/{etat['session']}/answer", {"choice": 0}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(moteur.position, 2)
+        self.assertEqual(len(moteur.permutation), 3)
+
+    async def test_answers_persisted_before_close(self):
+        """Les bonnes réponses sont enregistrées sans attendre la fin de session"""
+        client = await self.client()
+        _, etat = await client.request(
+            "POST", "/start", {"quiz": "test", "resultat": "a", "count": 2}
+        )
+        self.assertEqual(etat["questions"], 2)
+        await self.play(client, etat["session"], {1, 2, 3, 4})
+        session = self.app.sessions[etat["session"]]
+        while session.sauvegarde is not None:
+            await asyncio.sleep(0.01)
+        self.assertEqual(resultats_data.load("a").correct_count, 2)
+        self.assertEqual(resultats_data.journal_path("a").stat().st_size, 0)
+
+    async def test_quiz_shared_and_file_reserved(self):
+        """Le quiz est chargé une fois ; un fichier de résultats n'a qu'une session"""
+        client = await self.client()
+        corps = {"quiz": "test", "resultat": "a"}
+        premiers = await asyncio.gather(
+            client.request("POST", "/start", corps),
+            (await self.client()).request("POST", "/start", {**corps, "resultat": "b"}),
+        )
+        self.assertEqual([status for status, _ in premiers], [201, 201])
+        quizzes = {id(session.moteur.quiz) for session in self.app.sessions.values()}
+        self.assertEqual(len(quizzes), 1)
+
+        status, reponse = await client.request("POST", "/start", corps)
+        self.assertEqual(status, 409)
+        self.assertIn("déjà utilisé", reponse["error"])
+
+    async def test_errors(self):
+        """Les requêtes invalides reçoivent un code d'erreur explicite"""
+        client = await self.client()
+        cas = [
+            ("POST", "/start", {"quiz": "../x", "resultat": "a"}, 400),
+            ("POST", "/start", {"quiz": "absent", "resultat": "a"}, 404),
+            ("POST", "/start", {"quiz": "test", "resultat": "a", "count": 0}, 400),
+            ("GET", "/start", None, 405),
+            ("POST", "/resume", {"resultat": "absent"}, 404),
+            ("GET", "/sessions/inconnu/question", None, 404),
+            ("GET", "/ailleurs", None, 404),
+        ]
+        for method, path, body, attendu in cas:
+            with self.subTest(path=path, body=body):
+                status, reponse = await client.request(method, path, body)
+                self.assertEqual(status, attendu)
+                self.assertIn("error", reponse)
+        # Le fichier réservé par une reprise en échec est libéré
+        status, _ = await client.request("POST", "/resume", {"resultat": "absent"})
+        self.assertEqual(status, 404)
+        self.assertEqual(self.app.sessions, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
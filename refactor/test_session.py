@@ -0,0 +1,114 @@
+"""
+Tests unitaires pour le module session.
+
+Lance les tests avec : python3 -m unittest test_session
+"""
+
+import struct
+import unittest
+import resultats_data
+from quiz_data import Question
+from session import Session
+
+
+def make_quiz(count: int) -> dict:
+    """Quiz au format interne ; la bonne réponse de la question i est "B"."""
+    return {
+        "quiz_title": "Test",
+        "quiz_name": "test",
+        "nombre_questions": count,
+        "questions": [
+            Question(i, f"Question {i}", ("A", "B", "C"), 1)
+            for i in range(1, count + 1)
+        ],
+    }
+
+
+class TestSession(unittest.TestCase):
+    """Tests pour Session"""
+
+    def setUp(self):
+        self.quiz = make_quiz(5)
+        self.resultats = resultats_data.create("test", range(1, 6), "Jean", "Dupont")
+
+    def test_full_run(self):
+        """Chaque question est posée une fois ; les bonnes réponses sont notées"""
+        session = Session.start(self.quiz, self.resultats)
+        vues = []
+        while (posee := session.next_question()) is not None:
+            vues.append(posee.question_id)
+            self.assertEqual(sorted(posee.choices), ["A", "B", "C"])
+            self.assertEqual((posee.index, posee.total), (len(vues), 5))
+            bonne = posee.choices.index("B")
+            reponse = bonne if posee.question_id % 2 else (bonne + 1) % 3
+            self.assertEqual(session.submit(reponse), bool(posee.question_id % 2))
+        self.assertEqual(sorted(vues), [1, 2, 3, 4, 5])
+        self.assertTrue(session.done)
+        self.assertEqual(self.resultats.non_correctes(), [2, 4])
+
+    def test_start_skips_correct_questions(self):
+        """Une reprise ne pose que les questions non réussies"""
+        self.resultats.marquer_correct(2)
+        session = Session.start(self.quiz, self.resultats)
+        self.assertEqual(sorted(session.ordre), [1, 3, 4, 5])
+
+    def test_question_stable_until_submit(self):
+        """Réafficher la question en cours conserve l'ordre des choix"""
+        session = Session.start(self.quiz, self.resultats)
+        premiere = session.next_question()
+        self.assertEqual(session.next_question(), premiere)
+        self.assertEqual(session.current(), premiere)
+
+    def test_current_does_not_draw(self):
+        """current() n'affiche que des choix déjà tirés"""
+        session = Session.start(self.quiz, self.resultats)
+        with self.assertRaises(RuntimeError):
+            session.current()
+        self.assertEqual(len(session.permutation), 0)
+        session.draw()
+        self.assertEqual(sorted(session.permutation), [0, 1, 2])
+
+    def test_invalid_answers(self):
+        """Pas de réponse ou réponse hors bornes : question manquée"""
+        session = Session.start(self.quiz, self.resultats)
+        for reponse in (None, -1, 3):
+            session.next_question()
+            self.assertFalse(session.submit(reponse))
+        self.assertEqual(self.resultats.correct_count, 0)
+        with self.assertRaises(RuntimeError):
+            session.submit(0)
+
+    def test_snapshot_restore(self):
+        """L'état exporté restaure la session à l'identique, question affichée comprise"""
+        session = Session.start(self.quiz, self.resultats)
+        session.next_question()
+        session.submit(0)
+        affichee = session.next_question()
+
+        etat = session.to_bytes()
+        self.assertEqual(len(etat), 10 + 8 * 5 + 2 * 3)
+        restauree = Session.from_bytes(self.quiz, self.resultats, etat)
+        self.assertEqual(restauree.next_question(), affichee)
+        self.assertEqual(restauree.to_bytes(), etat)
+
+        for corrompu in (etat[:5], etat[:-1], etat + b"\0"):
+            with self.assertRaises(ValueError):
+                Session.from_bytes(self.quiz, self.resultats, corrompu)
+
+    def test_restore_rejects_bad_permutation(self):
+        """Un ordre des choix qui n'est pas une permutation est refusé"""
+        session = Session.start(self.quiz, self.resultats)
+        session.next_question()
+        etat = session.to_bytes()
+        for permutation in ((0, 0, 1), (0, 1, 7)):
+            corrompu = etat[:-6] + struct.pack("<3H", *permutation)
+            with self.subTest(permutation=permutation):
+                with self.assertRaises(ValueError):
+                    Session.from_bytes(self.quiz, self.resultats, corrompu)
+        session.position = session.total
+        with self.assertRaises(ValueError):
+            Session.from_bytes(self.quiz, self.resultats, session.to_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
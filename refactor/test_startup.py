@@ -0,0 +1,90 @@
+"""
+Tests du temps de démarrage.
+
+Lance les tests avec : python3 -m unittest test_startup
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+import bundle
+import config
+
+# Budget d'import de main (python -X importtime, cumulé, microsecondes).
+# Avant les imports différés, l'import coûtait ~180 ms ; il en coûte ~30.
+IMPORT_BUDGET_US = 100_000
+
+# Modules qui ne doivent pas être chargés par le seul import de main
+HEAVY_MODULES = ("dotenv", "sqlite3", "validator", "autosave", "quiz_data")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    """Lance un interpréteur dans le dossier des modules."""
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=bundle.SOURCE,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+class TestStartup(unittest.TestCase):
+    """Tests du démarrage de l'application"""
+
+    def test_import_time_budget(self):
+        """L'import de main reste sous le budget fixé"""
+        stderr = run_python("-X", "importtime", "-c", "import main").stderr
+        cumul = re.search(r"\|\s*(\d+) \| main$", stderr, re.MULTILINE)
+        self.assertIsNotNone(cumul, stderr)
+        self.assertLess(int(cumul.group(1)), IMPORT_BUDGET_US)
+
+    def test_heavy_modules_deferred(self):
+        """Les modules lourds ne sont chargés qu'à leur premier usage"""
+        code = (
+            "import sys, main\n"
+            "print(' '.join(m for m in sys.argv[1:]"
+            " if type(sys.modules.get(m)).__name__ == 'module'))"
+        )
+        charges = run_python("-c", code, *HEAVY_MODULES).stdout.split()
+        self.assertEqual(charges, [])
+
+    def test_bundle(self):
+        """L'archive ne contient que du bytecode et se lance"""
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = Path(tmp) / "quiz.pyz"
+            noms = bundle.build(archive)
+            self.assertIn("main", noms)
+            self.assertFalse(any(nom.startswith("test_") for nom in noms))
+            with zipfile.ZipFile(archive) as zf:
+                sources = [n for n in zf.namelist() if n.endswith(".py")]
+            self.assertEqual(sources, ["__main__.py"])
+            self.assertIn("usage:", run_python(str(archive), "--help").stdout)
+
+
+class TestDotenv(unittest.TestCase):
+    """Tests pour le chargement de .env"""
+
+    def test_fallback_parser(self):
+        """Sans python-dotenv, un .env simple est lu sans écraser l'environnement"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / ".env"
+            path.write_text(
+                '# commentaire\nQUIZ_A="/data/quiz"\nexport QUIZ_B=2\nQUIZ_C=env\n',
+                encoding="utf-8",
+            )
+            with patch.dict(os.environ, {"QUIZ_C": "déjà"}):
+                config._parse_dotenv(path)  # pylint: disable=protected-access
+                self.assertEqual(os.environ["QUIZ_A"], "/data/quiz")
+                self.assertEqual(os.environ["QUIZ_B"], "2")
+                self.assertEqual(os.environ["QUIZ_C"], "déjà")
+
+
+if __name__ == "__main__":
+    unittest.main()
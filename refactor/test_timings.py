@@ -0,0 +1,81 @@
+"""
+Tests unitaires pour le module timings.
+
+Lance les tests avec : python3 -m unittest test_profiling
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import crypto
+import timings
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests des chronomètres et compteurs"""
+
+    def tearDown(self):
+        timings.reset()
+
+    def test_disabled_records_nothing(self):
+        """Désactivé, le profilage ne mesure rien"""
+        with timings.timer("etape"):
+            pass
+        timings.count("compteur")
+        crypto.xor_bytes(b"abc")
+        rapport = timings.report()
+        self.assertEqual(rapport["etapes"], {})
+        self.assertEqual(rapport["compteurs"], {})
+
+    def test_timer_and_count(self):
+        """Activé, chaque étape cumule ses appels et ses durées"""
+        timings.enable()
+        for _ in range(3):
+            with timings.timer("etape"):
+                pass
+        timings.count("compteur", 2)
+        timings.count("compteur")
+        rapport = timings.report()
+        self.assertEqual(rapport["etapes"]["etape"]["appels"], 3)
+        self.assertGreaterEqual(
+            rapport["etapes"]["etape"]["total_ms"], rapport["etapes"]["etape"]["max_ms"]
+        )
+        self.assertEqual(rapport["compteurs"], {"compteur": 3})
+
+    def test_timed_decorator(self):
+        """Le décorateur suit l'activation faite après la décoration"""
+
+        @timings.timed("fonction")
+        def double(x):
+            return 2 * x
+
+        self.assertEqual(double(2), 4)
+        timings.enable()
+        self.assertEqual(double(3), 6)
+        self.assertEqual(timings.report()["etapes"]["fonction"]["appels"], 1)
+
+    def test_crypto_stages(self):
+        """Le déchiffrement d'un fichier est découpé en étapes"""
+        timings.enable()
+        data = crypto.save_json({"a": 1}, encrypt=True)
+        self.assertEqual(crypto.load_json(data), {"a": 1})
+        etapes = timings.report()["etapes"]
+        self.assertIn("xor", etapes)
+        self.assertIn("json", etapes)
+
+    def test_dump(self):
+        """Le rapport est écrit en JSON"""
+        timings.enable()
+        with timings.timer("etape"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "profile.json"
+            timings.dump(str(path))
+            rapport = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(rapport["etapes"]["etape"]["appels"], 1)
+        self.assertIn("duree_ms", rapport)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests unitaires pour le module ui.
+
+Lance les tests avec : python3 -m unittest test_ui
+"""
+
+import io
+import unittest
+from unittest.mock import patch
+import ui
+
+
+class FakeTerminal(io.StringIO):
+    """Sortie standard simulée, vue comme un terminal ou non."""
+
+    def __init__(self, tty: bool) -> None:
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def isatty(self) -> bool:
+        return self.tty
+
+    def write(self, s: str) -> int:
+        self.writes += 1
+        return super().write(s)
+
+
+class TestRender(unittest.TestCase):
+    """Tests pour l'affichage des questions"""
+
+    def setUp(self):
+        # pylint: disable=protected-access
+        ui._render_header.cache_clear()
+        ui._render_choice.cache_clear()
+
+    def afficher(self, tty: bool, choix=("print(1)\nprint(2)", "rien")) -> FakeTerminal:
+        """Affiche une question sur une sortie simulée."""
+        sortie = FakeTerminal(tty)
+        with patch.object(ui.sys, "stdout", sortie), patch.object(
+            ui.os, "name", "posix"
+        ):
+            ui.print_question("Que fait ce code ?", list(choix), 2, 5)
+        return sortie
+
+    def test_question_frame(self):
+        """Un écran de question est effacé puis écrit en une seule fois"""
+        sortie = self.afficher(tty=True)
+        self.assertEqual(sortie.writes, 1)
+        self.assertEqual(
+            sortie.getvalue(),
+            ui.CLEAR_HOME
+            + "2 / 5 - Que fait ce code ?\n\n"
+            + "\t1 : print(1)\n\t    print(2)\n\t2 : rien\n",
+        )
+
+    def test_not_a_tty(self):
+        """Hors terminal, aucune séquence d'effacement n'est émise"""
+        sortie = self.afficher(tty=False)
+        self.assertNotIn("\x1b", sortie.getvalue())
+        self.assertTrue(sortie.getvalue().startswith("2 / 5 - "))
+
+    def test_render_cached(self):
+        """L'énoncé et les choix sont relus du cache, même mélangés"""
+        self.afficher(tty=False)
+        sortie = self.afficher(tty=False, choix=("rien", "print(1)\nprint(2)"))
+        self.assertEqual(
+            sortie.getvalue(),
+            "2 / 5 - Que fait ce code ?\n\n"
+            + "\t1 : rien\n\t2 : print(1)\n\t    print(2)\n",
+        )
+        # pylint: disable=protected-access,no-value-for-parameter
+        self.assertEqual(ui._render_header.cache_info().hits, 1)
+        self.assertEqual(ui._render_choice.cache_info().hits, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests unitaires pour le module validator.
+
+Lance les tests avec : python3 -m unittest test_validator
+"""
+
+import unittest
+import container
+import crypto
+import quiz_data
+import validator
+from test_quiz_data import QuizDirTestCase, make_quiz
+
+
+class TestCheckQuestion(unittest.TestCase):
+    """Tests pour check_question()"""
+
+    def test_valid_question(self):
+        """Une question valide ne produit aucune erreur"""
+        question = make_quiz(1)["questions"][0]
+        self.assertEqual(validator.check_question(question, 1), [])
+
+    def test_all_field_errors_reported(self):
+        """Toutes les erreurs de champ sont rapportées, pas seulement la première"""
+        errors = validator.check_question({"id": "1", "choices": {}}, 4)
+        self.assertEqual(len(errors), 4)
+        self.assertTrue(all(error.startswith("question 4 - ") for error in errors))
+
+    def test_cross_field_errors(self):
+        """Choix non textuels et réponse hors limites"""
+        question = {"id": 1, "question": "Q", "choices": ["a", 2], "answer_index": 2}
+        errors = validator.check_question(question, 1)
+        self.assertEqual(
+            errors,
+            [
+                "question 1 - 'choices' doit contenir des str.",
+                "question 1 - 'answer_index' hors limites.",
+            ],
+        )
+
+    def test_not_an_object(self):
+        """Une question qui n'est pas un objet"""
+        self.assertEqual(
+            validator.check_question([1], 2), ["question 2 - doit être un objet."]
+        )
+
+
+class TestValidateFiles(QuizDirTestCase):
+    """Tests pour validate_file() et validate_files()"""
+
+    def test_errors_collected_in_one_pass(self):
+        """Toutes les questions invalides d'un fichier sont rapportées"""
+        data = make_quiz(10)
+        data["questions"][1]["answer_index"] = 9
+        data["questions"][6]["question"] = None
+        data["questions"][8]["id"] = 3
+        rapport = validator.validate_file(self.write_quiz("test", data))
+        self.assertEqual(rapport.nombre_questions, 10)
+        self.assertEqual(len(rapport.erreurs), 3)
+        self.assertIn("question 2 - 'answer_index' hors limites.", rapport.erreurs)
+        self.assertIn("question 7 - 'question' doit être un str.", rapport.erreurs)
+        self.assertIn("question 9 - id 3 dupliqué", rapport.erreurs[2])
+
+    def test_invalid_json(self):
+        """Un fichier tronqué est signalé sans exception"""
+        path = self.write_quiz("test", make_quiz(5))
+        path.write_bytes(path.read_bytes()[:-30])
+        rapport = validator.validate_file(path)
+        self.assertFalse(rapport.valide)
+        self.assertIn("JSON invalide", rapport.erreurs[-1])
+
+    def test_directory_in_parallel(self):
+        """validate_files valide plusieurs fichiers, dans l'ordre donné"""
+        bad = make_quiz(3)
+        del bad["quiz_title"]
+        paths = [
+            self.write_quiz("a", make_quiz(3)),
+            self.write_quiz("b", bad, encrypt=False),
+            self.write_quiz("c", make_quiz(4)),
+        ]
+        container.convert(paths[2], quiz_data.quiz_path("d"))
+        paths.append(quiz_data.quiz_path("d"))
+        rapports = validator.validate_files(paths, workers=2)
+        self.assertEqual([r.valide for r in rapports], [True, False, True, True])
+        self.assertEqual([r.nombre_questions for r in rapports], [3, 3, 4, 4])
+        self.assertEqual(rapports[1].erreurs, ["'quiz_title' doit être un str."])
+
+    def test_matches_crypto_roundtrip(self):
+        """Le validateur lit les fichiers chiffrés et clairs"""
+        for encrypt in (True, False):
+            path = quiz_data.quiz_path("test")
+            path.write_bytes(crypto.save_json(make_quiz(2), encrypt=encrypt))
+            self.assertTrue(validator.validate_file(path).valide)
+
+
+if __name__ == "__main__":
+    unittest.main()
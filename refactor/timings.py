@@ -0,0 +1,239 @@
+"""
+Instrumentation légère : chronomètres et compteurs nommés.
+
+Les étapes coûteuses de l'application sont entourées de chronomètres :
+
+    with timings.timer("lecture"):
+        chunk = stream.read(size)
+
+    @timings.timed("resultats.sauvegarde")
+    def save_snapshot(...): ...
+
+    timings.count("cache.succes")
+
+Tant que le profilage n'est pas activé, timer() retourne un gestionnaire de
+contexte vide partagé et count() ne fait rien : le coût se limite à un
+appel de fonction. enable() remplace ces fonctions par les versions qui
+mesurent ; le rapport JSON (appels, durée totale et maximale par étape,
+compteurs) est écrit à la sortie de l'interpréteur.
+
+Les étapes s'imbriquent : "quiz.chargement" inclut "lecture", "xor",
+"json" et "validation" lorsqu'elles ont lieu pendant le chargement, et
+l'analyse incrémentale d'un quiz ("json") inclut la lecture et le
+déchiffrement de ses blocs. Les chronomètres restent hors des boucles
+par question.
+
+Avec enable(memory=True), tracemalloc suit aussi la mémoire : le rapport
+donne le pic de la session et, par étape, la mémoire restée allouée à sa
+sortie et son pic au-dessus de la mémoire occupée à son entrée. Le suivi
+ralentit nettement l'application : à réserver au diagnostic.
+
+Une capture cProfile de toute la session peut s'y ajouter
+(start_cprofile), à analyser avec pstats ou snakeviz.
+"""
+
+import atexit
+import functools
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional
+from lazy import lazy_import
+
+tracemalloc = lazy_import("tracemalloc")
+
+# Gestionnaire vide retourné par timer() quand le profilage est désactivé
+_NULL = nullcontext()
+
+# Étape -> [appels, durée totale, durée maximale] (secondes)
+_stats: Dict[str, List] = {}
+_counters: Dict[str, int] = {}
+_lock = threading.Lock()
+_started = time.perf_counter()
+
+# Étape -> [octets restés alloués, pic au-dessus de l'entrée] (mode mémoire)
+_memory: Dict[str, List[int]] = {}
+# Pics des étapes en cours, par thread (tracemalloc n'a qu'un pic, remis à
+# zéro à l'entrée de chaque étape) et pic de la session
+_pending = threading.local()
+_peak = 0  # pylint: disable=invalid-name
+
+enabled = False  # pylint: disable=invalid-name
+
+
+class _Timer:
+    """Chronomètre d'une exécution d'étape."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            stats = _stats.setdefault(self.name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = max(stats[2], elapsed)
+
+
+class _MemoryTimer(_Timer):
+    """Chronomètre qui suit aussi les allocations de l'étape (tracemalloc)."""
+
+    __slots__ = ("base",)
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.base = 0
+
+    def __enter__(self) -> "_MemoryTimer":
+        self.base, peak = tracemalloc.get_traced_memory()
+        stack = _pending.__dict__.setdefault("stack", [])
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        else:
+            _record_peak(peak)
+        stack.append(0)
+        tracemalloc.reset_peak()
+        return super().__enter__()
+
+    def __exit__(self, *exc_info) -> None:
+        super().__exit__(*exc_info)
+        current, peak = tracemalloc.get_traced_memory()
+        stack = _pending.stack
+        peak = max(peak, stack.pop())
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        _record_peak(peak)
+        with _lock:
+            memory = _memory.setdefault(self.name, [0, 0])
+            memory[0] += current - self.base
+            memory[1] = max(memory[1], peak - self.base)
+
+
+def _record_peak(peak: int) -> None:
+    global _peak  # pylint: disable=global-statement
+    _peak = max(_peak, peak)
+
+
+def _null_timer(_name: str) -> nullcontext:
+    return _NULL
+
+
+def _null_count(_name: str, _n: int = 1) -> None:
+    return None
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+# Remplacées par _Timer et _count à l'activation
+timer: Callable[[str], Any] = _null_timer
+count: Callable[..., None] = _null_count
+
+
+def timed(name: str) -> Callable:
+    """Décorateur : chronomètre chaque appel de la fonction sous le nom `name`."""
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enable(report_path: Optional[str] = None, memory: bool = False) -> None:
+    """
+    Active les mesures.
+
+    Args:
+        report_path: Fichier où écrire le rapport JSON à la sortie
+        memory: Suivre aussi la mémoire avec tracemalloc
+    """
+    global enabled, timer, count, _started  # pylint: disable=global-statement
+    enabled = True
+    timer = _MemoryTimer if memory else _Timer
+    count = _count
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _started = time.perf_counter()
+    if report_path is not None:
+        atexit.register(dump, report_path)
+
+
+def reset() -> None:
+    """Désactive les mesures et efface les résultats."""
+    global enabled, timer, count, _peak  # pylint: disable=global-statement
+    if timer is _MemoryTimer:
+        tracemalloc.stop()
+    enabled = False
+    timer = _null_timer
+    count = _null_count
+    _peak = 0
+    with _lock:
+        _stats.clear()
+        _counters.clear()
+        _memory.clear()
+
+
+def report() -> Dict[str, Any]:
+    """Rapport des mesures, durées en millisecondes, mémoire en Kio."""
+    with _lock:
+        etapes = {
+            name: {
+                "appels": appels,
+                "total_ms": round(total * 1000, 3),
+                "max_ms": round(maximum * 1000, 3),
+            }
+            for name, (appels, total, maximum) in sorted(_stats.items())
+        }
+        for name, (alloue, pic) in _memory.items():
+            etapes[name]["alloue_kio"] = round(alloue / 1024, 1)
+            etapes[name]["pic_kio"] = round(pic / 1024, 1)
+        compteurs = dict(sorted(_counters.items()))
+    rapport = {
+        "duree_ms": round((time.perf_counter() - _started) * 1000, 3),
+        "etapes": etapes,
+        "compteurs": compteurs,
+    }
+    if timer is _MemoryTimer:
+        current, peak = tracemalloc.get_traced_memory()
+        rapport["memoire"] = {
+            "actuelle_kio": round(current / 1024, 1),
+            "pic_kio": round(max(peak, _peak) / 1024, 1),
+        }
+    return rapport
+
+
+def dump(path: str) -> None:
+    """Écrit le rapport JSON dans un fichier."""
+    import json  # pylint: disable=import-outside-toplevel
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, ensure_ascii=False, indent=2)
+
+
+def start_cprofile(path: str) -> None:
+    """Profile toute la session avec cProfile ; statistiques pstats écrites à la sortie."""
+    import cProfile  # pylint: disable=import-outside-toplevel
+
+    profiler = cProfile.Profile()
+
+    def stop() -> None:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+    atexit.register(stop)
+    profiler.enable()
@@ -5,29 +5,76 @@ Ce module gère toutes les interactions avec l'utilisateur :
 - Affichage des écrans et formulaires
 - Collecte des réponses
 - Affichage des résultats
+
+Chaque écran est construit en mémoire puis écrit en une seule fois,
+l'effacement se faisant par séquence ANSI (voir write_frame).
 """
 
+import functools
 import os
-from typing import Tuple, Dict
+import sys
+from typing import Dict, List, Tuple
+import timings
+
+# Séquence ANSI : curseur en haut à gauche, effacement de l'écran et de
+# l'historique (ce qu'émet la commande clear)
+CLEAR_HOME = "\x1b[H\x1b[2J\x1b[3J"
+
+
+@timings.timed("rendu")
+def write_frame(frame: str, clear: bool = False) -> None:
+    """
+    Affiche un écran en une seule écriture sur la sortie standard.
+
+    Avec clear=True, l'écran est d'abord effacé par la séquence ANSI placée
+    en tête de l'écran (commande cls sous Windows). Hors terminal (sortie
+    redirigée vers un fichier ou un tube), rien n'est effacé.
+    """
+    if clear:
+        if os.name == "nt":
+            os.system("cls")
+        elif sys.stdout.isatty():
+            frame = CLEAR_HOME + frame
+    sys.stdout.write(frame)
+    sys.stdout.flush()
 
 
 def clear_screen() -> None:
     """Efface l'écran du terminal (compatible Windows et Unix)."""
-    os.system("clear" if os.name != "nt" else "cls")
+    write_frame("", clear=True)
+
+
+def render_titre(titre: str) -> str:
+    """Bandeau de titre."""
+    return f"\n{'=' * 70}\n{titre}\n{'=' * 70}\n"
 
 
 def print_titre(titre: str) -> None:
     """Affiche le titre du quiz"""
-    print(f"\n{'=' * 70}")
-    print(titre)
-    print(f"{'=' * 70}")
+    write_frame(render_titre(titre))
 
 
 def view_resultats(quiz_title: str, correct_count: int, total_count: int) -> None:
     """Affiche les résultats finaux du quiz."""
-    clear_screen()
-    print_titre(f"  Résultats {quiz_title}")
-    print(f"Score: {correct_count}/{total_count}")
+    write_frame(
+        render_titre(f"  Résultats {quiz_title}")
+        + f"Score: {correct_count}/{total_count}\n",
+        clear=True,
+    )
+
+
+def view_catalogue(banks: List[Dict]) -> None:
+    """Affiche la liste des quiz disponibles."""
+    print_titre("  Quiz disponibles")
+    if not banks:
+        print("Aucun quiz trouvé.")
+    for bank in banks:
+        if "error" in bank:
+            print(f"{bank['name']:<20} ⚠️  illisible : {bank['error']}")
+        else:
+            print(
+                f"{bank['name']:<20} {bank['questions']:>6} questions  {bank['title']}"
+            )
 
 
 def form_demarrage(quiz_title: str) -> Tuple:
@@ -52,29 +99,48 @@ def view_reprise(
     _ = input("\nAppuyez sur Entrée pour reprendre...")
 
 
+@functools.lru_cache(maxsize=1024)
+def _render_header(question: str) -> str:
+    """Énoncé d'une question, suivi d'une ligne vide."""
+    return f"{question}\n\n"
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_choice(choix_text: str) -> str:
+    """
+    Texte d'un choix après son numéro, les lignes suivantes d'un choix
+    multiligne (code) étant indentées sous la première.
+    """
+    premiere, *suite = choix_text.split("\n")
+    return "".join([premiere, *(f"\n\t    {line}" for line in suite)]) + "\n"
+
+
+def render_question(question: str, choix_propose: List[str]) -> str:
+    """
+    Corps d'une question : énoncé puis choix numérotés.
+
+    L'énoncé et chaque choix sont mis en cache indépendamment de l'ordre
+    des choix, qui change d'un affichage à l'autre : seuls les numéros sont
+    recalculés.
+    """
+    return _render_header(question) + "".join(
+        f"\t{numero} : {_render_choice(choix_text)}"
+        for numero, choix_text in enumerate(choix_propose, 1)
+    )
+
+
 def print_question(
-    question: str, choix_propose: list[Dict], index: int, total_questions: int
+    question: str, choix_propose: list[str], index: int, total_questions: int
 ) -> None:
-    """Affiche une question avec ses choix"""
-    # Effacer l'écran avant la question
-    clear_screen()
-    print(f"{index} / {total_questions} - {question}\n")
-    for numero, choix in enumerate(choix_propose, 1):
-        # Gérer le formatage multiligne pour le code
-        choix_text = choix["choix"]
-        lines = choix_text.split("\n")
-        if len(lines) > 1:
-            # Afficher la première ligne avec le numéro
-            print(f"\t{numero} : {lines[0]}")
-            # Afficher les lignes suivantes avec indentation
-            for line in lines[1:]:
-                print(f"\t    {line}")
-        else:
-            print(f"\t{numero} : {choix_text}")
+    """Affiche une question avec ses choix, sur un écran effacé"""
+    write_frame(
+        f"{index} / {total_questions} - " + render_question(question, choix_propose),
+        clear=True,
+    )
 
 
 def form_question(
-    question: str, choix_propose: list[Dict], index: int, total_questions: int
+    question: str, choix_propose: list[str], index: int, total_questions: int
 ) -> int | None:
     """Affiche une question avec ses choix et collecte la réponse de l'utilisateur."""
 
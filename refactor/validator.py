@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Validation des fichiers de quiz.
+
+Contrairement à quiz_data.load, qui s'arrête à la première erreur, le
+validateur parcourt le fichier en une seule passe (en flux, mémoire bornée)
+et rapporte toutes les erreurs avec leur position.
+
+Une question valide ne coûte qu'un test de type par champ : les messages
+d'erreur ne sont construits que pour les questions invalides.
+
+Usage:
+    python3 validator.py [FICHIER_OU_DOSSIER ...]
+
+Sans argument, tous les quiz de config.data_path / config.QUIZ_PATH sont
+vérifiés en parallèle.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+import config
+import container
+
+# Champs obligatoires d'une question : (nom, type attendu, message)
+QUESTION_SCHEMA: Tuple[Tuple[str, type, str], ...] = (
+    ("id", int, "doit être un int"),
+    ("question", str, "doit être un str"),
+    ("choices", list, "doit être une liste"),
+    ("answer_index", int, "doit être un entier"),
+)
+
+# Nombre maximal d'erreurs conservées par fichier
+MAX_ERREURS = 1000
+
+_ABSENT = object()
+
+
+def _fields_valid(question: Dict) -> bool:
+    """Chemin rapide : types des champs de QUESTION_SCHEMA, sans message."""
+    for name, expected, _ in QUESTION_SCHEMA:
+        if not isinstance(question.get(name, _ABSENT), expected):
+            return False
+    return True
+
+
+def _choices_valid(question: Dict) -> bool:
+    """Vérifications croisées rapides (choix textuels, réponse dans les bornes)."""
+    choices = question["choices"]
+    return all(isinstance(choix, str) for choix in choices) and (
+        0 <= question["answer_index"] < len(choices)
+    )
+
+
+def _collect_errors(question: Any, i: int) -> List[str]:
+    """Chemin lent : liste toutes les erreurs d'une question invalide."""
+    if not isinstance(question, dict):
+        return [f"question {i} - doit être un objet."]
+
+    errors = [
+        f"question {i} - '{name}' {message}."
+        for name, expected, message in QUESTION_SCHEMA
+        if not isinstance(question.get(name, _ABSENT), expected)
+    ]
+    if errors:
+        return errors
+
+    choices = question["choices"]
+    if not all(isinstance(choix, str) for choix in choices):
+        errors.append(f"question {i} - 'choices' doit contenir des str.")
+    if not 0 <= question["answer_index"] < len(choices):
+        errors.append(f"question {i} - 'answer_index' hors limites.")
+    return errors
+
+
+def check_question(question: Any, i: int) -> List[str]:
+    """
+    Valide une question au format source.
+
+    Une question valide ne passe que par le chemin rapide ; les messages
+    d'erreur ne sont construits que pour les questions invalides.
+
+    Args:
+        question: Question au format source
+        i: Position de la question dans le fichier (à partir de 1)
+
+    Returns:
+        Liste des erreurs de la question (vide si elle est valide)
+    """
+    if (
+        type(question) is dict  # pylint: disable=unidiomatic-typecheck
+        and _fields_valid(question)
+        and _choices_valid(question)
+    ):
+        return []
+    return _collect_errors(question, i)
+
+
+@dataclass
+class Rapport:
+    """Résultat de la validation d'un fichier de quiz."""
+
+    fichier: str
+    nombre_questions: int = 0
+    erreurs: List[str] = field(default_factory=list)
+    duree: float = 0.0
+
+    @property
+    def valide(self) -> bool:
+        """True si aucune erreur n'a été trouvée."""
+        return not self.erreurs
+
+
+def validate_questions(
+    questions: Iterable[Any], rapport: Rapport, check: Callable = check_question
+) -> None:
+    """
+    Valide un flux de questions au format source en une seule passe.
+
+    Toutes les erreurs sont ajoutées à rapport.erreurs (dans la limite de
+    MAX_ERREURS), y compris les ids dupliqués.
+    """
+    vus: Dict[int, int] = {}
+    erreurs = rapport.erreurs
+    i = 0
+    try:
+        for i, question in enumerate(questions, 1):
+            problemes = check(question, i)
+            if not problemes:
+                question_id = question["id"]
+                premier = vus.setdefault(question_id, i)
+                if premier == i:
+                    continue
+                problemes = [
+                    f"question {i} - id {question_id} dupliqué "
+                    f"(déjà en question {premier})."
+                ]
+            erreurs.extend(problemes)
+            if len(erreurs) > MAX_ERREURS:
+                del erreurs[MAX_ERREURS:]
+                erreurs.append("... trop d'erreurs, validation interrompue.")
+                break
+    finally:
+        # Renseigné même si la lecture du flux échoue en cours de route
+        rapport.nombre_questions = i
+
+
+def _stream_source(path: Path, header: Dict) -> Iterator[Any]:
+    """Questions au format source d'un fichier JSON ou d'un conteneur."""
+    with open(path, "rb") as f:
+        if container.is_container(f.read(len(container.MAGIC))):
+            with container.Container(path) as reader:
+                header.update(reader.meta, questions=[])
+                yield from reader
+            return
+        f.seek(0)
+        yield from container.iter_json_questions(f, header)
+
+
+def validate_file(path: Path) -> Rapport:
+    """
+    Valide un fichier de quiz et retourne toutes les erreurs trouvées.
+
+    Args:
+        path: Fichier de quiz (JSON clair, chiffré ou conteneur)
+
+    Returns:
+        Rapport de validation
+    """
+    debut = time.perf_counter()
+    rapport = Rapport(str(path))
+    header: Dict = {}
+    try:
+        validate_questions(_stream_source(path, header), rapport)
+        if not isinstance(header.get("quiz_title"), str):
+            rapport.erreurs.insert(0, "'quiz_title' doit être un str.")
+        if not isinstance(header.get("questions"), list):
+            rapport.erreurs.insert(0, "'questions' doit être une liste.")
+    except (OSError, container.ContainerError) as exc:
+        rapport.erreurs.append(f"lecture impossible: {exc}")
+    except json.JSONDecodeError as exc:
+        rapport.erreurs.append(
+            f"JSON invalide après la question {rapport.nombre_questions}: {exc.msg}"
+        )
+    except UnicodeDecodeError as exc:
+        rapport.erreurs.append(f"encodage invalide: {exc.reason}")
+    rapport.duree = time.perf_counter() - debut
+    return rapport
+
+
+def validate_files(paths: List[Path], workers: int | None = None) -> List[Rapport]:
+    """
+    Valide plusieurs fichiers en parallèle sur un pool de processus.
+
+    Args:
+        paths: Fichiers à valider
+        workers: Nombre de processus (défaut : nombre de CPU)
+
+    Returns:
+        Rapports, dans l'ordre de `paths`
+    """
+    if len(paths) <= 1:
+        return [validate_file(path) for path in paths]
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate_file, paths))
+
+
+def _collect(arguments: List[str]) -> List[Path]:
+    """Liste les fichiers de quiz désignés par les arguments."""
+    if not arguments:
+        arguments = [str(config.data_path / config.QUIZ_PATH)]
+    paths: List[Path] = []
+    for argument in arguments:
+        path = Path(argument)
+        paths.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return paths
+
+
+def main() -> int:
+    """Point d'entrée : valide les fichiers et affiche un résumé."""
+    paths = _collect(sys.argv[1:])
+    if not paths:
+        print("⚠ Aucun fichier de quiz trouvé.")
+        return 0
+
+    debut = time.perf_counter()
+    rapports = validate_files(paths)
+    duree = time.perf_counter() - debut
+
+    for rapport in rapports:
+        nom = Path(rapport.fichier).name
+        if rapport.valide:
+            print(f"  ✓ {nom:<30} {rapport.nombre_questions:>7} questions")
+        else:
+            print(f"  ✗ {nom:<30} {len(rapport.erreurs):>7} erreur(s)")
+            for erreur in rapport.erreurs:
+                print(f"      - {erreur}")
+
+    invalides = sum(1 for rapport in rapports if not rapport.valide)
+    total = sum(rapport.nombre_questions for rapport in rapports)
+    print("─" * 60)
+    print(
+        f"  {len(rapports)} fichier(s), {total} questions, "
+        f"{invalides} invalide(s) en {duree:.2f} s"
+    )
+    return 1 if invalides else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())